@@ -60,7 +60,8 @@ package support higher Python versions.
 meaning older versions can in principle work, but this is not guaranteed.
 NumPy 1.20.3, SciPy 1.7.3, Numba 0.55.1, h5py 3.7.0, Astropy 4.3.1, Pandas 1.2.3, Matplotlib 3.5.3, pyyaml 6.0.2,
 pyside6 6.6.0 (optional),
-pymc 5.24.0 (optional), Arviz 0.22.0 (optional), fastprogress 1.0.3 (optional).
+pymc 5.24.0 (optional), Arviz 0.22.0 (optional), fastprogress 1.0.3 (optional), bottleneck 1.3.0 (optional),
+finufft 2.2.0 (optional), cupy 12.0.0 (optional).
 
 Newer versions are expected to work, and it is considered a bug if this is not the case.
 That statement does not extend to PySide6, because of its strong dependency on Python version.
@@ -71,7 +72,8 @@ That statement does not extend to PySide6, because of its strong dependency on P
 > (sim_000_lc.dat included in the data folder) and will make sure that the just-in-time compiler can do its magic to
 > make everything run as fast as it can. Just-in-time compilation can result in more optimised machine code than
 > ahead-of-time compilation. Note that compilation takes time, but this only applies to the first time each function is
-> used. In short: first time use is not indicative of the final runtime.
+> used. In short: first time use is not indicative of the final runtime. To only compile the core kernels, for example
+> in a set-up step before starting many parallel jobs, use the function `compile_kernels` from the same script.
 
 
 ## Example use
@@ -274,6 +276,11 @@ Experience teaches that this leads to worse models.
 Periodogram spectral noise is calculated over this window width.
 Only influences the extraction in the signal-to-noise ratio mode of picking the next sinusoid.
 
+`use_gpu`: bool, default=False
+
+Compute the full periodogram of each extraction step on a CUDA GPU (requires cupy).
+Falls back to the CPU if cupy is not installed.
+
 ## Optimisation settings
 
 `min_group`: int, default=45
@@ -315,6 +322,11 @@ A subdirectory is automatically made with the target identifier to store the res
 Save ascii variants of the HDF5 result files.
 Saves several CSV files per HDF5 file, due to format constraints.
 
+`io_workers`: int, default=1
+
+Number of worker processes (multiple files) or threads (uncompressed hdf5 file) for loading data; 1 is serial.
+Each worker process is started fresh, which takes a few seconds, so this is only beneficial for long lists of files.
+
 ## Tabulated File settings
 
 `cn_time`: str, default='time'
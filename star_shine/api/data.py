@@ -6,7 +6,7 @@ This Python module contains the data class for handling the user defined data to
 import os
 import numpy as np
 
-from star_shine.core import time_series as tms, utility as ut, visualisation as vis
+from star_shine.core import time_series as tms, utility as ut
 from star_shine.core import io
 from star_shine.config.helpers import get_config
 
@@ -14,6 +14,9 @@ from star_shine.config.helpers import get_config
 # load configuration
 config = get_config()
 
+# shared empty placeholder, a zero-size array has no elements that could change in place
+_empty_float = np.zeros((0,))
+
 
 class Data:
     """A class to handle light curve data.
@@ -55,7 +58,7 @@ class Data:
         self.time_series = None
 
         # additional time series properties not in time_series
-        self.flux_counts_medians = np.zeros((0,))
+        self.flux_counts_medians = _empty_float
 
         return
 
@@ -75,19 +78,26 @@ class Data:
         logger: logging.Logger, optional
             Instance of the logging library.
         """
-        # check for missing files in the list
-        missing = []
-        for i, file in enumerate(self.file_list):
-            if not os.path.exists(os.path.join(self.data_dir, file)):
-                missing.append(i)
+        # list the directory once instead of checking every file separately
+        present = set()
+        if self.data_dir:
+            try:
+                with os.scandir(self.data_dir) as entries:
+                    present = {entry.name for entry in entries}
+            except OSError:
+                pass
+
+        # check for missing files in the list (file names may also contain sub-directories)
+        kept = [file for file in self.file_list
+                if file in present or os.path.exists(os.path.join(self.data_dir or '', file))]
 
         # log a message if files are missing
-        if len(missing) > 0:
-            missing_files = [self.file_list[i] for i in missing]
+        if len(kept) < len(self.file_list):
+            missing_files = [file for file in self.file_list if file not in kept]
 
             # add directory to message
             dir_text = ""
-            if self.data_dir is not None:
+            if self.data_dir:
                 dir_text = f" in directory {self.data_dir}"
             message = f"Missing files {missing_files}{dir_text}, removing from list."
 
@@ -95,8 +105,7 @@ class Data:
                 logger.warning(message)
 
             # remove the files
-            for i in missing:
-                del self.file_list[i]
+            self.file_list = kept
 
         return None
 
@@ -196,14 +205,14 @@ class Data:
             file_list_dir = [os.path.join(instance.data_dir, file) for file in instance.file_list]
 
         # load the data from the list of files
-        lc_data = io.load_light_curve(file_list_dir, apply_flags=config.apply_q_flags)
+        lc_data = io.load_light_curve(file_list_dir, apply_flags=config.apply_q_flags, n_workers=config.io_workers)
 
         # make a TimeSeries instance
         instance.time_series = tms.TimeSeries(lc_data[0], lc_data[1], lc_data[2], lc_data[3])
         instance.flux_counts_medians = lc_data[4]
 
         # check for overlapping time stamps
-        if np.any(np.diff(instance.time_series.time) <= 0) & (logger is not None):
+        if (logger is not None) and ut.any_non_increasing(instance.time_series.time):
             logger.warning("The time array chunks include overlap.")
 
         if logger is not None:
@@ -212,7 +221,7 @@ class Data:
         return instance
 
     @classmethod
-    def load(cls, file_name, data_dir='', h5py_file_kwargs=None, logger=None):
+    def load(cls, file_name, data_dir='', h5py_file_kwargs=None, memory_map=False, logger=None):
         """Load a data file in hdf5 format.
 
         Parameters
@@ -225,6 +234,9 @@ class Data:
         h5py_file_kwargs: dict, optional
             Keyword arguments for opening the h5py file.
             Example: {'locking': False}, for a drive that does not support locking.
+        memory_map: bool, optional
+            Memory map the time series instead of reading it into memory, for very large data sets.
+            Requires a file saved with compress=False.
         logger: logging.Logger, optional
             Instance of the logging library.
 
@@ -246,7 +258,8 @@ class Data:
             file_name = os.path.join(instance.data_dir, file_name)
 
         # io module handles opening the file
-        data_dict = io.load_data_hdf5(file_name, h5py_file_kwargs=h5py_file_kwargs)
+        data_dict = io.load_data_hdf5(file_name, h5py_file_kwargs=h5py_file_kwargs, memory_map=memory_map,
+                                      n_workers=config.io_workers)
 
         # general properties
         instance.target_id = data_dict['target_id']
@@ -254,7 +267,7 @@ class Data:
         instance.file_list = data_dict['file_list']
 
         # make a TimeSeries instance
-        instance.time_series = tms.TimeSeries(data_dict['time'], data_dict['flux'], data_dict['flux'],
+        instance.time_series = tms.TimeSeries(data_dict['time'], data_dict['flux'], data_dict['flux_err'],
                                               data_dict['i_chunks'])
         instance.flux_counts_medians = data_dict['flux_counts_medians']
 
@@ -264,19 +277,21 @@ class Data:
 
         return instance
 
-    def save(self, file_name):
+    def save(self, file_name, compress=True):
         """Save the data to a file in hdf5 format.
 
         Parameters
         ----------
         file_name: str
             File name to save the data to
+        compress: bool, optional
+            Compress the time series. Set to False to be able to memory map the time series when loading.
         """
         # make a dictionary of the fields to be saved
         data_dict = self.get_dict()
 
         # io module handles writing to file
-        io.save_data_hdf5(file_name, data_dict)
+        io.save_data_hdf5(file_name, data_dict, compress=compress)
 
         return None
 
@@ -290,6 +305,9 @@ class Data:
         show: bool, optional
             If True, display the plot
         """
+        # plotting pulls in matplotlib, so only import it when needed
+        from star_shine.core import visualisation as vis
+
         vis.plot_lc(self.time_series.time, self.time_series.flux, self.time_series.flux_err, self.time_series.i_chunks,
                     file_name=file_name, show=show)
 
@@ -307,6 +325,8 @@ class Data:
         show: bool, optional
             If True, display the plot
         """
+        from star_shine.core import visualisation as vis
+
         vis.plot_pd(self.time_series.time, self.time_series.flux, self.time_series.i_chunks,
                     plot_per_chunk=plot_per_chunk, file_name=file_name, show=show)
 
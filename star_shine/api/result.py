@@ -4,6 +4,7 @@ Satellite Time-series Analysis Routine using Sinusoids and Harmonics through Ite
 This Python module contains the result class for handling the analysis results.
 """
 import os
+import operator
 import numpy as np
 
 from star_shine.core import utility as ut
@@ -14,6 +15,12 @@ from star_shine.config.helpers import get_config
 # load configuration
 config = get_config()
 
+# shared empty placeholders, zero-size arrays have no elements that could change in place
+_empty_float = np.zeros((0,))
+_empty_float_pair = np.zeros((0, 2))
+_empty_int = np.zeros((0,), dtype=int)
+_empty_bool = np.zeros((0,), dtype=bool)
+
 
 class Result:
     """A class to handle analysis results.
@@ -73,6 +80,25 @@ class Result:
     passing_harmonic: numpy.ndarray[Any, dtype[bool]]
         Sinusoids that passed the harmonic check.
     """
+    # attribute lists per model
+    linear_property_list = ('const', 'const_err', 'const_hdi', 'slope', 'slope_err', 'slope_hdi')
+    sinusoid_property_list = ('f_n', 'f_n_err', 'f_n_hdi', 'a_n', 'a_n_err', 'a_n_hdi',
+                              'ph_n', 'ph_n_err', 'ph_n_hdi', 'passing_sigma', 'passing_snr',
+                              'h_base', 'h_mult', 'f_h_err', 'passing_harmonic')
+
+    # fields that are saved, these are all the attributes
+    _dict_keys = (('target_id', 'data_id', 'n_param', 'bic', 'noise_level')
+                  + linear_property_list + sinusoid_property_list)
+
+    # fixed attribute layout, no per-instance __dict__
+    __slots__ = _dict_keys
+
+    # precompiled getters, the hdi are not part of the time series model
+    _get_dict_values = operator.attrgetter(*_dict_keys)
+    _linear_model_keys = tuple(key for key in linear_property_list if '_hdi' not in key)
+    _sinusoid_model_keys = tuple(key for key in sinusoid_property_list if '_hdi' not in key)
+    _get_linear_model = operator.attrgetter(*_linear_model_keys)
+    _get_sinusoid_model = operator.attrgetter(*_sinusoid_model_keys)
 
     def __init__(self):
         """Initialises the Result object."""
@@ -85,45 +111,39 @@ class Result:
         self.bic = -1.
         self.noise_level = -1.
 
-        # attribute lists per model
-        self.linear_property_list = ['const', 'const_err', 'const_hdi', 'slope', 'slope_err', 'slope_hdi']
-        self.sinusoid_property_list = ['f_n', 'f_n_err', 'f_n_hdi', 'a_n', 'a_n_err', 'a_n_hdi',
-                                       'ph_n', 'ph_n_err', 'ph_n_hdi', 'passing_sigma', 'passing_snr',
-                                       'h_base', 'h_mult', 'f_h_err', 'passing_harmonic']
-
         # linear model parameters
         # y-intercepts
-        self.const = np.zeros((0,))
-        self.const_err = np.zeros((0,))
-        self.const_hdi = np.zeros((0, 2))
+        self.const = _empty_float
+        self.const_err = _empty_float
+        self.const_hdi = _empty_float_pair
         # slopes
-        self.slope = np.zeros((0,))
-        self.slope_err = np.zeros((0,))
-        self.slope_hdi = np.zeros((0, 2))
+        self.slope = _empty_float
+        self.slope_err = _empty_float
+        self.slope_hdi = _empty_float_pair
 
         # sinusoid model parameters
         # frequencies
-        self.f_n = np.zeros((0,))
-        self.f_n_err = np.zeros((0,))
-        self.f_n_hdi = np.zeros((0, 2))
+        self.f_n = _empty_float
+        self.f_n_err = _empty_float
+        self.f_n_hdi = _empty_float_pair
         # amplitudes
-        self.a_n = np.zeros((0,))
-        self.a_n_err = np.zeros((0,))
-        self.a_n_hdi = np.zeros((0, 2))
+        self.a_n = _empty_float
+        self.a_n_err = _empty_float
+        self.a_n_hdi = _empty_float_pair
         # phases
-        self.ph_n = np.zeros((0,))
-        self.ph_n_err = np.zeros((0,))
-        self.ph_n_hdi = np.zeros((0, 2))
+        self.ph_n = _empty_float
+        self.ph_n_err = _empty_float
+        self.ph_n_hdi = _empty_float_pair
         # passing criteria
-        self.passing_sigma = np.zeros((0,), dtype=bool)
-        self.passing_snr = np.zeros((0,), dtype=bool)
+        self.passing_sigma = _empty_bool
+        self.passing_snr = _empty_bool
 
         # harmonic model
-        self.h_base = np.zeros((0,), dtype=int)
-        self.h_mult = np.zeros((0,), dtype=int)
-        self.f_h_err = np.zeros((0,))
+        self.h_base = _empty_int
+        self.h_mult = _empty_int
+        self.f_h_err = _empty_float
         # passing criteria
-        self.passing_harmonic = np.zeros((0,), dtype=bool)
+        self.passing_harmonic = _empty_bool
 
         return
 
@@ -138,23 +158,9 @@ class Result:
             Dictionary of the result attributes and fields
         """
         # make a dictionary of the fields to be saved
-        result_dict = dict()
-        result_dict['target_id'] = self.target_id
-        result_dict['data_id'] = self.data_id
+        result_dict = dict(zip(self._dict_keys, self._get_dict_values(self)))
         result_dict['date_time'] = ut.datetime_formatted()
 
-        result_dict['n_param'] = self.n_param  # number of free parameters
-        result_dict['bic'] = self.bic  # Bayesian Information Criterion of the residuals
-        result_dict['noise_level'] = self.noise_level  # standard deviation of the residuals
-
-        # the linear model
-        for key in self.linear_property_list:
-            result_dict[key] = getattr(self, key)
-
-        # the sinusoid model
-        for key in self.sinusoid_property_list:
-            result_dict[key] = getattr(self, key)
-
         return result_dict
 
     def from_dict(self, **kwargs):
@@ -166,7 +172,7 @@ class Result:
             Accepts any of the class attributes as keyword input and sets them accordingly.
         """
         # set any attribute that exists if it is in the kwargs
-        for key in kwargs.keys():
+        for key in kwargs.keys() & self.__slots__:
             setattr(self, key, kwargs[key])
 
         return None
@@ -192,16 +198,14 @@ class Result:
         self.bic = ts_model.bic()
         self.noise_level = ut.std_unb(ts_model.residual(), ts_model.n_time - ts_model.n_param)
 
-        # linear model parameters
-        for key in self.linear_property_list:
-            if '_hdi' not in key:  # avoid hdi for now
-                setattr(self, key, getattr(ts_model.linear, key))
+        # linear model parameters (avoid hdi for now)
+        for key, value in zip(self._linear_model_keys, self._get_linear_model(ts_model.linear)):
+            setattr(self, key, value)
 
-        # sinusoid model parameters
+        # sinusoid model parameters (avoid hdi for now)
         ts_model.remove_excluded()  # clean up before transfer
-        for key in self.sinusoid_property_list:
-            if '_hdi' not in key:  # avoid hdi for now
-                setattr(self, key, getattr(ts_model.sinusoid, key))
+        for key, value in zip(self._sinusoid_model_keys, self._get_sinusoid_model(ts_model.sinusoid)):
+            setattr(self, key, value)
 
         return None
 
@@ -4,11 +4,51 @@ Satellite Time-series Analysis Routine using Sinusoids and Harmonics through Ite
 This Python script is meant to be run before first use, it ensures that the Just-In-Time compiler has done its job
 and cache the compiled functions. If your own use case involves time series longer than a few thousand data points,
 this is strongly recommended. If not, this is less important, but do keep in mind that the first run will be slower.
+
+The function compile_kernels only compiles the periodogram and sinusoid extraction kernels on a small synthetic
+time series, which is much quicker than a full run. It can be used in an installation or job set-up step
+(for example before starting many parallel jobs), so that every process loads the cached machine code.
 """
 
 import os
 import importlib.resources
+import numpy as np
+
 import star_shine as sts
+from star_shine.core import analysis as ana, time_series as tms
+from star_shine.core import periodogram as pdg, fitting as fit
+
+
+def compile_kernels():
+    """Compile and cache the periodogram and sinusoid extraction kernels.
+
+    The kernels are called like the extraction routines call them, so that the cached type signatures are
+    the ones used in practice.
+    """
+    # short, regularly sampled time series with a few sinusoids
+    n_points = 500
+    time = np.arange(n_points) * 0.02
+    flux = np.sin(2 * np.pi * 1.3 * time) + 0.5 * np.sin(2 * np.pi * 3.7 * time + 1) + 0.1 * np.cos(7 * time ** 1.1)
+    flux_err = np.ones(n_points) * 0.1
+    i_chunks = np.array([[0, n_points]])
+
+    # the time series model computes its periodogram on initialisation
+    ts_model = tms.TimeSeriesModel(time, flux, flux_err, i_chunks)
+
+    # iterative prewhitening compiles the periodograms, the single frequency fits and the model kernels
+    ana.extract_sinusoids(ts_model, n_extract=3, select='a', logger=None)
+    ana.extract_single(ts_model.time, ts_model.residual(), f0=ts_model.pd_f0, fn=ts_model.pd_fn, select='sn')
+    ana.extract_local(ts_model.time, ts_model.residual(), 1., 2.)
+    ana.extract_approx(ts_model.time, ts_model.residual(), 3.)
+    ts_model.periodogram()
+
+    # the remaining single frequency and linear least-squares kernels
+    f_n, a_n, ph_n = ts_model.sinusoid.f_n, ts_model.sinusoid.a_n, ts_model.sinusoid.ph_n
+    pdg.scargle_ampl_phase(time, flux, f_n)
+    fit.refine_sinusoid_single(time, flux, f_n[0], a_n[0], ph_n[0])
+    fit.solve_sinusoid_amplitudes(time, flux, f_n)
+
+    return None
 
 
 def first_use_script():
@@ -50,6 +50,7 @@ class Config:
     nyquist_factor: float = 1.
     resolution_factor: float = 1.5
     window_width: float = 1.
+    use_gpu: bool = False
 
     # optimisation settings
     min_group: int = 45
@@ -60,6 +61,7 @@ class Config:
     data_dir: str = ''
     save_dir: str = ''
     save_ascii: bool = False
+    io_workers: int = 1
 
     # Tabulated files settings
     cn_time: str = 'time'
@@ -255,6 +257,9 @@ class Config:
             desc = "Periodogram spectral noise is calculated over this window width"
             file.write(config_item_description("window_width", self.window_width, desc))
 
+            desc = "Compute the full periodogram of each extraction step on a CUDA GPU (requires cupy)"
+            file.write(config_item_description("use_gpu", self.use_gpu, desc))
+
             # Optimisation settings
             file.write(fill_header_str("Optimisation settings", line_width, fill_value='-', end='\n'))
 
@@ -280,6 +285,10 @@ class Config:
             desc = "Save ascii variants of the HDF5 result files"
             file.write(config_item_description("save_ascii", self.save_ascii, desc))
 
+            desc = ("Number of worker processes (multiple files) or threads (uncompressed hdf5 file) for loading data; "
+                    "1 is serial")
+            file.write(config_item_description("io_workers", self.io_workers, desc))
+
             # Tabulated File settings
             file.write(fill_header_str("Tabulated File settings", line_width, fill_value='-', end='\n'))
 
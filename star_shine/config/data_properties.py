@@ -3,6 +3,7 @@ Satellite Time-series Analysis Routine using Sinusoids and Harmonics through Ite
 
 This module contains functions that evaluate certain configuration attributes that depend on data properties.
 """
+import math
 import numpy as np
 import numba as nb
 
@@ -13,7 +14,35 @@ from star_shine.config.helpers import get_config
 config = get_config()
 
 
-def signal_to_noise_threshold(time):
+@nb.njit('UniTuple(float64, 2)(float64[:])', cache=True, error_model='numpy')
+def time_step_extremes(time):
+    """Determine the smallest and largest time step in a single pass, without allocating the differences.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series, in ascending order (float64, callers cast other types).
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        dt_min: float
+            Smallest step between consecutive time stamps (inf for fewer than two points).
+        dt_max: float
+            Largest step between consecutive time stamps (-inf for fewer than two points).
+    """
+    dt_min = np.inf
+    dt_max = -np.inf
+    for i in range(len(time) - 1):
+        dt = time[i + 1] - time[i]
+        dt_min = min(dt_min, dt)
+        dt_max = max(dt_max, dt)
+
+    return dt_min, dt_max
+
+
+def signal_to_noise_threshold(time, dt_max=None):
     """Determine the signal-to-noise threshold for accepting frequencies based on the number of points
 
     Based on Baran & Koen 2021, eq 6. (https://ui.adsabs.harvard.edu/abs/2021AcA....71..113B/abstract)
@@ -25,25 +54,30 @@ def signal_to_noise_threshold(time):
     ----------
     time: numpy.ndarray[Any, dtype[float]]
         Timestamps of the time series.
+    dt_max: float, optional
+        Largest time step in the time series, if already known. Determined from time if not given.
 
     Returns
     -------
     float
         Signal-to-noise threshold for this data set.
     """
-    # if user defined (unequal to -1), return the configured number
-    if config.snr_thr != -1:
-        return config.snr_thr
+    # if user defined (unequal to -1), return the configured number (looked up once)
+    snr_thr_config = config.snr_thr
+    if snr_thr_config != -1:
+        return snr_thr_config
 
     # equation 6 from Baran & Koen 2021
-    snr_thr = 1.201 * np.sqrt(1.05 * np.log(len(time)) + 7.184)
+    snr_thr = 1.201 * math.sqrt(1.05 * math.log(len(time)) + 7.184)
 
     # increase threshold by 0.25 if gaps longer than 27 days
-    if np.any((time[1:] - time[:-1]) > 27):
+    if dt_max is None:
+        dt_max = time_step_extremes(np.asarray(time, dtype=np.float64))[1]
+    if dt_max > 27:
         snr_thr += 0.25
 
     # round to two decimals
-    snr_thr = np.round(snr_thr, 2)
+    snr_thr = round(snr_thr, 2)
 
     return snr_thr
 
@@ -57,19 +91,19 @@ def frequency_resolution(time):
     Parameters
     ----------
     time: numpy.ndarray[Any, dtype[float]]
-        Timestamps of the time series.
+        Timestamps of the time series, in ascending order.
 
     Returns
     -------
     float
         Frequency resolution of the time series
     """
-    f_res = config.resolution_factor / np.ptp(time)
+    # time is sorted (as assumed throughout), so the time base is given by the end points
+    f_res = config.resolution_factor / (time[-1] - time[0])
 
     return f_res
 
 
-@nb.njit(cache=True)
 def nyquist_sum_koen_2006(n, time, delta_t_min):
     """Calculate the Nyquist sum based on Koen (2006).
 
@@ -84,15 +118,15 @@ def nyquist_sum_koen_2006(n, time, delta_t_min):
 
     Returns
     -------
-    int
+    float
         Result of the sum of squares calculation.
 
     Examples
     --------
     # Iterate n until this sum returns zero to get to the true Nyquist frequency.
-    >>> delta_t_min = np.min(time[1:] - time[:-1])
-    >>> precision = 1e-10
-    >>> ss_nu = 1e-9
+    >>> delta_t_min = time_step_extremes(time)[0]
+    >>> precision = 1e-10 * len(time) * (len(time) - 1) / 2
+    >>> ss_nu = 1
     >>> n = 0
     >>> while (ss_nu > precision):
     >>>     n += 1
@@ -107,21 +141,33 @@ def nyquist_sum_koen_2006(n, time, delta_t_min):
     where the sampling is also not a simple multiple of some small value, is a multiple of the simple approximation
     of the Nyquist frequency:
     f = 1 / (2 * delta_t_min)
-    Since this function is computationally intensive, it is recommended to simply pick a multiple of the
-    simple approximation in case a higher value is desired.
+
+    The double sum is evaluated in O(N) instead of O(N^2), so it stays cheap for mission-length light curves
+    (there is no need for a parallel or GPU evaluation of the pairs), and the rigorous search over n is affordable.
+    With sin^2(d) = (1 - cos(2d)) / 2 and sum_{i<j} cos(2(x_j - x_i)) = (|sum_k exp(2i x_k)|^2 - N) / 2,
+    the sum over pairs becomes
+    N(N-1)/4 - ((sum cos(2x))^2 + (sum sin(2x))^2 - N) / 4.
+    The sum of N(N-1)/2 terms is never exactly zero in floating point, and the closed form has an absolute
+    rounding error of order N^2 times the machine precision, so compare with a precision that scales with the
+    number of terms (as in the example).
     """
     factor = n * np.pi / delta_t_min
 
     # evaluate equation 5 from Koen 2006 at nu = 2pi*n/delta_t_min
-    ss = 0
-    for i in range(0, len(time) - 1):
-        for j in range(i + 1, len(time)):
-            ss += np.sin(factor * (time[j] - time[i]))**2
+    # the time is centred to keep the arguments small
+    n_time = len(time)
+    two_x = time - np.mean(time)
+    two_x *= 2 * factor
+    # one scratch array serves both trigonometric functions
+    trig = np.cos(two_x)
+    cos_sum = np.sum(trig)
+    sin_sum = np.sum(np.sin(two_x, out=trig))
+    ss = n_time * (n_time - 1) / 4 - (cos_sum**2 + sin_sum**2 - n_time) / 4
 
     return ss
 
 
-def nyquist_frequency(time):
+def nyquist_frequency(time, dt_min=None):
     """Determines the maximum frequency for extraction and periodograms.
 
     The Nyquist frequency is calculated using the configured built-in function.
@@ -134,13 +180,18 @@ def nyquist_frequency(time):
     ----------
     time: numpy.ndarray[Any, dtype[float]]
         Timestamps of the time series.
+    dt_min: float, optional
+        Smallest time step in the time series, if already known. Determined from time if not given.
 
     Returns
     -------
     float
         Nyquist frequency of the time series
     """
+    if dt_min is None:
+        dt_min = time_step_extremes(np.asarray(time, dtype=np.float64))[0]
+
     # calculate the Nyquist frequency
-    f_nyquist = config.nyquist_factor / (2 * np.min(time[1:] - time[:-1]))
+    f_nyquist = config.nyquist_factor / (2 * dt_min)
 
     return f_nyquist
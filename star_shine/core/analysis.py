@@ -4,9 +4,10 @@ Satellite Time-series Analysis Routine using Sinusoids and Harmonics through Ite
 This Python module contains algorithms for data analysis.
 """
 import numpy as np
+import numba as nb
 
-from star_shine.core import time_series as tms, periodogram as pdg, fitting as fit
-from star_shine.core import frequency_sets as frs, utility as ut
+from star_shine.core import time_series as tms, model as mdl, periodogram as pdg, fitting as fit
+from star_shine.core import goodness_of_fit as gof, frequency_sets as frs, utility as ut
 from star_shine.config.helpers import get_config
 
 
@@ -48,25 +49,30 @@ def extract_single(time, flux, f0=-1, fn=-1, select='a'):
 
     See Also
     --------
-    scargle, scargle_phase_single
+    scargle, scargle_nufft, scargle_cuda, scargle_phase_single
     """
     df = 0.1 / np.ptp(time)  # default frequency sampling is about 1/10 of frequency resolution
 
-    # full LS periodogram
-    freqs, ampls = pdg.scargle_parallel(time, flux, f0=f0, fn=fn, df=df)
+    # full LS periodogram (on the GPU if enabled, else with NUFFTs if available, else in single precision
+    # since the peak is refined below in double precision)
+    if config.use_gpu and pdg.cp is not None:
+        freqs, ampls = pdg.scargle_cuda(time, flux, f0=f0, fn=fn, df=df)
+    elif pdg.finufft is not None:
+        freqs, ampls = pdg.scargle_nufft(time, flux, f0=f0, fn=fn, df=df)
+    else:
+        freqs, ampls = pdg.scargle_parallel(time, flux, f0=f0, fn=fn, df=df, single=True)
 
-    # selection step based on flux to noise (refine step keeps using ampl)
+    # select highest amplitude, or highest flux to noise (refine step keeps using ampl)
     if select == 'sn':
         noise_spectrum = pdg.scargle_noise_spectrum_redux(freqs, ampls, window_width=1.0)
-        ampls = ampls / noise_spectrum
-
-    # select highest amplitude
-    i_f_max = np.argmax(ampls)
+        i_f_max = ut.argmax_ratio(ampls, noise_spectrum)
+    else:
+        i_f_max = np.argmax(ampls)
 
     # refine frequency by increasing the frequency resolution x100
     f_left = max(freqs[i_f_max] - df, df / 10)  # may not get too low
     f_right = freqs[i_f_max] + df
-    f_refine, a_refine = pdg.scargle(time, flux, f0=f_left, fn=f_right, df=df/100)
+    f_refine, a_refine = pdg.scargle_parallel(time, flux, f0=f_left, fn=f_right, df=df / 100)
 
     # select refined highest amplitude
     i_f_max = np.argmax(a_refine)
@@ -127,7 +133,7 @@ def extract_local(time, flux, f0, fn):
     # refine frequency by increasing the frequency resolution x100
     f_left = max(freqs[i_f_max] - df, df / 10)  # may not get too low
     f_right = freqs[i_f_max] + df
-    f_refine, a_refine = pdg.scargle(time, flux, f0=f_left, fn=f_right, df=df / 100)
+    f_refine, a_refine = pdg.scargle_parallel(time, flux, f0=f_left, fn=f_right, df=df / 100)
 
     # select refined highest amplitude
     i_f_max = np.argmax(a_refine)
@@ -178,7 +184,7 @@ def extract_approx(time, flux, f_approx):
     # refine frequency by increasing the frequency resolution x100
     f_left = max(freqs[i_f_max] - df, df / 10)
     f_right = freqs[i_f_max] + df
-    f_refine, a_refine = pdg.scargle(time, flux, f0=f_left, fn=f_right, df=df / 100)
+    f_refine, a_refine = pdg.scargle_parallel(time, flux, f0=f_left, fn=f_right, df=df / 100)
 
     # select refined highest amplitude
     i_f_max = np.argmax(a_refine)
@@ -210,8 +216,12 @@ def refine_subset(ts_model, close_f, logger=None):
     --------
     extract_sinusoids
     """
-    # get all the harmonics (regardless of base)
-    i_harmonics = np.arange(len(ts_model.sinusoid.harmonics))[ts_model.sinusoid.harmonics]
+    # mark the harmonics among the subset (regardless of base)
+    close_f = np.atleast_1d(close_f)
+    is_harmonic_close = ts_model.sinusoid.harmonics[close_f]
+
+    # frequency sampling of extract_approx, also used as the maximum frequency step of the local refinement
+    df = ts_model.pd_df
 
     # determine initial bic
     bic_prev = ts_model.bic()
@@ -223,23 +233,38 @@ def refine_subset(ts_model, close_f, logger=None):
         f_c, a_c, ph_c = ts_model.sinusoid.get_sinusoid_parameters(exclude=False)
 
         # remove each frequency one at a time to then re-extract them
-        for j in close_f:
+        for j, is_harmonic_j in zip(close_f, is_harmonic_close):
             # exclude the sinusoid
             ts_model.exclude_sinusoids(j)
             # update the linear model for good measure
             ts_model.update_linear_model()
 
-            # improve sinusoid j by re-extracting its parameters
-            f_j = ts_model.sinusoid.f_n[j]
-            if j in i_harmonics:
+            # improve sinusoid j by re-extracting its parameters (not yet changed in this pass, so read from f_c)
+            f_j = f_c[j]
+            resid = ts_model.residual()
+            if is_harmonic_j:
                 # if f is a harmonic, don't shift the frequency
-                a_j, ph_j = pdg.scargle_ampl_phase_single(ts_model.time, ts_model.residual(), f_j)
+                a_j, ph_j = pdg.scargle_ampl_phase_single(ts_model.time, resid, f_j)
             else:
-                f_j, a_j, ph_j = extract_approx(ts_model.time, ts_model.residual(), f_j)
+                # a few Gauss-Newton steps from the current parameters, re-extract if that fails or moves too far
+                a_j, ph_j = a_c[j], ph_c[j]
+                f_r, a_r, ph_r = fit.refine_sinusoid_single(ts_model.time, resid, f_j, a_j, ph_j)
+                if np.isfinite(f_r) and abs(f_r - f_j) < df:
+                    f_j, a_j, ph_j = f_r, a_r, ph_r
+                else:
+                    f_j, a_j, ph_j = extract_approx(ts_model.time, resid, f_j)
 
             # update the model
             ts_model.update_sinusoids(f_j, a_j, ph_j, j)
 
+        # jointly re-solve the amplitudes and phases of the subset, which the one-at-a-time updates only approach
+        f_n, a_n, ph_n = ts_model.sinusoid.f_n, ts_model.sinusoid.a_n, ts_model.sinusoid.ph_n
+        h_base, h_mult = ts_model.sinusoid.h_base, ts_model.sinusoid.h_mult
+        ts_model.exclude_sinusoids(close_f)
+        ts_model.update_linear_model()
+        a_n[close_f], ph_n[close_f] = fit.solve_sinusoid_amplitudes(ts_model.time, ts_model.residual(), f_n[close_f])
+        ts_model.update_sinusoids(f_n, a_n, ph_n, close_f, h_base_new=h_base, h_mult_new=h_mult)
+
         # as a last model-refining step, redetermine the constant and slope
         ts_model.update_linear_model()
 
@@ -247,8 +272,8 @@ def refine_subset(ts_model, close_f, logger=None):
         bic = ts_model.bic()
         d_bic = bic_prev - bic
 
-        # stop the loop when the BIC increases
-        condition_1 = np.round(d_bic, 2) > 0
+        # stop the loop when the BIC increases (by more than the rounding to two decimals)
+        condition_1 = d_bic > 5e-3
 
         # check acceptance condition before moving to the next iteration
         if condition_1:
@@ -288,33 +313,44 @@ def replace_subset(ts_model, close_f, final_remove=True, logger=None):
     """
     # standard frequency resolution (not the user defined one)
     freq_res = 1 / ts_model.t_tot
-    # get all the harmonics (regardless of base)
-    i_harmonics = np.arange(len(ts_model.sinusoid.harmonics))[ts_model.sinusoid.harmonics]
+    # boolean masks for the harmonics (regardless of base) and the excluded sinusoids, indices in close_f stay valid
+    # because added sinusoids are appended at the end
+    is_harmonic = ts_model.sinusoid.harmonics
+    is_excluded = ~ts_model.sinusoid.include
 
-    # make all combinations of consecutive frequencies in close_f (longer sets first)
-    close_f_sets = ut.consecutive_subsets(close_f)
+    # make all combinations of consecutive frequencies in close_f (longer sets first), as positions in close_f
+    close_f = np.atleast_1d(close_f)
+    close_f_sets = ut.consecutive_subsets(np.arange(len(close_f)))
 
     # determine initial quantities
-    n_sin_tot_init = len(ts_model.sinusoid.f_n)
-    n_excluded_init = np.sum(~ts_model.sinusoid.include)
+    n_sin_tot_init = len(is_excluded)
+    n_excluded_init = np.sum(is_excluded)
     bic_prev = ts_model.bic()
 
+    # the sinusoids in close_f do not change in the loop, only the total number of sinusoids does, so their
+    # curves are evaluated once for excluding and including them again
+    f_c = ts_model.sinusoid.f_n
+    n_sin_tot = n_sin_tot_init
+    curves_c = mdl.sine_curves(ts_model.time, f_c[close_f], ts_model.sinusoid.a_n[close_f],
+                               ts_model.sinusoid.ph_n[close_f])
+
     # loop over all subsets:
-    for set_i in close_f_sets:
+    for pos_i in close_f_sets:
+        set_i = close_f[pos_i]
+
         # if set_i contains removed sinusoids, skip (order of sets matters)
-        if np.any(~ts_model.sinusoid.include[set_i]):
+        if is_excluded[set_i].any():
             continue
 
         # exclude the next set of sinusoids
-        ts_model.exclude_sinusoids(set_i)
+        ts_model.exclude_sinusoids(set_i, curves=curves_c[pos_i])
         # update the linear model for good measure
         ts_model.update_linear_model()
 
         # check for harmonics
-        harm_i = [h for h in set_i if h in i_harmonics]
+        harm_i = set_i[is_harmonic[set_i]]
 
         # remove all frequencies in the set and re-extract one
-        f_c = ts_model.sinusoid.f_n  # current frequencies
         if len(harm_i) > 0:
             # if f is a harmonic, don't shift the frequency
             f_i = f_c[harm_i]  # can be more than one harmonic
@@ -326,26 +362,29 @@ def replace_subset(ts_model, close_f, final_remove=True, logger=None):
 
         # add sinusoid to the model
         ts_model.add_sinusoids(f_i, a_i, ph_i)
-        # as a last model-refining step, redetermine the constant and slope
-        ts_model.update_linear_model()
+        n_new = len(np.atleast_1d(f_i))
 
-        # calculate BIC before moving to the next iteration
-        bic = ts_model.bic()
+        # calculate BIC with the constant and slope redetermined, the linear model is only updated on acceptance
+        bic = ts_model.bic_linear_refit()
         d_bic = bic_prev - bic
 
-        # acceptance condition for replacement
-        condition_1 = np.round(d_bic, 2) > 0
+        # acceptance condition for replacement (BIC decrease larger than the rounding to two decimals)
+        condition_1 = d_bic > 5e-3
 
         # check acceptance condition before moving to the next iteration
         if condition_1:
             # accept the changes
             bic_prev = bic
+            is_excluded[set_i] = True
+            n_sin_tot += n_new
+            # as a last model-refining step, redetermine the constant and slope
+            ts_model.update_linear_model()
         else:
             # remove the added sinusoid(s)
-            ts_model.remove_sinusoids(np.arange(len(f_c), len(f_c) + len(np.atleast_1d(f_i))))
+            ts_model.remove_sinusoids(np.arange(n_sin_tot, n_sin_tot + n_new))
 
             # include the excluded sinusoids
-            ts_model.include_sinusoids(set_i)
+            ts_model.include_sinusoids(set_i, curves=curves_c[pos_i])
             ts_model.update_linear_model()
 
     # determine number of excluded
@@ -437,8 +476,10 @@ def extract_sinusoids(ts_model, bic_thr=2, snr_thr=0, stop_crit='bic', select='h
     else:
         switch = False
 
-    # determine the initial bic
-    bic_prev = ts_model.bic()  # initialise current BIC to the mean (and slope) subtracted flux
+    # determine the initial residual and bic
+    resid = ts_model.residual()
+    bic_prev = ts_model.bic(residual=resid)  # initialise current BIC to the mean (and slope) subtracted flux
+    bic_thr_round = bic_thr + 5e-3  # same as rounding d_bic to two decimals (for thresholds with two decimals)
 
     # log a message
     if logger is not None:
@@ -459,14 +500,14 @@ def extract_sinusoids(ts_model, bic_thr=2, snr_thr=0, stop_crit='bic', select='h
         _, h_base, h_mult = ts_model.sinusoid.get_harmonic_parameters(exclude=False)
 
         # attempt to extract the next frequency
-        f_i, a_i, ph_i = extract_single(ts_model.time, ts_model.residual(), f0=ts_model.pd_f0, fn=ts_model.pd_fn,
-                                        select=select)
+        f_i, a_i, ph_i = extract_single(ts_model.time, resid, f0=ts_model.pd_f0, fn=ts_model.pd_fn, select=select)
         ts_model.add_sinusoids(f_i, a_i, ph_i)
 
         # update the linear pars
         ts_model.update_linear_model()
 
         # improve sinusoids with some strategy
+        close_f = None
         if fit_each_step:
             # fit all sinusoids for best improvement
             fit.fit_multi_sinusoid_grouped(ts_model, g_min=g_min, g_max=g_max, logger=logger)
@@ -477,27 +518,31 @@ def extract_sinusoids(ts_model, bic_thr=2, snr_thr=0, stop_crit='bic', select='h
             if len(close_f) > 1:
                 # iterate over (re-extract) close frequencies (around f_i) a number of times to improve them
                 refine_subset(ts_model, close_f, logger=logger)
+                close_f = None  # the frequencies may have shifted
 
-        # possibly replace close frequencies
+        # possibly replace close frequencies (the chain is reused if the frequencies did not change)
         if replace_each_step:
-            close_f = frs.f_within_rayleigh(ts_model.sinusoid.n_sin - 1, ts_model.sinusoid.f_n, ts_model.f_resolution)
+            if close_f is None:
+                close_f = frs.f_within_rayleigh(ts_model.sinusoid.n_sin - 1, ts_model.sinusoid.f_n,
+                                                ts_model.f_resolution)
             if len(close_f) > 1:
                 replace_subset(ts_model, close_f, logger=logger)
 
-        # calculate BIC
-        bic = ts_model.bic()
+        # calculate the residual once and the BIC from it
+        resid = ts_model.residual()
+        bic = ts_model.bic(residual=resid)
         d_bic = bic_prev - bic
 
         # acceptance condition
         if stop_crit == 'snr':
             # calculate SNR in a 1 c/d window around the extracted frequency
-            noise = pdg.scargle_noise_at_freq(np.array([f_i]), ts_model.time, ts_model.residual(), window_width=1.0)
+            noise = pdg.scargle_noise_at_freq(np.array([f_i]), ts_model.time, resid, window_width=1.0)
             snr = a_i / noise
             # stop the loop if snr threshold not met
             condition_1 = snr > snr_thr
         else:
             # stop the loop when the BIC decreases by less than bic_thr (or increases)
-            condition_1 = np.round(d_bic, 2) > bic_thr
+            condition_1 = d_bic > bic_thr_round
 
         # check acceptance condition before moving to the next iteration
         if condition_1:
@@ -506,6 +551,7 @@ def extract_sinusoids(ts_model, bic_thr=2, snr_thr=0, stop_crit='bic', select='h
         else:
             ts_model.set_sinusoids(f_c, a_c, ph_c, h_base_new=h_base, h_mult_new=h_mult)
             ts_model.update_linear_model()
+            resid = ts_model.residual()
 
         # stop the loop if n_sin reaches limit
         condition_2 = ts_model.sinusoid.n_sin - n_sin_init < n_extract
@@ -555,12 +601,13 @@ def couple_harmonics(ts_model, f_base, logger=None):
     # determine initial quantities
     n_harm_init = len(harmonics)
 
-    # go through the harmonics by harmonic number and re-extract them (n==1 must come first, if present)
-    for n in np.unique(h_mult):
-        # get the indices to exclude, disregarding included state
-        n_sin_tot = len(ts_model.sinusoid.f_n)
-        remove = np.arange(n_sin_tot)[harmonics][h_mult == n]
+    # group the candidate indices by harmonic number in one sort (indices stay valid since new ones are appended)
+    sorter = np.argsort(h_mult, kind='stable')
+    h_mult_unique, i_split = np.unique(h_mult[sorter], return_index=True)
+    remove_per_n = np.split(harmonics[sorter], i_split[1:])
 
+    # go through the harmonics by harmonic number and re-extract them (n==1 must come first, if present)
+    for n, remove in zip(h_mult_unique, remove_per_n):
         # exclude the neighbouring harmonic candidates and update linear model
         ts_model.exclude_sinusoids(remove)
         ts_model.update_linear_model()
@@ -605,53 +652,78 @@ def extract_harmonics(ts_model, bic_thr=2, logger=None):
     --------
     fix_harmonic_frequency
     """
-    # make lists of not-present possible harmonics paired with their base frequency
-    i_base_all = []
-    f_base_all = []
-    h_candidates_n = []
-    for i_base in np.unique(ts_model.sinusoid.h_base[ts_model.sinusoid.harmonics]):
+    # group the existing harmonic numbers by base frequency in one sort
+    f_n = ts_model.sinusoid.f_n
+    harmonics = ts_model.sinusoid.harmonics
+    h_base, h_mult = ts_model.sinusoid.h_base[harmonics], ts_model.sinusoid.h_mult[harmonics]
+    sorter = np.argsort(h_base, kind='stable')
+    i_base_unique, i_split = np.unique(h_base[sorter], return_index=True)
+    h_mult_per_base = np.split(h_mult[sorter], i_split[1:]) if len(sorter) > 0 else []
+
+    # make arrays of not-present possible harmonics paired with their base frequency
+    harmonics_per_base = []
+    for i_base, h_mult_i in zip(i_base_unique, h_mult_per_base):
         # the range of harmonic multipliers below twice (!) the Nyquist frequency
-        harmonics_i = np.arange(1, 2 * ts_model.pd_fn / ts_model.sinusoid.f_n[i_base], dtype=int)
+        harmonics_i = np.arange(1, 2 * ts_model.pd_fn / f_n[i_base], dtype=int)
 
         # h_mult minus one is the position for existing harmonics
-        harmonics_i = np.delete(harmonics_i, ts_model.sinusoid.h_mult[ts_model.sinusoid.h_base == i_base] - 1)
-        h_candidates_n.extend(harmonics_i)
+        harmonics_i = np.delete(harmonics_i, h_mult_i - 1)
+        harmonics_per_base.append(harmonics_i)
 
-        # add to the bae frequency lists
-        i_base_all.extend([i_base for _ in range(len(harmonics_i))])
-        f_base_all.extend([ts_model.sinusoid.f_n[i_base] for _ in range(len(harmonics_i))])
+    # concatenate once and repeat the base frequency info for each candidate
+    n_per_base = np.array([len(harmonics_i) for harmonics_i in harmonics_per_base], dtype=int)
+    h_candidates_n = np.concatenate(harmonics_per_base) if len(harmonics_per_base) > 0 else np.zeros(0, dtype=int)
+    i_base_all = np.repeat(i_base_unique, n_per_base)
+    f_base_all = f_n[i_base_all]
 
     # determine initial quantities
     n_sin_init = ts_model.sinusoid.n_sin
-    bic_prev = ts_model.bic()  # initialise current BIC to the mean (and slope) subtracted flux
+    resid = ts_model.residual()
+    bic_prev = ts_model.bic(residual=resid)  # initialise current BIC to the mean (and slope) subtracted flux
+    bic_thr_round = bic_thr + 5e-3  # same as rounding d_bic to two decimals (for thresholds with two decimals)
 
     if logger is not None:
         logger.extra(f"N_f= {ts_model.sinusoid.n_sin}, BIC= {bic_prev:1.2f} - Extract harmonics")
 
+    # the residual only changes when a candidate is accepted, so amplitudes and phases of the upcoming candidates
+    # are determined in parallel blocks, which are recomputed after an acceptance (at most a block is wasted)
+    f_candidates = h_candidates_n * f_base_all
+    a_candidates = np.zeros(len(f_candidates))
+    ph_candidates = np.zeros(len(f_candidates))
+    n_block = max(nb.get_num_threads(), 3)
+    i_valid = 0
+
     # loop over candidates and try to extract (BIC decreases by 2 or more)
     for i in range(len(i_base_all)):
-        f_i = h_candidates_n[i] * f_base_all[i]
-        a_i, ph_i = pdg.scargle_ampl_phase_single(ts_model.time, ts_model.residual(), f_i)
+        if i >= i_valid:
+            i_valid = i + n_block
+            a_candidates[i:i_valid], ph_candidates[i:i_valid] = pdg.scargle_ampl_phase(ts_model.time, resid,
+                                                                                       f_candidates[i:i_valid])
+
+        f_i, a_i, ph_i = f_candidates[i], a_candidates[i], ph_candidates[i]
 
         # add harmonic candidate and redetermine the constant and slope
         ts_model.add_sinusoids(f_i, a_i, ph_i, h_base_new=i_base_all[i], h_mult_new=h_candidates_n[i])
         ts_model.update_linear_model()
 
         # determine new BIC and whether it improved
-        bic = ts_model.bic()
+        resid = ts_model.residual()
+        bic = ts_model.bic(residual=resid)
         d_bic = bic_prev - bic
 
         # stop the loop when the BIC decreases by less than bic_thr (or increases)
-        condition_1 = np.round(d_bic, 2) > bic_thr
+        condition_1 = d_bic > bic_thr_round
 
         # check acceptance condition before moving to the next iteration
         if condition_1:
-            # accept the new frequency
+            # accept the new frequency, the remaining candidates need to be re-evaluated
             bic_prev = bic
+            i_valid = 0
         else:
             # h_c is rejected, revert to previous model
             ts_model.remove_sinusoids(len(ts_model.sinusoid.f_n) - 1)  # remove last added
             ts_model.update_linear_model()
+            resid = ts_model.residual()
 
         if logger is not None and condition_1:
             logger.extra(f"N_f= {ts_model.sinusoid.n_sin}, BIC= {bic:1.2f} - Extracted: "
@@ -719,36 +791,92 @@ def remove_sinusoids_single(ts_model, logger=None):
     """
     # determine initial quantities
     n_sin_init = len(ts_model.sinusoid.f_n)
-    bic_prev = ts_model.bic()
+    resid = ts_model.residual()
+    bic_prev = ts_model.bic(residual=resid)
+
+    # the parameters do not change here, so each sinusoid is evaluated once and added back to the residual
+    # for every trial removal, instead of being subtracted from and added to the model; this screening is done
+    # in single precision, and a removal that passes it is confirmed on the model in double precision
+    f_n, a_n, ph_n = ts_model.sinusoid.get_sinusoid_parameters(exclude=False)
+    sine_curves = mdl.sine_curves_single(ts_model.time, f_n, a_n, ph_n)
+
+    # the linear refit only depends on the residual through a few sums per chunk, the rest is computed once
+    time_sums = gof.linear_refit_time_sums(ts_model.time, ts_model.i_chunks)
+    curve_sums = gof.linear_refit_curve_sums(ts_model.time, sine_curves, ts_model.i_chunks)
+
+    # bound on the single precision error of the screened BIC: the product of each curve with the residual has an
+    # error of about 2 sqrt(n) eps32 |curve| |resid|, and the rounding of both adds 4 eps32 |curve| |resid|, which
+    # changes the BIC by n / |resid|^2 times that; a removal that is within this margin is checked in double precision
+    n_time = ts_model.n_time
+    eps_32 = np.finfo(np.float32).eps
+    curve_norm = np.sqrt(np.sum(curve_sums[2], axis=0))
+    bic_tol_factor = 2 * n_time * (np.sqrt(n_time) + 2) * eps_32 * curve_norm
+
+    n_block_min = 32  # at most a block of trial removals is wasted after an accepted removal
+    include = ts_model.sinusoid.include
+    h_mult = ts_model.sinusoid.h_mult
+    n_param_i = np.where(ts_model.sinusoid.harmonics, 2, 3)  # harmonic frequencies are not free parameters
 
     # while frequencies are added to the exclude list, continue loop
-    n_sin = np.sum(ts_model.sinusoid.include)
+    n_sin = np.sum(include)
     n_prev = n_sin + 1
+    i_change = n_sin_init
     while n_sin < n_prev:
         n_prev = n_sin
+        i_change_prev, i_change = i_change, -1
+
+        # the BICs without each sinusoid (with the constant and slope redetermined) are determined at once for a
+        # block of upcoming sinusoids, which only needs to be redone after a removal is accepted
+        bic_removed = np.zeros(n_sin_init)
+        bic_tol = np.zeros(n_sin_init)
+        i_valid = 0
+        n_block = n_block_min
         for i in range(n_sin_init):
+            # the sinusoids after the last removal of the previous sweep were already tried on the current model
+            if i > i_change_prev and i_change == -1:
+                break
+
             # continue if sinusoid is already excluded, or when it is a base harmonic
-            if not ts_model.sinusoid.include[i] or ts_model.sinusoid.h_mult[i] == 1:
+            if not include[i] or h_mult[i] == 1:
                 continue
 
-            # exclude sinusoid and redetermine the constant and slope
-            ts_model.exclude_sinusoids(i)
-            ts_model.update_linear_model()
+            if i >= i_valid:
+                i_valid = i + n_block
+                block = slice(i, i_valid)
+                n_param_block = ts_model.n_param - n_param_i[block]
+                bic_removed[block] = gof.calc_bic_linear_refit_batch(ts_model.time, resid, sine_curves[block],
+                                                                     ts_model.i_chunks, n_param_block,
+                                                                     time_sums=time_sums,
+                                                                     curve_sums=[c[:, block] for c in curve_sums])
+                bic_tol[block] = bic_tol_factor[block] / np.sqrt(resid @ resid)
+                # while no removals are accepted, the blocks grow to make better use of the matrix products
+                n_block *= 2
+
+            # skip the sinusoid if removing it does not look like an improvement, within the rounding margin
+            if bic_removed[i] >= bic_prev + bic_tol[i]:
+                continue
 
             # determine new BIC and whether it improved
-            bic = ts_model.bic()
+            ts_model.exclude_sinusoids(i)
+            bic = ts_model.bic_linear_refit()
             d_bic = bic_prev - bic
 
-            # only remove sinusoid if it increases the BIC
-            condition_1 = np.round(d_bic, 2) > 0
+            # only remove sinusoid if it increases the BIC (by more than the rounding to two decimals)
+            condition_1 = d_bic > 5e-3
 
             # check acceptance condition before moving to the next iteration
             if condition_1:
                 # accept the removal
+                ts_model.update_linear_model()
+                resid = ts_model.residual()
                 bic_prev = bic
-                n_sin = np.sum(ts_model.sinusoid.include)
+                include[i] = False
+                n_sin = np.sum(include)
+                i_valid = 0
+                n_block = n_block_min
+                i_change = i
             else:
-                # removal is rejected, revert to previous model
+                # put the sinusoid back
                 ts_model.include_sinusoids(i)
 
     # lastly re-determine slope and const and remove the excluded frequencies
@@ -783,20 +911,29 @@ def replace_sinusoid_groups(ts_model, logger=None):
     n_excluded_init = np.sum(~ts_model.sinusoid.include)
 
     # while frequencies are added to the exclude list, continue loop
-    n_sin = np.sum(ts_model.sinusoid.include)
+    n_sin = ts_model.sinusoid.n_sin
     n_prev = n_sin + 1
+    i_change = len(close_f_groups)
     while n_sin < n_prev:
         n_prev = n_sin
+        i_change_prev, i_change = i_change, -1
         for i, close_f in enumerate(close_f_groups):
+            # the groups after the last replacement of the previous sweep were already tried on the current model
+            if i > i_change_prev and i_change == -1:
+                break
+
             # continue if full sinusoid set is already excluded
-            if np.all(~ts_model.sinusoid.include[close_f]):
+            if not np.any(ts_model.sinusoid.include[close_f]):
                 continue
 
-            # use the replace_subset function to handle the details
+            # use the replace_subset function to handle the details, accepted replacements add sinusoids
+            n_sin_tot = len(ts_model.sinusoid.f_n)
             replace_subset(ts_model, close_f, final_remove=False, logger=None)
+            if len(ts_model.sinusoid.f_n) > n_sin_tot:
+                i_change = i
 
             # update number of sinusoids after replacement
-            n_sin = np.sum(ts_model.sinusoid.include)
+            n_sin = ts_model.sinusoid.n_sin
 
     # determine number of excluded and added
     n_excluded = np.sum(~ts_model.sinusoid.include[:n_sin_tot_init])
@@ -880,6 +1017,47 @@ def select_sinusoids(ts_model, logger=None):
     return None
 
 
+def harmonic_distance_minimum(f_refine, f_n, freq_res, f_max):
+    """Find the frequency of minimum harmonic distance within the peak of harmonic series length on a dense grid.
+
+    Parameters
+    ----------
+    f_refine: numpy.ndarray[Any, dtype[float]]
+        Dense grid of test base frequencies.
+    f_n: numpy.ndarray[Any, dtype[float]]
+        The frequencies of a number of sinusoids.
+    freq_res: float
+        Frequency resolution
+    f_max: float
+        Highest allowed frequency at which signals are extracted
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        i_min: int
+            Index in f_refine of the minimum distance within the peak.
+        mask_peak: numpy.ndarray[Any, dtype[bool]]
+            Mask of the peak domain in f_refine.
+        h_measure: numpy.ndarray[Any, dtype[float]]
+            Number of harmonics times completeness for each of f_refine.
+        distance: numpy.ndarray[Any, dtype[float]]
+            Sum of squared distances between harmonics for each of f_refine.
+
+    See Also
+    --------
+    frs.harmonic_series_length
+    """
+    n_harm_r, completeness_r, distance_r = frs.harmonic_series_length(f_refine, f_n, freq_res, f_max)
+    h_measure = n_harm_r * completeness_r  # compute h_measure for constraining a domain
+    mask_peak = (h_measure > np.max(h_measure) / 1.5)  # constrain the domain of the search
+
+    # the minimum distance inside the peak, without making masked copies
+    i_min = np.argmin(np.where(mask_peak, distance_r, np.inf))
+
+    return i_min, mask_peak, h_measure, distance_r
+
+
 def refine_harmonic_base_frequency(f_base, ts_model):
     """Refine the base frequency for a harmonic sinusoid model.
 
@@ -910,11 +1088,8 @@ def refine_harmonic_base_frequency(f_base, ts_model):
 
     # refine by using a dense sampling and the harmonic distances
     f_refine = np.arange(0.99 * f_base, 1.01 * f_base, 0.00001 * f_base)
-    n_harm_r, completeness_r, distance_r = frs.harmonic_series_length(f_refine, f_n, freq_res, f_nyquist)
-    h_measure = n_harm_r * completeness_r  # compute h_measure for constraining a domain
-    mask_peak = (h_measure > np.max(h_measure) / 1.5)  # constrain the domain of the search
-    i_min_dist = np.argmin(distance_r[mask_peak])
-    f_base = f_refine[mask_peak][i_min_dist]
+    i_min, _, _, _ = harmonic_distance_minimum(f_refine, f_n, freq_res, f_nyquist)
+    f_base = f_refine[i_min]
 
     return f_base
 
@@ -959,26 +1134,18 @@ def find_harmonic_base_frequency(ts_model):
 
     # refine by using a dense sampling and the harmonic distances
     f_refine = np.arange(0.99 * f_base, 1.01 * f_base, 0.00001 * f_base)
-    n_harm_r, completeness_r, distance_r = frs.harmonic_series_length(f_refine, f_n, freq_res, f_nyquist)
-    h_measure = n_harm_r * completeness_r  # compute h_measure for constraining a domain
-    mask_peak = (h_measure > np.max(h_measure) / 1.5)  # constrain the domain of the search
-    i_min_dist = np.argmin(distance_r[mask_peak])
-    f_base = f_refine[mask_peak][i_min_dist]
-
-    # reduce the search space by taking limits in the distance metric
-    f_left = f_refine[mask_peak][:i_min_dist]
-    f_right = f_refine[mask_peak][i_min_dist:]
-    d_left = distance_r[mask_peak][:i_min_dist]
-    d_right = distance_r[mask_peak][i_min_dist:]
+    i_min, mask_peak, h_measure, distance_r = harmonic_distance_minimum(f_refine, f_n, freq_res, f_nyquist)
+    f_base = f_refine[i_min]
+    h_measure_base = h_measure[i_min]
+
+    # reduce the search space by taking limits in the distance metric, left and right of the minimum in the peak
+    i_peak = np.flatnonzero(mask_peak)
+    i_left, i_right = np.split(i_peak, [np.searchsorted(i_peak, i_min)])
     d_max = np.max(distance_r)
-    if np.any(d_left > d_max / 2):
-        f_l_bound = f_left[d_left > d_max / 2][-1]
-    else:
-        f_l_bound = f_refine[mask_peak][0]
-    if np.any(d_right > d_max / 2):
-        f_r_bound = f_right[d_right > d_max / 2][0]
-    else:
-        f_r_bound = f_refine[mask_peak][-1]
+    i_left_far = i_left[distance_r[i_left] > d_max / 2]
+    i_right_far = i_right[distance_r[i_right] > d_max / 2]
+    f_l_bound = f_refine[i_left_far[-1]] if len(i_left_far) > 0 else f_refine[i_peak[0]]
+    f_r_bound = f_refine[i_right_far[0]] if len(i_right_far) > 0 else f_refine[i_peak[-1]]
     bound_interval = f_r_bound - f_l_bound
 
     # decide on the multiple of the period
@@ -986,29 +1153,26 @@ def find_harmonic_base_frequency(ts_model):
     completeness_p = (len(harmonics) / (f_nyquist // f_base))
     completeness_p_l = (len(harmonics[harmonic_n <= 15]) / (f_nyquist // f_base))
 
-    # check these (commonly missed) fractions
-    n_multiply = np.array([1/2, 2, 3, 4, 5])
+    # check these (commonly missed) fractions, together with double the fractions 3, 4 and 5
+    n_multiply = np.array([1/2, 2, 3, 4, 5, 6, 8, 10])
     f_fracs = f_base / n_multiply
     n_harm_r_m, completeness_r_m, distance_r_m = frs.harmonic_series_length(f_fracs, f_n, freq_res, f_nyquist)
     h_measure_m = n_harm_r_m * completeness_r_m  # compute h_measure for constraining a domain
 
-    # if there are very high numbers, add double that fraction for testing
-    test_frac = h_measure_m / h_measure[mask_peak][i_min_dist]
-    if np.any(test_frac[2:] > 3):
-        n_multiply = np.append(n_multiply, [2 * n_multiply[2:][test_frac[2:] > 3]])
-        f_fracs = f_base / n_multiply
-        n_harm_r_m, completeness_r_m, distance_r_m = frs.harmonic_series_length(f_fracs, f_n, freq_res, f_nyquist)
-        h_measure_m = n_harm_r_m * completeness_r_m  # compute h_measure for constraining a domain
+    # only if there are very high numbers, double that fraction is tested
+    test_frac = h_measure_m / h_measure_base
+    use_frac = np.ones(len(n_multiply), dtype=bool)
+    use_frac[5:] = test_frac[2:5] > 3
+    f_fracs, completeness_r_m, test_frac = f_fracs[use_frac], completeness_r_m[use_frac], test_frac[use_frac]
 
-    # compute diagnostic fractions that need to meet some threshold
-    test_frac = h_measure_m / h_measure[mask_peak][i_min_dist]
+    # compute diagnostic fraction that needs to meet some threshold
     compl_frac = completeness_r_m / completeness_p
 
     # doubling the period may be done if the harmonic filling factor below f_16 is very high
     f_cut = np.max(f_n[harmonics][harmonic_n <= 15])
     f_n_c = f_n[f_n <= f_cut]
-    n_harm_r_2, completeness_r_2, distance_r_2 = frs.harmonic_series_length(f_fracs, f_n_c, freq_res, f_nyquist)
-    compl_frac_2 = completeness_r_2[1] / completeness_p_l
+    n_harm_r_2, completeness_r_2, distance_r_2 = frs.harmonic_series_length(f_fracs[1:2], f_n_c, freq_res, f_nyquist)
+    compl_frac_2 = completeness_r_2[0] / completeness_p_l
 
     # empirically determined thresholds for the various measures
     minimal_frac = 1.1
@@ -1034,10 +1198,7 @@ def find_harmonic_base_frequency(ts_model):
 
         # refine by using a dense sampling and the harmonic distances
         f_refine_2 = np.arange(f_left_b, f_right_b, 0.00001 * f_base)
-        n_harm_r2, completeness_r2, distance_r2 = frs.harmonic_series_length(f_refine_2, f_n, freq_res, f_nyquist)
-        h_measure_2 = n_harm_r2 * completeness_r2  # compute h_measure for constraining a domain
-        mask_peak = (h_measure_2 > np.max(h_measure_2) / 1.5)  # constrain the domain of the search
-        i_min_dist = np.argmin(distance_r2[mask_peak])
-        f_base = f_refine_2[mask_peak][i_min_dist]
+        i_min, _, _, _ = harmonic_distance_minimum(f_refine_2, f_n, freq_res, f_nyquist)
+        f_base = f_refine_2[i_min]
 
     return f_base
@@ -64,6 +64,162 @@ def dsin_dx(two_pi_t, f, a, ph, d='f', f_base=0):
     return model_deriv
 
 
+@nb.njit(cache=True)
+def refine_sinusoid_single(time, flux, f, a, ph, n_steps=2):
+    """Refine the parameters of a single sinusoid with a few Gauss-Newton steps.
+
+    Meant for a good initial estimate, e.g. when re-extracting a sinusoid from the residual in refine_subset.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series.
+    flux: numpy.ndarray[Any, dtype[float]]
+        Measurement values of the time series.
+    f: float
+        Initial frequency of the sinusoid.
+    a: float
+        Initial amplitude of the sinusoid.
+    ph: float
+        Initial phase of the sinusoid.
+    n_steps: int
+        Number of Gauss-Newton steps.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        f: float
+            Refined frequency of the sinusoid
+        a: float
+            Refined amplitude of the sinusoid
+        ph: float
+            Refined phase of the sinusoid
+        All three are NaN if the system is degenerate.
+
+    Notes
+    -----
+    The sinusoid is parameterised as alpha sin(2 pi f t) + beta cos(2 pi f t), with t the mean subtracted time and
+    alpha = a cos(ph), beta = a sin(ph), which keeps the problem linear in the amplitudes. Each step costs one pass
+    over the time series (one sine and cosine per time point) and a 3x3 solve.
+    The flux is mean subtracted, like in the periodogram. See also the cyclic refinement step of
+    Mamandipoor et al. 2016 (Newtonized orthogonal matching pursuit).
+    """
+    time_ms = time - np.mean(time)
+    flux_ms = flux - np.mean(flux)
+    two_pi = 2 * np.pi
+    alpha = a * np.cos(ph)
+    beta = a * np.sin(ph)
+
+    jtj = np.zeros((3, 3))
+    jtr = np.zeros(3)
+    for _ in range(n_steps):
+        jtj[:] = 0
+        jtr[:] = 0
+        for i in range(len(time_ms)):
+            x = two_pi * f * time_ms[i]
+            sin_x = np.sin(x)
+            cos_x = np.cos(x)
+            resid = flux_ms[i] - (alpha * sin_x + beta * cos_x)
+
+            # jacobian row of the model to alpha, beta and f
+            j_a = sin_x
+            j_b = cos_x
+            j_f = two_pi * time_ms[i] * (alpha * cos_x - beta * sin_x)
+
+            jtj[0, 0] += j_a * j_a
+            jtj[0, 1] += j_a * j_b
+            jtj[0, 2] += j_a * j_f
+            jtj[1, 1] += j_b * j_b
+            jtj[1, 2] += j_b * j_f
+            jtj[2, 2] += j_f * j_f
+            jtr[0] += j_a * resid
+            jtr[1] += j_b * resid
+            jtr[2] += j_f * resid
+
+        # symmetric matrix
+        jtj[1, 0] = jtj[0, 1]
+        jtj[2, 0] = jtj[0, 2]
+        jtj[2, 1] = jtj[1, 2]
+
+        # a degenerate system (e.g. zero amplitude) cannot be refined
+        if not np.linalg.det(jtj) > 0:
+            return np.nan, np.nan, np.nan
+
+        step = np.linalg.solve(jtj, jtr)
+        alpha += step[0]
+        beta += step[1]
+        f += step[2]
+
+    a = np.sqrt(alpha ** 2 + beta ** 2)
+    ph = np.arctan2(beta, alpha)
+
+    return f, a, ph
+
+
+@nb.njit(cache=True)
+def solve_sinusoid_amplitudes(time, flux, f_n):
+    """Jointly solve for the amplitudes and phases of a set of sinusoids at fixed frequencies.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series.
+    flux: numpy.ndarray[Any, dtype[float]]
+        Measurement values of the time series.
+    f_n: numpy.ndarray[Any, dtype[float]]
+        The frequencies of a number of sinusoids.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        a_n: numpy.ndarray[Any, dtype[float]]
+            The amplitudes of the sinusoids.
+        ph_n: numpy.ndarray[Any, dtype[float]]
+            The phases of the sinusoids.
+
+    Notes
+    -----
+    Linear least squares in alpha sin(2 pi f t) + beta cos(2 pi f t) for each frequency, with t the mean subtracted
+    time and the flux mean subtracted. The 2m by 2m normal equations are accumulated in one pass over the time
+    series, without storing the design matrix.
+    """
+    time_ms = time - np.mean(time)
+    flux_ms = flux - np.mean(flux)
+    two_pi = 2 * np.pi
+    n_p = 2 * len(f_n)
+
+    # accumulate the normal equations (columns: sine and cosine per frequency)
+    xtx = np.zeros((n_p, n_p))
+    xty = np.zeros(n_p)
+    row = np.zeros(n_p)
+    for i in range(len(time_ms)):
+        for k in range(len(f_n)):
+            x = two_pi * f_n[k] * time_ms[i]
+            row[2 * k] = np.sin(x)
+            row[2 * k + 1] = np.cos(x)
+        for k in range(n_p):
+            xty[k] += row[k] * flux_ms[i]
+            for l in range(k, n_p):
+                xtx[k, l] += row[k] * row[l]
+
+    # symmetric matrix
+    for k in range(n_p):
+        for l in range(k):
+            xtx[k, l] = xtx[l, k]
+
+    # solve the linalg eq.
+    betas = np.linalg.lstsq(xtx, xty, rcond=1e-14)[0]
+    alpha = betas[0::2]
+    beta = betas[1::2]
+
+    a_n = np.sqrt(alpha ** 2 + beta ** 2)
+    ph_n = np.arctan2(beta, alpha)
+
+    return a_n, ph_n
+
+
 @nb.njit(cache=True)
 def objective_sinusoids(params, time, flux, i_chunks, h_base, h_mult):
     """The objective function to give to scipy.optimize.minimize for a sum of sine waves.
@@ -30,37 +30,29 @@ def f_within_rayleigh(i, f_n, rayleigh):
     numpy.ndarray[Any, dtype[int]]
         Indices of close frequencies in the chain
     """
-    indices = np.arange((len(f_n)))
+    n_f = len(f_n)
     sorter = np.argsort(f_n)  # first sort by frequency
-    f_diff = np.diff(f_n[sorter])  # spaces between frequencies
-    sorted_pos = indices[sorter == i][0]  # position of i in the sorted array
-
-    if np.all(f_diff > rayleigh):
-        # none of the frequencies are close
-        i_close = np.zeros(0, dtype=np.int_)
-    elif np.all(f_diff < rayleigh):
-        # all the frequencies are close
-        i_close = indices
-    else:
-        # the frequency to investigate is somewhere inbetween other frequencies
-        right_not_close = indices[sorted_pos + 1:][f_diff[sorted_pos:] > rayleigh]
-        left_not_close = indices[:sorted_pos][f_diff[:sorted_pos] > rayleigh]
-
-        # if any freqs to left or right are not close, take the first index where this happens
-        if len(right_not_close) > 0:
-            i_right_nc = right_not_close[0]
-        else:
-            i_right_nc = len(f_n)  # else take the right edge of the array
-        if len(left_not_close) > 0:
-            i_left_nc = left_not_close[-1]
-        else:
-            i_left_nc = -1  # else take the left edge of the array (minus one)
+    f_sorted = f_n[sorter]
+
+    # position of i in the sorted array
+    sorted_pos = 0
+    while sorter[sorted_pos] != i:
+        sorted_pos += 1
 
-        # now select the frequencies close to f_n[i] by using the found boundaries
-        i_close = indices[i_left_nc + 1:i_right_nc]
+    # walk outwards from f_n[i] for as long as the spaces between frequencies are within the Rayleigh criterion
+    i_left = sorted_pos
+    while i_left > 0 and f_sorted[i_left] - f_sorted[i_left - 1] <= rayleigh:
+        i_left -= 1
+    i_right = sorted_pos + 1
+    while i_right < n_f and f_sorted[i_right] - f_sorted[i_right - 1] <= rayleigh:
+        i_right += 1
+
+    # if none of the frequencies are close, return an empty chain instead of only i
+    if i_right - i_left == 1 and np.all(np.diff(f_sorted) > rayleigh):
+        return np.zeros(0, dtype=np.int_)
 
     # convert back to unsorted indices
-    i_close_unsorted = sorter[i_close]
+    i_close_unsorted = sorter[i_left:i_right]
 
     return i_close_unsorted
 
@@ -86,13 +78,13 @@ def chains_within_rayleigh(f_n, rayleigh):
     f_within_rayleigh
     """
     indices = np.arange(len(f_n))
-    used = []
+    used = np.zeros(len(f_n), dtype=np.bool_)
     groups = []
     for i in indices:
-        if i not in used:
+        if not used[i]:
             i_close = f_within_rayleigh(i, f_n, rayleigh)
             if len(i_close) > 1:
-                used.extend(i_close)
+                used[i_close] = True
                 groups.append(i_close)
 
     return groups
@@ -269,11 +261,13 @@ def group_frequencies_for_fit(a_n, g_min=20, g_max=25, indices=None):
     is always kept between g_min and g_max. g_min < g_max. The idea of using amplitudes is that sinusoids
     of similar amplitude have a similar amount of influence on each other.
     """
-    # keep track of which freqs have been used with the sorted indices
-    not_used = np.argsort(a_n)[::-1]
+    # keep track of which freqs have been used with the sorted indices (the used ones are in front of i_start)
+    sorter = np.argsort(a_n)[::-1]
+    i_start = 0
 
     groups = []
-    while len(not_used) > 0:
+    while i_start < len(sorter):
+        not_used = sorter[i_start:]
         if len(not_used) > g_min + 1:
             # find index of maximum amplitude difference in group size range
             a_diff = np.diff(a_n[not_used[g_min:g_max + 1]])
@@ -287,8 +281,8 @@ def group_frequencies_for_fit(a_n, g_min=20, g_max=25, indices=None):
             group_i = np.copy(not_used)
             i_group = len(not_used)
 
-        # delete group_i from not_used and append group_i to groups
-        not_used = np.delete(not_used, np.arange(i_group))
+        # move the start of not_used past group_i and append group_i to groups
+        i_start += i_group
 
         # if indices are provided, swap them in
         if indices is not None:
@@ -673,6 +667,13 @@ def find_unknown_harmonics(f_n, f_n_err, sigma=1., n_max=5, f_tol=None):
         if len(candidate_h[i]) == 0:
             candidate_h.pop(i, None)
 
+    # boolean membership masks over f_n for each set, so that containment is a lookup instead of a search
+    in_set = {}
+    for i in candidate_h.keys():
+        for n in candidate_h[i].keys():
+            in_set[i, n] = np.zeros(len(f_n), dtype=bool)
+            in_set[i, n][candidate_h[i][n]] = True
+
     # check whether a series is fully contained in another (and other criteria involving other sets)
     i_n_redundant = []
     for i in candidate_h.keys():
@@ -682,10 +683,10 @@ def find_unknown_harmonics(f_n, f_n_err, sigma=1., n_max=5, f_tol=None):
                                 if (j != i) | (k != n)])
 
             # check whether this set is fully contained in another
-            this_contained = np.array([np.all(np.in1d(candidate_h[i][n], candidate_h[j][k])) for j, k in compare])
+            this_contained = np.array([np.all(in_set[j, k][candidate_h[i][n]]) for j, k in compare])
 
             # check whether another set is fully contained in this one
-            other_contained = np.array([np.all(np.in1d(candidate_h[j][k], candidate_h[i][n])) for j, k in compare])
+            other_contained = np.array([np.all(in_set[i, n][candidate_h[j][k]]) for j, k in compare])
 
             # check for equal length ones
             equal_length = np.array([len(candidate_h[i][n]) == len(candidate_h[j][k]) for j, k in compare])
@@ -731,7 +732,7 @@ def find_unknown_harmonics(f_n, f_n_err, sigma=1., n_max=5, f_tol=None):
     return candidate_h
 
 
-@nb.njit(cache=True)
+@nb.njit(cache=True, parallel=True)
 def harmonic_series_length(f_test, f_n, freq_res, f_max):
     """Find the number of harmonics that a set of frequencies has
 
@@ -756,19 +757,50 @@ def harmonic_series_length(f_test, f_n, freq_res, f_max):
             Completeness factor of each pattern
         distance: numpy.ndarray[Any, dtype[float]]
             Sum of squared distances between harmonics
+
+    Notes
+    -----
+    Gives the same harmonics as find_harmonics_from_pattern with f_tol=freq_res/2 for each test frequency,
+    but sorts f_n only once and does not construct the harmonic pattern arrays.
     """
     n_harm = np.zeros(len(f_test))
-    completeness = np.zeros(len(f_test))
+    completeness = np.ones(len(f_test))
     distance = np.zeros(len(f_test))
 
-    for i, f in enumerate(f_test):
-        harmonics, harmonic_n = find_harmonics_from_pattern(f_n, f, f_tol=freq_res / 2)
-        n_harm[i] = len(harmonics)
-        if n_harm[i] == 0:
-            completeness[i] = 1
-            distance[i] = 0
-        else:
+    # guard against an empty list
+    n_f = len(f_n)
+    if n_f == 0:
+        return n_harm, completeness, distance
+
+    f_sorted = np.sort(f_n)
+    f_top = f_sorted[-1]
+
+    for i in nb.prange(len(f_test)):
+        f = f_test[i]
+        if f == 0:
+            continue
+
+        # go through the harmonic pattern up to the highest frequency
+        f_tol = min(freq_res / 2, f / 2)
+        n_end = int(np.floor((f_top + 0.5 * f) / f))
+        for n in range(1, n_end + 1):
+            f_h = f * n
+
+            # nearest neighbour in f_n by looking to the left and right of the sorted position
+            j = np.searchsorted(f_sorted, f_h)
+            if j == n_f:
+                j = n_f - 1
+            j_left = j - 1 if j > 0 else n_f - 1
+            if not (abs(f_sorted[j] - f_h) < abs(f_h - f_sorted[j_left])):
+                j = j_left
+
+            # check that the closest neighbour is reasonably close to the harmonic
+            d_h = f_sorted[j] - f_h
+            if abs(d_h) < f_tol:
+                n_harm[i] += 1
+                distance[i] += d_h**2
+
+        if n_harm[i] > 0:
             completeness[i] = n_harm[i] / (f_max // f)
-            distance[i] = np.sum((f_n[harmonics] - harmonic_n * f)**2)
 
     return n_harm, completeness, distance
@@ -288,3 +288,239 @@ def calc_bic(residuals, n_param):
     bic = n * np.log(2 * np.pi * sum_r_2 / n) + n + n_param * np.log(n)
 
     return bic
+
+
+@nb.njit(cache=True)
+def calc_bic_model(flux, linear_model, sinusoid_model, n_param):
+    """Bayesian Information Criterion of the flux minus a linear and a sinusoid model.
+
+    Same as calc_bic(flux - (linear_model + sinusoid_model), n_param), but without forming the residual.
+
+    Parameters
+    ----------
+    flux: numpy.ndarray[Any, dtype[float]]
+        Measurement values of the time series
+    linear_model: numpy.ndarray[Any, dtype[float]]
+        Time series model of the piece-wise linear curve.
+    sinusoid_model: numpy.ndarray[Any, dtype[float]]
+        Time series model of the sinusoids.
+    n_param: int
+        Number of free parameters in the model
+
+    Returns
+    -------
+    float
+        Bayesian Information Criterion
+
+    See Also
+    --------
+    calc_bic
+    """
+    n = len(flux)
+
+    sum_r_2 = 0
+    for i in range(n):
+        sum_r_2 += (flux[i] - (linear_model[i] + sinusoid_model[i]))**2
+
+    bic = n * np.log(2 * np.pi * sum_r_2 / n) + n + n_param * np.log(n)
+
+    return bic
+
+
+@nb.njit(cache=True, fastmath=True)
+def calc_bic_linear_refit(time, residuals, curve, i_chunks, n_param):
+    """Bayesian Information Criterion of the residuals plus a curve, after refitting the piece-wise linear model.
+
+    Same as calc_bic(r - linear_curve(*linear_pars(time, r, i_chunks)), n_param) with r = residuals + curve,
+    but fused into two sweeps per chunk without temporary arrays.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    residuals: numpy.ndarray[Any, dtype[float]]
+        Residual is flux - model
+    curve: numpy.ndarray[Any, dtype[float]]
+        Time series added to the residuals, e.g. a sinusoid removed from the model.
+    i_chunks: numpy.ndarray[Any, dtype[int]]
+        Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
+        the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
+    n_param: int
+        Number of free parameters in the model
+
+    Returns
+    -------
+    float
+        Bayesian Information Criterion
+
+    See Also
+    --------
+    calc_bic
+    """
+    n = len(residuals)
+
+    sum_r_2 = 0.
+    for i in range(len(i_chunks)):
+        s = i_chunks[i]
+        n_s = s[1] - s[0]
+
+        # means
+        x_m = 0.
+        y_m = 0.
+        for j in range(s[0], s[1]):
+            x_m += time[j]
+            y_m += residuals[j] + curve[j]
+        x_m /= n_s
+        y_m /= n_s
+
+        # sums of the mean subtracted quantities
+        s_xx = 0.
+        s_xy = 0.
+        s_yy = 0.
+        for j in range(s[0], s[1]):
+            x_ms = time[j] - x_m
+            y_ms = residuals[j] + curve[j] - y_m
+            s_xx += x_ms * x_ms
+            s_xy += x_ms * y_ms
+            s_yy += y_ms * y_ms
+
+        # the sum of squares left after subtracting the best linear fit
+        sum_r_2 += s_yy - s_xy * s_xy / s_xx
+
+    bic = n * np.log(2 * np.pi * sum_r_2 / n) + n + n_param * np.log(n)
+
+    return bic
+
+
+def linear_refit_time_sums(time, i_chunks):
+    """Time quantities per chunk for the piece-wise linear refits of calc_bic_linear_refit_batch.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    i_chunks: numpy.ndarray[Any, dtype[int]]
+        Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
+        the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        time_ms: numpy.ndarray[Any, dtype[float]]
+            Timestamps of the time series, mean subtracted per chunk.
+        s_xx: numpy.ndarray[Any, dtype[float]]
+            Sum of the squared mean subtracted time per chunk.
+    """
+    time_ms = np.zeros(len(time))
+    s_xx = np.zeros(len(i_chunks))
+    for i, s in enumerate(i_chunks):
+        time_ms[s[0]:s[1]] = time[s[0]:s[1]] - np.mean(time[s[0]:s[1]])
+        s_xx[i] = time_ms[s[0]:s[1]] @ time_ms[s[0]:s[1]]
+
+    return time_ms, s_xx
+
+
+def linear_refit_curve_sums(time, curves, i_chunks):
+    """Sums per chunk of a set of curves that do not depend on the residuals, for calc_bic_linear_refit_batch.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    curves: numpy.ndarray[Any, dtype[float]]
+        Time series added to the residuals one at a time, with shape (n_curves, len(time)).
+        The sums are accumulated in double precision, also for single precision curves.
+    i_chunks: numpy.ndarray[Any, dtype[int]]
+        Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
+        the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        c_y: numpy.ndarray[Any, dtype[float]]
+            Sum of each curve, with shape (n_chunks, n_curves).
+        c_xy: numpy.ndarray[Any, dtype[float]]
+            Sum of each curve times the mean subtracted time, with shape (n_chunks, n_curves).
+        c_yy: numpy.ndarray[Any, dtype[float]]
+            Sum of each curve squared, with shape (n_chunks, n_curves).
+    """
+    c_y = np.zeros((len(i_chunks), len(curves)))
+    c_xy = np.zeros((len(i_chunks), len(curves)))
+    c_yy = np.zeros((len(i_chunks), len(curves)))
+    for i, s in enumerate(i_chunks):
+        x_ms = time[s[0]:s[1]] - np.mean(time[s[0]:s[1]])
+        curves_s = curves[:, s[0]:s[1]]
+        c_y[i] = np.sum(curves_s, axis=1, dtype=np.float64)
+        c_xy[i] = np.einsum('ij,j->i', curves_s, x_ms, dtype=np.float64)
+        c_yy[i] = np.einsum('ij,ij->i', curves_s, curves_s, dtype=np.float64)
+
+    return c_y, c_xy, c_yy
+
+
+def calc_bic_linear_refit_batch(time, residuals, curves, i_chunks, n_param, time_sums=None, curve_sums=None):
+    """Bayesian Information Criterion of the residuals plus each of a set of curves, after refitting the
+    piece-wise linear model.
+
+    Same as calc_bic_linear_refit for each row of curves, but evaluated for all rows at once with
+    matrix-vector products per chunk. The product of the curves and the residuals is computed in the
+    precision of the curves, so single precision curves give a faster but approximate result.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    residuals: numpy.ndarray[Any, dtype[float]]
+        Residual is flux - model
+    curves: numpy.ndarray[Any, dtype[float]]
+        Time series added to the residuals one at a time, with shape (n_curves, len(time)).
+    i_chunks: numpy.ndarray[Any, dtype[int]]
+        Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
+        the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
+    n_param: int, numpy.ndarray[Any, dtype[int]]
+        Number of free parameters in the model, for all or for each of the curves.
+    time_sums: tuple[numpy.ndarray[Any, dtype[float]]], optional
+        Precomputed output of linear_refit_time_sums.
+    curve_sums: tuple[numpy.ndarray[Any, dtype[float]]], optional
+        Precomputed output of linear_refit_curve_sums for the curves. Together with time_sums, this leaves one
+        matrix-vector product per chunk when the residuals change but the curves do not.
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[float]]
+        Bayesian Information Criterion for each of the curves
+
+    See Also
+    --------
+    calc_bic, calc_bic_linear_refit, linear_refit_time_sums, linear_refit_curve_sums
+    """
+    n = len(residuals)
+
+    if time_sums is None:
+        time_sums = linear_refit_time_sums(time, i_chunks)
+    if curve_sums is None:
+        curve_sums = linear_refit_curve_sums(time, curves, i_chunks)
+    time_ms, s_xx = time_sums
+    c_y, c_xy, c_yy = curve_sums
+
+    # residuals in the precision of the curves, so that the curves are not converted in the product
+    residuals_c = residuals.astype(curves.dtype, copy=False)
+
+    sum_r_2 = np.zeros(len(curves))
+    for i, s in enumerate(i_chunks):
+        n_s = s[1] - s[0]
+        x_ms = time_ms[s[0]:s[1]]
+        res_s = residuals[s[0]:s[1]]
+
+        # sums of y = residuals + curve (and their products with x and y), expanded into the separate terms
+        s_y = np.sum(res_s) + c_y[i]
+        s_xy = x_ms @ res_s + c_xy[i]
+        s_yy = res_s @ res_s + 2 * (curves[:, s[0]:s[1]] @ residuals_c[s[0]:s[1]]) + c_yy[i]
+
+        # the sum of squares left after subtracting the best linear fit
+        sum_r_2 += s_yy - s_y ** 2 / n_s - s_xy ** 2 / s_xx[i]
+
+    bic = n * np.log(2 * np.pi * sum_r_2 / n) + n + n_param * np.log(n)
+
+    return bic
@@ -6,6 +6,10 @@ This module contains io functions for reading and writing data and results.
 
 import os
 import h5py
+import functools
+import itertools as itt
+import multiprocessing as mp
+import concurrent.futures as cf
 import numpy as np
 import numba as nb
 import pandas as pd
@@ -21,8 +25,150 @@ from star_shine.config.helpers import get_config
 # load configuration
 config = get_config()
 
+# file keywords for writing: newer object header format with compact attribute storage and a larger chunk cache
+_h5py_write_kwargs = {'libver': ('v110', 'latest'), 'track_order': False, 'rdcc_nbytes': 8 * 1024**2}
 
-def load_data_hdf5(file_name, h5py_file_kwargs=None):
+
+def _compression_kwargs(array, compress=True, chunk_size=65536):
+    """Dataset creation keywords for chunked, shuffled and lzf compressed storage.
+
+    Parameters
+    ----------
+    array: numpy.ndarray[Any, dtype[Any]]
+        The array that is going to be stored.
+    compress: bool, optional
+        If False, no keywords are given and the array is stored contiguously.
+    chunk_size: int, optional
+        Maximum length of a chunk along the first axis.
+
+    Returns
+    -------
+    dict
+        Keyword arguments for h5py create_dataset.
+
+    Notes
+    -----
+    Empty arrays cannot be chunked and are always stored contiguously.
+    """
+    array = np.asarray(array)
+    if not compress or array.size == 0:
+        return {}
+
+    chunks = (min(len(array), chunk_size),) + array.shape[1:]
+
+    return {'chunks': chunks, 'compression': 'lzf', 'shuffle': True}
+
+
+def _read_dataset(dataset):
+    """Read a numeric hdf5 dataset directly into a pre-allocated array.
+
+    Parameters
+    ----------
+    dataset: h5py.Dataset
+        The dataset to read.
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[Any]]
+        The data in the dataset.
+    """
+    array = np.empty(dataset.shape, dtype=dataset.dtype)
+
+    # read_direct does not accept empty selections
+    if array.size > 0:
+        dataset.read_direct(array)
+
+    return array
+
+
+def _memory_map_dataset(dataset, file_name):
+    """Memory map a contiguous, uncompressed hdf5 dataset, or read it if that is not possible.
+
+    Parameters
+    ----------
+    dataset: h5py.Dataset
+        The dataset to map.
+    file_name: str
+        File name (including path) of the hdf5 file containing the dataset.
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[Any]]
+        Copy-on-write memory map of the data, or an in-memory array for chunked or compressed datasets.
+    """
+    offset = dataset.id.get_offset()
+
+    # chunked (and thus compressed) or empty datasets have no single offset in the file
+    if offset is None or dataset.chunks is not None or dataset.size == 0:
+        return _read_dataset(dataset)
+
+    return np.memmap(file_name, mode='c', dtype=dataset.dtype, offset=offset, shape=dataset.shape)
+
+
+def _read_contiguous(file_name, dtype, shape, offset):
+    """Read a contiguous block of a file into an array, without going through the hdf5 library.
+
+    Parameters
+    ----------
+    file_name: str
+        File name (including path) of the hdf5 file containing the dataset.
+    dtype: numpy.dtype
+        Data type of the dataset, including byte order.
+    shape: tuple[int]
+        Shape of the dataset.
+    offset: int
+        Byte offset of the dataset in the file.
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[Any]]
+        The data in memory.
+    """
+    array = np.fromfile(file_name, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+
+    return array.reshape(shape)
+
+
+def _read_datasets_threaded(file, names, n_workers):
+    """Read several datasets of an open hdf5 file, overlapping the reads of contiguous datasets.
+
+    Parameters
+    ----------
+    file: h5py.File
+        Open hdf5 file.
+    names: list[str]
+        Names of the datasets to read.
+    n_workers: int
+        Number of reader threads.
+
+    Returns
+    -------
+    dict
+        Arrays by dataset name.
+
+    Notes
+    -----
+    The hdf5 library serialises all calls with a global lock, so threads only help for reads that bypass it.
+    Contiguous datasets are read straight from the file at their byte offset, which releases the GIL.
+    Chunked (compressed) datasets are read through h5py as usual.
+    """
+    arrays = {}
+    with cf.ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = {}
+        for name in names:
+            dataset = file[name]
+            offset = dataset.id.get_offset()
+            if offset is None or dataset.chunks is not None or dataset.size == 0:
+                arrays[name] = _read_dataset(dataset)
+            else:
+                futures[name] = executor.submit(_read_contiguous, file.filename, dataset.dtype, dataset.shape, offset)
+
+        arrays.update({name: future.result() for name, future in futures.items()})
+
+    return arrays
+
+
+def load_data_hdf5(file_name, h5py_file_kwargs=None, memory_map=False, n_workers=1):
     """Load data from an hdf5 file and return it in a dictionary.
 
     Primarily for the api class Data.
@@ -34,6 +180,11 @@ def load_data_hdf5(file_name, h5py_file_kwargs=None):
     h5py_file_kwargs: dict, optional
         Keyword arguments for opening the h5py file.
         Example: {'locking': False}, for a drive that does not support locking.
+    memory_map: bool, optional
+        Memory map the time series arrays instead of reading them into memory. Only possible for files
+        that were saved without compression, otherwise the arrays are read normally.
+    n_workers: int, optional
+        Number of threads for reading the uncompressed time series arrays. Not used when memory mapping.
 
     Returns
     -------
@@ -56,7 +207,7 @@ def load_data_hdf5(file_name, h5py_file_kwargs=None):
 
         # original list of files
         data_dict['data_dir'] = file.attrs['data_dir']
-        data_dict['file_list'] = np.copy(file['file_list'])
+        data_dict['file_list'] = [f.decode() if isinstance(f, bytes) else f for f in file['file_list'][:]]
 
         # summary statistics
         data_dict['t_tot'] = file.attrs['t_tot']
@@ -64,19 +215,23 @@ def load_data_hdf5(file_name, h5py_file_kwargs=None):
         data_dict['t_step'] = file.attrs['t_step']
 
         # the time series data
-        data_dict['time'] = np.copy(file['time'])
-        data_dict['flux'] = np.copy(file['flux'])
-        data_dict['flux_err'] = np.copy(file['flux_err'])
+        if memory_map:
+            read_array = functools.partial(_memory_map_dataset, file_name=file_name)
+            data_dict.update({name: read_array(file[name]) for name in ['time', 'flux', 'flux_err']})
+        elif n_workers > 1:
+            data_dict.update(_read_datasets_threaded(file, ['time', 'flux', 'flux_err'], n_workers))
+        else:
+            data_dict.update({name: _read_dataset(file[name]) for name in ['time', 'flux', 'flux_err']})
 
         # additional information
-        data_dict['i_chunks'] = np.copy(file['i_chunks'])
-        data_dict['flux_counts_medians'] = np.copy(file['flux_counts_medians'])
-        data_dict['t_mean_chunk'] = np.copy(file['t_mean_chunk'])
+        data_dict['i_chunks'] = _read_dataset(file['i_chunks'])
+        data_dict['flux_counts_medians'] = _read_dataset(file['flux_counts_medians'])
+        data_dict['t_mean_chunk'] = _read_dataset(file['t_mean_chunk'])
 
     return data_dict
 
 
-def save_data_hdf5(file_name, data_dict):
+def save_data_hdf5(file_name, data_dict, compress=True):
     """Save data to an hdf5 file.
 
     Primarily for the api class Data.
@@ -87,6 +242,8 @@ def save_data_hdf5(file_name, data_dict):
         File name (including path) for saving the data.
     data_dict: dict
         Dictionary of the data attributes and fields
+    compress: bool, optional
+        Compress the time series arrays. Uncompressed files can be memory mapped when loading.
 
     Returns
     -------
@@ -97,42 +254,42 @@ def save_data_hdf5(file_name, data_dict):
     if ext != '.hdf5':
         file_name = file_name.replace(ext, '.hdf5')
 
-    # save to hdf5
-    with h5py.File(file_name, 'w') as file:
-        file.attrs['target_id'] = data_dict['target_id']
-        file.attrs['data_id'] = data_dict['data_id']
-        file.attrs['date_time'] = data_dict['date_time']
-
-        # original list of files
-        file.attrs['data_dir'] = data_dict['data_dir']  # original data directory
-        file.create_dataset('file_list', data=data_dict['file_list'])
-        file['file_list'].attrs['description'] = 'original list of files for the creation of this data file'
-
-        # summary statistics
-        file.attrs['t_tot'] = data_dict['t_tot']  # Total time base of observations
-        file.attrs['t_mean'] = data_dict['t_mean']  # Time reference (zero) point of the full light curve
-        file.attrs['t_step'] = data_dict['t_step']  # Median time step of observations
-        file.create_dataset('t_mean_chunk', data=data_dict['t_mean_chunk'])
-        file['t_mean_chunk'].attrs['unit'] = 'time unit of the data (often days)'
-        file['t_mean_chunk'].attrs['description'] = 'time reference (zero) point of the each time chunk'
-
-        # the time series data
-        file.create_dataset('time', data=data_dict['time'])
-        file['time'].attrs['unit'] = 'time unit of the data (often days)'
-        file['time'].attrs['description'] = 'timestamps of the observations'
-        file.create_dataset('flux', data=data_dict['flux'])
-        file['flux'].attrs['unit'] = 'median normalised flux'
-        file['flux'].attrs['description'] = 'normalised flux measurements of the observations'
-        file.create_dataset('flux_err', data=data_dict['flux_err'])
-        file['flux_err'].attrs['unit'] = 'median normalised flux'
-        file['flux_err'].attrs['description'] = 'normalised error measurements in the flux'
-
-        # additional information
-        file.create_dataset('i_chunks', data=data_dict['i_chunks'])
-        file['i_chunks'].attrs['description'] = 'pairs of indices indicating time chunks of the data'
-        file.create_dataset('flux_counts_medians', data=data_dict['flux_counts_medians'])
-        file['flux_counts_medians'].attrs['unit'] = 'raw flux counts'
-        file['flux_counts_medians'].attrs['description'] = 'median flux level per time chunk'
+    # file level attributes
+    attrs = {'target_id': data_dict['target_id'], 'data_id': data_dict['data_id'], 'date_time': data_dict['date_time'],
+             'data_dir': data_dict['data_dir'],  # original data directory
+             't_tot': data_dict['t_tot'],  # Total time base of observations
+             't_mean': data_dict['t_mean'],  # Time reference (zero) point of the full light curve
+             't_step': data_dict['t_step']}  # Median time step of observations
+
+    # original list of files as fixed length strings
+    file_list = np.array([f.encode() for f in data_dict['file_list']], dtype='S')
+
+    # datasets with their attributes, and whether compression is optional
+    t_unit = 'time unit of the data (often days)'
+    f_unit = 'median normalised flux'
+    datasets = [
+        ('file_list', file_list, True,
+         {'description': 'original list of files for the creation of this data file'}),
+        ('t_mean_chunk', data_dict['t_mean_chunk'], True,
+         {'unit': t_unit, 'description': 'time reference (zero) point of the each time chunk'}),
+        ('time', data_dict['time'], compress,
+         {'unit': t_unit, 'description': 'timestamps of the observations'}),
+        ('flux', data_dict['flux'], compress,
+         {'unit': f_unit, 'description': 'normalised flux measurements of the observations'}),
+        ('flux_err', data_dict['flux_err'], compress,
+         {'unit': f_unit, 'description': 'normalised error measurements in the flux'}),
+        ('i_chunks', data_dict['i_chunks'], True,
+         {'description': 'pairs of indices indicating time chunks of the data'}),
+        ('flux_counts_medians', data_dict['flux_counts_medians'], True,
+         {'unit': 'raw flux counts', 'description': 'median flux level per time chunk'}),
+    ]
+
+    # save to hdf5, setting the attributes in bulk
+    with h5py.File(file_name, 'w', **_h5py_write_kwargs) as file:
+        file.attrs.update(attrs)
+        for name, data, comp, ds_attrs in datasets:
+            ds = file.create_dataset(name, data=data, **_compression_kwargs(data, comp))
+            ds.attrs.update(ds_attrs)
 
     return None
 
@@ -176,37 +333,37 @@ def load_result_hdf5(file_name, h5py_file_kwargs=None):
 
         # linear model parameters
         # y-intercepts
-        result_dict['const'] = np.copy(file['const'])
-        result_dict['const_err'] = np.copy(file['const_err'])
-        result_dict['const_hdi'] = np.copy(file['const_hdi'])
+        result_dict['const'] = _read_dataset(file['const'])
+        result_dict['const_err'] = _read_dataset(file['const_err'])
+        result_dict['const_hdi'] = _read_dataset(file['const_hdi'])
         # slopes
-        result_dict['slope'] = np.copy(file['slope'])
-        result_dict['slope_err'] = np.copy(file['slope_err'])
-        result_dict['slope_hdi'] = np.copy(file['slope_hdi'])
+        result_dict['slope'] = _read_dataset(file['slope'])
+        result_dict['slope_err'] = _read_dataset(file['slope_err'])
+        result_dict['slope_hdi'] = _read_dataset(file['slope_hdi'])
 
         # sinusoid model parameters
         # frequencies
-        result_dict['f_n'] = np.copy(file['f_n'])
-        result_dict['f_n_err'] = np.copy(file['f_n_err'])
-        result_dict['f_n_hdi'] = np.copy(file['f_n_hdi'])
+        result_dict['f_n'] = _read_dataset(file['f_n'])
+        result_dict['f_n_err'] = _read_dataset(file['f_n_err'])
+        result_dict['f_n_hdi'] = _read_dataset(file['f_n_hdi'])
         # amplitudes
-        result_dict['a_n'] = np.copy(file['a_n'])
-        result_dict['a_n_err'] = np.copy(file['a_n_err'])
-        result_dict['a_n_hdi'] = np.copy(file['a_n_hdi'])
+        result_dict['a_n'] = _read_dataset(file['a_n'])
+        result_dict['a_n_err'] = _read_dataset(file['a_n_err'])
+        result_dict['a_n_hdi'] = _read_dataset(file['a_n_hdi'])
         # phases
-        result_dict['ph_n'] = np.copy(file['ph_n'])
-        result_dict['ph_n_err'] = np.copy(file['ph_n_err'])
-        result_dict['ph_n_hdi'] = np.copy(file['ph_n_hdi'])
+        result_dict['ph_n'] = _read_dataset(file['ph_n'])
+        result_dict['ph_n_err'] = _read_dataset(file['ph_n_err'])
+        result_dict['ph_n_hdi'] = _read_dataset(file['ph_n_hdi'])
         # passing criteria
-        result_dict['passing_sigma'] = np.copy(file['passing_sigma'])
-        result_dict['passing_snr'] = np.copy(file['passing_snr'])
+        result_dict['passing_sigma'] = _read_dataset(file['passing_sigma'])
+        result_dict['passing_snr'] = _read_dataset(file['passing_snr'])
 
         # harmonic model
-        result_dict['h_base'] = np.copy(file['h_base'])
-        result_dict['h_mult'] = np.copy(file['h_mult'])
-        result_dict['f_h_err'] = np.copy(file['f_h_err'])
+        result_dict['h_base'] = _read_dataset(file['h_base'])
+        result_dict['h_mult'] = _read_dataset(file['h_mult'])
+        result_dict['f_h_err'] = _read_dataset(file['f_h_err'])
         # passing criteria
-        result_dict['passing_harmonic'] = np.copy(file['passing_harmonic'])
+        result_dict['passing_harmonic'] = _read_dataset(file['passing_harmonic'])
 
     return result_dict
 
@@ -232,89 +389,55 @@ def save_result_hdf5(file_name, result_dict):
     if ext != '.hdf5':
         file_name = file_name.replace(ext, '.hdf5')
 
-    # save to hdf5
-    with h5py.File(file_name, 'w') as file:
-        file.attrs['target_id'] = result_dict['target_id']
-        file.attrs['data_id'] = result_dict['data_id']
-        file.attrs['date_time'] = result_dict['date_time']
-        file.attrs['n_param'] = result_dict['n_param']  # number of free parameters
-        file.attrs['bic'] = result_dict['bic']  # Bayesian Information Criterion of the residuals
-        file.attrs['noise_level'] = result_dict['noise_level']  # standard deviation of the residuals
+    # file level attributes
+    attrs = {'target_id': result_dict['target_id'], 'data_id': result_dict['data_id'],
+             'date_time': result_dict['date_time'],
+             'n_param': result_dict['n_param'],  # number of free parameters
+             'bic': result_dict['bic'],  # Bayesian Information Criterion of the residuals
+             'noise_level': result_dict['noise_level']}  # standard deviation of the residuals
 
+    # datasets with their attributes
+    f_unit = 'median normalised flux'
+    datasets = [
         # the linear model
         # y-intercepts
-        file.create_dataset('const', data=result_dict['const'])
-        file['const'].attrs['unit'] = 'median normalised flux'
-        file['const'].attrs['description'] = 'y-intercept per analysed sector'
-        file.create_dataset('const_err', data=result_dict['const_err'])
-        file['const_err'].attrs['unit'] = 'median normalised flux'
-        file['const_err'].attrs['description'] = 'errors in the y-intercept per analysed sector'
-        file.create_dataset('const_hdi', data=result_dict['const_hdi'])
-        file['const_hdi'].attrs['unit'] = 'median normalised flux'
-        file['const_hdi'].attrs['description'] = 'HDI for the y-intercept per analysed sector'
-
+        ('const', {'unit': f_unit, 'description': 'y-intercept per analysed sector'}),
+        ('const_err', {'unit': f_unit, 'description': 'errors in the y-intercept per analysed sector'}),
+        ('const_hdi', {'unit': f_unit, 'description': 'HDI for the y-intercept per analysed sector'}),
         # slopes
-        file.create_dataset('slope', data=result_dict['slope'])
-        file['slope'].attrs['unit'] = 'median normalised flux / d'
-        file['slope'].attrs['description'] = 'slope per analysed sector'
-        file.create_dataset('slope_err', data=result_dict['slope_err'])
-        file['slope_err'].attrs['unit'] = 'median normalised flux / d'
-        file['slope_err'].attrs['description'] = 'error in the slope per analysed sector'
-        file.create_dataset('slope_hdi', data=result_dict['slope_hdi'])
-        file['slope_hdi'].attrs['unit'] = 'median normalised flux / d'
-        file['slope_hdi'].attrs['description'] = 'HDI for the slope per analysed sector'
-
+        ('slope', {'unit': f_unit + ' / d', 'description': 'slope per analysed sector'}),
+        ('slope_err', {'unit': f_unit + ' / d', 'description': 'error in the slope per analysed sector'}),
+        ('slope_hdi', {'unit': f_unit + ' / d', 'description': 'HDI for the slope per analysed sector'}),
         # the sinusoid model
         # frequencies
-        file.create_dataset('f_n', data=result_dict['f_n'])
-        file['f_n'].attrs['unit'] = '1 / d'
-        file['f_n'].attrs['description'] = 'frequencies of a number of sinusoids'
-        file.create_dataset('f_n_err', data=result_dict['f_n_err'])
-        file['f_n_err'].attrs['unit'] = '1 / d'
-        file['f_n_err'].attrs['description'] = 'errors in the frequencies of a number of sinusoids'
-        file.create_dataset('f_n_hdi', data=result_dict['f_n_hdi'])
-        file['f_n_hdi'].attrs['unit'] = '1 / d'
-        file['f_n_hdi'].attrs['description'] = 'HDI for the frequencies of a number of sinusoids'
-
+        ('f_n', {'unit': '1 / d', 'description': 'frequencies of a number of sinusoids'}),
+        ('f_n_err', {'unit': '1 / d', 'description': 'errors in the frequencies of a number of sinusoids'}),
+        ('f_n_hdi', {'unit': '1 / d', 'description': 'HDI for the frequencies of a number of sinusoids'}),
         # amplitudes
-        file.create_dataset('a_n', data=result_dict['a_n'])
-        file['a_n'].attrs['unit'] = 'median normalised flux'
-        file['a_n'].attrs['description'] = 'amplitudes of a number of sinusoids'
-        file.create_dataset('a_n_err', data=result_dict['a_n_err'])
-        file['a_n_err'].attrs['unit'] = 'median normalised flux'
-        file['a_n_err'].attrs['description'] = 'errors in the amplitudes of a number of sinusoids'
-        file.create_dataset('a_n_hdi', data=result_dict['a_n_hdi'])
-        file['a_n_hdi'].attrs['unit'] = 'median normalised flux'
-        file['a_n_hdi'].attrs['description'] = 'HDI for the amplitudes of a number of sinusoids'
-
+        ('a_n', {'unit': f_unit, 'description': 'amplitudes of a number of sinusoids'}),
+        ('a_n_err', {'unit': f_unit, 'description': 'errors in the amplitudes of a number of sinusoids'}),
+        ('a_n_hdi', {'unit': f_unit, 'description': 'HDI for the amplitudes of a number of sinusoids'}),
         # phases
-        file.create_dataset('ph_n', data=result_dict['ph_n'])
-        file['ph_n'].attrs['unit'] = 'radians'
-        file['ph_n'].attrs['description'] = 'phases of a number of sinusoids, with reference point t_mean'
-        file.create_dataset('ph_n_err', data=result_dict['ph_n_err'])
-        file['ph_n_err'].attrs['unit'] = 'radians'
-        file['ph_n_err'].attrs['description'] = 'errors in the phases of a number of sinusoids'
-        file.create_dataset('ph_n_hdi', data=result_dict['ph_n_hdi'])
-        file['ph_n_hdi'].attrs['unit'] = 'radians'
-        file['ph_n_hdi'].attrs['description'] = 'HDI for the phases of a number of sinusoids'
-
+        ('ph_n', {'unit': 'radians', 'description': 'phases of a number of sinusoids, with reference point t_mean'}),
+        ('ph_n_err', {'unit': 'radians', 'description': 'errors in the phases of a number of sinusoids'}),
+        ('ph_n_hdi', {'unit': 'radians', 'description': 'HDI for the phases of a number of sinusoids'}),
         # sinusoid selection criteria
-        file.create_dataset('passing_sigma', data=result_dict['passing_sigma'])
-        file['passing_sigma'].attrs['description'] = 'sinusoids passing the sigma criterion'
-        file.create_dataset('passing_snr', data=result_dict['passing_snr'])
-        file['passing_snr'].attrs['description'] = 'sinusoids passing the signal to noise criterion'
-
+        ('passing_sigma', {'description': 'sinusoids passing the sigma criterion'}),
+        ('passing_snr', {'description': 'sinusoids passing the signal to noise criterion'}),
         # harmonic model
-        file.create_dataset('h_base', data=result_dict['h_base'])
-        file['h_base'].attrs['description'] = 'index of the base harmonic frequency'
-        file.create_dataset('h_mult', data=result_dict['h_mult'])
-        file['h_mult'].attrs['description'] = 'multiplier of the base harmonic frequency'
-        file.create_dataset('f_h_err', data=result_dict['f_h_err'])
-        file['f_h_err'].attrs['description'] = 'errors in the harmonic frequencies'
-
+        ('h_base', {'description': 'index of the base harmonic frequency'}),
+        ('h_mult', {'description': 'multiplier of the base harmonic frequency'}),
+        ('f_h_err', {'description': 'errors in the harmonic frequencies'}),
         # harmonic selection criteria
-        file.create_dataset('passing_harmonic', data=result_dict['passing_harmonic'])
-        file['passing_harmonic'].attrs['description'] = 'harmonic sinusoids passing the sigma criterion'
+        ('passing_harmonic', {'description': 'harmonic sinusoids passing the sigma criterion'}),
+    ]
+
+    # save to hdf5, setting the attributes in bulk
+    with h5py.File(file_name, 'w', **_h5py_write_kwargs) as file:
+        file.attrs.update(attrs)
+        for name, ds_attrs in datasets:
+            ds = file.create_dataset(name, data=result_dict[name])
+            ds.attrs.update(ds_attrs)
 
     return None
 
@@ -539,7 +662,93 @@ def load_fits_data(file_name):
     return time, flux, flux_err, qual_flags, crowdsap
 
 
-def load_light_curve(file_list, apply_flags=True):
+def load_single_file(file_name, apply_flags=True):
+    """Load in the data from a single data file and clean it up.
+
+    Parameters
+    ----------
+    file_name: str
+        File name (including path) of the data.
+    apply_flags: bool
+        Whether to apply the quality flags to the time series data
+
+    Returns
+    -------
+    tuple:
+        time: numpy.ndarray[Any, dtype[float]]
+            Timestamps of the time series
+        flux: numpy.ndarray[Any, dtype[float]]
+            Measurement values of the time series
+        flux_err: numpy.ndarray[Any, dtype[float]]
+            Errors in the measurement values
+
+    Notes
+    -----
+    Quality flags and non-finite values are applied per file, so that the chunk
+    boundaries can be derived from the lengths of the returned arrays.
+    """
+    # get the data from the file with one of the following methods
+    if file_name.endswith('.fits') | file_name.endswith('.fit'):
+        ti, fl, err, qf, cro = load_fits_data(file_name)
+    elif file_name.endswith('.csv') & ('pd' in locals()):
+        ti, fl, err = load_csv_data(file_name)
+        qf = np.zeros(len(ti))
+    else:
+        ti, fl, err = np.loadtxt(file_name, usecols=(0, 1, 2), unpack=True)
+        qf = np.zeros(len(ti))
+
+    # apply quality flags
+    if apply_flags:
+        # convert quality flags to boolean mask
+        quality = (qf == 0)
+        ti = ti[quality]
+        fl = fl[quality]
+        err = err[quality]
+
+    # clean up (on time and flux)
+    finite = np.isfinite(ti) & np.isfinite(fl)
+    ti = ti[finite].astype(np.float64)
+    fl = fl[finite].astype(np.float64)
+    err = err[finite].astype(np.float64)
+
+    return ti, fl, err
+
+
+def _load_files(file_list, apply_flags=True, n_workers=1):
+    """Load a list of data files, in parallel if more than one worker is requested.
+
+    Parameters
+    ----------
+    file_list: list[str]
+        A list of file names (including path) of the data.
+    apply_flags: bool
+        Whether to apply the quality flags to the time series data
+    n_workers: int
+        Number of worker processes to use.
+
+    Returns
+    -------
+    list[tuple]
+        The output of load_single_file for each file, in list order.
+
+    Notes
+    -----
+    Each spawned worker imports the package once, so this only pays off for long lists of files.
+    """
+    n_workers = min(n_workers, len(file_list))
+    if n_workers <= 1:
+        return [load_single_file(file, apply_flags=apply_flags) for file in file_list]
+
+    # forking after numba has started its threading layer can deadlock, so use spawned workers
+    context = mp.get_context('spawn')
+
+    with cf.ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+        file_data = list(executor.map(load_single_file, file_list, itt.repeat(apply_flags)))
+
+    return file_data
+
+
+def load_light_curve(file_list, apply_flags=True, n_workers=None):
     """Load in the data from a list of ((TESS specific) fits) files.
 
     Also stitches the light curves of each individual file together and normalises to the median.
@@ -550,6 +759,8 @@ def load_light_curve(file_list, apply_flags=True):
         A list of file names (including path) of the data.
     apply_flags: bool
         Whether to apply the quality flags to the time series data
+    n_workers: int, optional
+        Number of worker processes for loading the files. If None, it is loaded from config.
 
     Returns
     -------
@@ -566,63 +777,38 @@ def load_light_curve(file_list, apply_flags=True):
         medians: numpy.ndarray[Any, dtype[float]]
             Median flux counts per chunk
     """
-    time = np.array([])
-    flux = np.array([])
-    flux_err = np.array([])
-    qual_flags = np.array([])
-    i_chunks = np.zeros((0, 2), dtype=int)
+    if n_workers is None:
+        n_workers = config.io_workers
 
     # load the data in list order
-    for file in file_list:
-        # get the data from the file with one of the following methods
-        if file.endswith('.fits') | file.endswith('.fit'):
-            ti, fl, err, qf, cro = load_fits_data(file)
-        elif file.endswith('.csv') & ('pd' in locals()):
-            ti, fl, err = load_csv_data(file)
-            qf = np.zeros(len(ti))
-            cro = 1
-        else:
-            ti, fl, err = np.loadtxt(file, usecols=(0, 1, 2), unpack=True)
-            qf = np.zeros(len(ti))
-            cro = 1
-
-        # keep track of the data belonging to each time chunk
-        chunk_index = [[len(i_chunks), len(i_chunks) + len(ti)]]
-        if config.halve_chunks:
-            chunk_index = [[len(i_chunks), len(i_chunks) + len(ti) // 2],
-                           [len(i_chunks) + len(ti) // 2, len(i_chunks) + len(ti)]]
-
-        i_chunks = np.append(i_chunks, chunk_index, axis=0)
-
-        # append all other data
-        time = np.append(time, ti)
-        flux = np.append(flux, fl)
-        flux_err = np.append(flux_err, err)
-        qual_flags = np.append(qual_flags, qf)
+    file_data = _load_files(file_list, apply_flags=apply_flags, n_workers=n_workers)
+    file_data = [fd for fd in file_data if len(fd[0]) > 0]
+
+    # keep track of the data belonging to each time chunk
+    n_points = np.array([len(fd[0]) for fd in file_data], dtype=int)
+    index_high = np.cumsum(n_points)
+    index_low = index_high - n_points
+    if config.halve_chunks:
+        index_mid = index_low + n_points // 2
+        i_chunks = np.column_stack((index_low, index_mid, index_mid, index_high)).reshape(-1, 2)
+    else:
+        i_chunks = np.column_stack((index_low, index_high))
+
+    # stitch all data together
+    if len(file_data) > 0:
+        time, flux, flux_err = (np.concatenate(arrays) for arrays in zip(*file_data))
+    else:
+        time, flux, flux_err = np.zeros(0), np.zeros(0), np.zeros(0)
+        i_chunks = np.zeros((0, 2), dtype=int)
 
     # sort chunks by time
-    t_start = time[i_chunks[:0]]
+    t_start = time[i_chunks[:, 0]]
     if np.any(np.diff(t_start) < 0):
         chunk_sorter = np.argsort(t_start)  # sort on chunk start time
         time_sorter, i_chunks = sort_chunks(chunk_sorter, i_chunks)
         time = time[time_sorter]
         flux = flux[time_sorter]
         flux_err = flux_err[time_sorter]
-        qual_flags = qual_flags[time_sorter]
-
-    # apply quality flags
-    if apply_flags:
-        # convert quality flags to boolean mask
-        quality = (qual_flags == 0)
-        time = time[quality]
-        flux = flux[quality]
-        flux_err = flux_err[quality]
-
-    # clean up (on time and flux)
-    finite = np.isfinite(time) & np.isfinite(flux)
-    time = time[finite].astype(np.float64)
-    flux = flux[finite].astype(np.float64)
-    flux_err = flux_err[finite].astype(np.float64)
 
     # median normalise
     flux, flux_err, medians = normalise_counts(flux, flux_err, i_chunks)
@@ -103,6 +103,68 @@ def linear_pars(time, flux, i_chunks):
     return y_inter, slope
 
 
+@nb.njit(cache=True, parallel=True)
+def linear_pars_curve(time, flux, i_chunks):
+    """Calculate the slopes and y-intercepts of a linear trend with the MLE, together with the resulting curve.
+
+    Fused version of linear_pars followed by linear_curve: one sweep per chunk for the means, one for the sums
+    and one to write the curve, without temporary arrays.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    flux: numpy.ndarray[Any, dtype[float]]
+        Measurement values of the time series
+    i_chunks: numpy.ndarray[Any, dtype[int]]
+        Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
+        the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        y_inter: numpy.ndarray[Any, dtype[float]]
+            The y-intercepts of a piece-wise linear curve
+        slope: numpy.ndarray[Any, dtype[float]]
+            The slopes of a piece-wise linear curve
+        curve: numpy.ndarray[Any, dtype[float]]
+            The model time series of a (set of) straight line(s)
+
+    See Also
+    --------
+    linear_pars, linear_curve
+    """
+    y_inter = np.zeros(len(i_chunks))
+    slope = np.zeros(len(i_chunks))
+    curve = np.zeros(len(time))
+
+    for i in nb.prange(len(i_chunks)):
+        s = i_chunks[i]
+
+        # means
+        x_m = np.mean(time[s[0]:s[1]])
+        y_m = np.mean(flux[s[0]:s[1]])
+
+        # sums of the mean subtracted quantities
+        s_xx = 0.
+        s_xy = 0.
+        for j in range(s[0], s[1]):
+            x_ms = time[j] - x_m
+            s_xx += x_ms * x_ms
+            s_xy += x_ms * (flux[j] - y_m)
+
+        # parameters (mean-centered)
+        slope[i] = s_xy / s_xx
+        y_inter[i] = y_m
+
+        # the curve
+        for j in range(s[0], s[1]):
+            curve[j] = y_inter[i] + slope[i] * (time[j] - x_m)
+
+    return y_inter, slope, curve
+
+
 @nb.njit(cache=True)
 def sum_sines_st(time, f_n, a_n, ph_n, t_shift=True):
     """A sum of sinusoids at times t, given the frequencies, amplitudes and phases.
@@ -136,14 +198,158 @@ def sum_sines_st(time, f_n, a_n, ph_n, t_shift=True):
     else:
         mean_t = 0
 
+    # angular frequencies and centred time are computed once, not per sinusoid
+    two_pi_f_n = 2 * np.pi * f_n
+    time_c = time - mean_t
+
     model_sines = np.zeros(len(time))
     for i in range(len(f_n)):
-        model_sines += a_n[i] * np.sin((2 * np.pi * f_n[i] * (time - mean_t)) + ph_n[i])
+        model_sines += a_n[i] * np.sin(two_pi_f_n[i] * time_c + ph_n[i])
 
     return model_sines
 
 
+@nb.njit(cache=True, fastmath=True)
+def add_sines_inplace(model, time, f_n, a_n, ph_n, sign=1.0, t_shift=True):
+    """Add (or subtract) a sum of sinusoids to an existing model time series in place.
+
+    Single threaded version for incremental model updates. Avoids the temporary arrays of
+    sum_sines_st followed by an array addition.
+
+    Parameters
+    ----------
+    model: numpy.ndarray[Any, dtype[float]]
+        Model time series that is updated in place.
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    f_n: numpy.ndarray[Any, dtype[float]]
+        The frequencies of a number of sinusoids
+    a_n: numpy.ndarray[Any, dtype[float]]
+        The amplitudes of a number of sinusoids
+    ph_n: numpy.ndarray[Any, dtype[float]]
+        The phases of a number of sinusoids
+    sign: float
+        Use 1 to add the sinusoids and -1 to subtract them.
+    t_shift: bool
+        Mean center the time axis
+
+    Returns
+    -------
+    None
+
+    Notes
+    -----
+    Assumes the phases are determined with respect to the mean time as zero point by default.
+    """
+    if len(f_n) == 0:
+        return None
+
+    if t_shift:
+        mean_t = np.mean(time)
+    else:
+        mean_t = 0
+
+    for i in range(len(f_n)):
+        two_pi_f = 2 * np.pi * f_n[i]
+        amp = sign * a_n[i]
+        for k in range(len(time)):
+            model[k] += amp * np.sin(two_pi_f * (time[k] - mean_t) + ph_n[i])
+
+    return None
+
+
 @nb.njit(cache=True, parallel=True)
+def sine_curves(time, f_n, a_n, ph_n, t_shift=True):
+    """The separate sinusoids at times t, given the frequencies, amplitudes and phases.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    f_n: numpy.ndarray[Any, dtype[float]]
+        The frequencies of a number of sinusoids
+    a_n: numpy.ndarray[Any, dtype[float]]
+        The amplitudes of a number of sinusoids
+    ph_n: numpy.ndarray[Any, dtype[float]]
+        The phases of a number of sinusoids
+    t_shift: bool
+        Mean center the time axis
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[float]]
+        Model time series of each sinusoid, with shape (len(f_n), len(time)).
+
+    Notes
+    -----
+    Assumes the phases are determined with respect to the mean time as zero point by default.
+    """
+    if t_shift:
+        mean_t = np.mean(time)
+    else:
+        mean_t = 0
+
+    # centred time is computed once, and every element is written so the matrix need not be zeroed
+    time_c = time - mean_t
+    curves = np.empty((len(f_n), len(time)))
+    for i in nb.prange(len(f_n)):
+        two_pi_f = 2 * np.pi * f_n[i]
+        for k in range(len(time)):
+            curves[i, k] = a_n[i] * np.sin(two_pi_f * time_c[k] + ph_n[i])
+
+    return curves
+
+
+@nb.njit(cache=True, parallel=True, fastmath=True)
+def sine_curves_single(time, f_n, a_n, ph_n, t_shift=True):
+    """The separate sinusoids at times t, given the frequencies, amplitudes and phases, in single precision.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+    f_n: numpy.ndarray[Any, dtype[float]]
+        The frequencies of a number of sinusoids
+    a_n: numpy.ndarray[Any, dtype[float]]
+        The amplitudes of a number of sinusoids
+    ph_n: numpy.ndarray[Any, dtype[float]]
+        The phases of a number of sinusoids
+    t_shift: bool
+        Mean center the time axis
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[float32]]
+        Model time series of each sinusoid, with shape (len(f_n), len(time)).
+
+    Notes
+    -----
+    Assumes the phases are determined with respect to the mean time as zero point by default.
+
+    The phase is computed and reduced to [-pi, pi] in double precision, only the sine itself is evaluated in
+    single precision. The curves are accurate to about 1e-7 times the amplitude, at half the memory of
+    sine_curves.
+    """
+    if t_shift:
+        mean_t = np.mean(time)
+    else:
+        mean_t = 0
+
+    time_c = time - mean_t
+    two_pi = 2 * np.pi
+    curves = np.empty((len(f_n), len(time)), dtype=np.float32)
+    for i in nb.prange(len(f_n)):
+        two_pi_f = two_pi * f_n[i]
+        a_i = np.float32(a_n[i])
+        for k in range(len(time)):
+            phase = two_pi_f * time_c[k] + ph_n[i]
+            phase -= two_pi * np.floor(phase / two_pi + 0.5)
+            curves[i, k] = a_i * np.sin(np.float32(phase))
+
+    return curves
+
+
+@nb.njit(cache=True, parallel=True, fastmath=True)
 def sum_sines(time, f_n, a_n, ph_n, t_shift=True):
     """A sum of sinusoids at times t, given the frequencies, amplitudes and phases.
 
@@ -174,9 +380,21 @@ def sum_sines(time, f_n, a_n, ph_n, t_shift=True):
     else:
         mean_t = 0
 
-    model_sines = np.zeros(len(time))
-    for i in nb.prange(len(f_n)):
-        model_sines += a_n[i] * np.sin((2 * np.pi * f_n[i] * (time - mean_t)) + ph_n[i])
+    # parallel over blocks of time that stay in cache, the inner loop over time can be vectorised
+    n_time = len(time)
+    block = 1024
+    n_block = (n_time + block - 1) // block
+
+    two_pi_f_n = 2 * np.pi * f_n
+
+    model_sines = np.zeros(n_time)
+    for b in nb.prange(n_block):
+        j_0 = b * block
+        j_1 = min(j_0 + block, n_time)
+        t_b = time[j_0:j_1] - mean_t
+        for i in range(len(f_n)):
+            for k in range(j_1 - j_0):
+                model_sines[j_0 + k] += a_n[i] * np.sin(two_pi_f_n[i] * t_b[k] + ph_n[i])
 
     return model_sines
 
@@ -220,10 +438,14 @@ def sum_sines_deriv(time, f_n, a_n, ph_n, deriv=1, t_shift=True):
     ph_cos = (np.pi / 2) * mod_2  # alternate between cosine and sine
     sign = (-1) ** ((mod_4 - mod_2) // 2)  # (1, -1, -1, 1, 1, -1, -1... for deriv=1, 2, 3...)
 
+    # the amplitude factor and phase offset are fixed per sinusoid, so take them out of the time loop
+    two_pi_f_n = 2 * np.pi * f_n
+    amp_n = sign * two_pi_f_n ** deriv * a_n
+    ph_n_cos = ph_n + ph_cos
+
     for i in nb.prange(len(f_n)):
         for j in range(len(time)):
-            model_sines[j] += (sign * (2 * np.pi * f_n[i]) ** deriv * a_n[i] *
-                               np.sin((2 * np.pi * f_n[i] * (time[j] - mean_t)) + ph_n[i] + ph_cos))
+            model_sines[j] += amp_n[i] * np.sin(two_pi_f_n[i] * (time[j] - mean_t) + ph_n_cos[i])
 
     return model_sines
 
@@ -401,11 +623,15 @@ class LinearModel:
             Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
             the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
         """
-        # get new parameters
-        const_new, slope_new = linear_pars(time, residual, i_chunks)
+        # get new parameters and model in one go
+        const_new, slope_new, self._linear_model = linear_pars_curve(time, residual, i_chunks)
 
-        # set the new parameters and model
-        self.set_linear_model(time, const_new, slope_new, i_chunks)
+        # set the parameters
+        self._const = const_new
+        self._slope = slope_new
+
+        # set the numbers
+        self.update_n()
 
         return
 
@@ -728,8 +954,9 @@ class SinusoidModel:
 
     def update_n(self):
         """Update the current numbers of sinusoids, harmonics, and base frequencies."""
-        self.n_sin = len(self._f_n[self._include])
-        self.n_harm = len(self._f_n[self._include][self._harmonics[self._include]])
+        # count on the boolean masks directly instead of the lengths of indexed copies
+        self.n_sin = np.count_nonzero(self._include)
+        self.n_harm = np.count_nonzero(self._harmonics & self._include)
         self.n_base = len(np.unique(self._h_base[(self._h_base != -1) & self._include]))
 
         return None
@@ -826,20 +1053,66 @@ class SinusoidModel:
         return model
 
     def _check_removed_h_base(self, indices):
-        """If a harmonic base frequency was removed, remove the whole harmonic series.
+        """If a harmonic base frequency is removed, remove the whole harmonic series.
 
         Parameters
         ----------
         indices: numpy.ndarray[Any, dtype[int]]
-            Indices for the sinusoids that were removed.
+            Indices for the sinusoids that are to be removed.
+
+        Notes
+        -----
+        Needs to be called before the sinusoids are removed from the arrays, while _h_base still holds
+        the old indices.
         """
         if np.any(self._harmonics):
-            for i in np.arange(len(self._f_n))[self._h_mult == 1]:
-                if i in indices:
-                    series_mask = self._h_base == i
-                    self._harmonics[series_mask] = False
-                    self._h_base[series_mask] = -1
-                    self._h_mult[series_mask] = 0
+            series_mask = np.isin(self._h_base, indices[self._h_mult[indices] == 1])
+            self._harmonics[series_mask] = False
+            self._h_base[series_mask] = -1
+            self._h_mult[series_mask] = 0
+
+        return None
+
+    def _keep_sinusoids(self, keep):
+        """Keep only the sinusoids indicated by the boolean mask in the list.
+
+        Parameters
+        ----------
+        keep: numpy.ndarray[Any, dtype[bool]]
+            Mask of the sinusoids to keep.
+
+        Notes
+        -----
+        Does not change the sinusoid model. Parameter uncertainties and passing masks are masked along
+        if they are up-to-date in length.
+        """
+        n_sin = len(self._f_n)
+        indices = np.arange(n_sin)[~keep]
+
+        # if we remove a base harmonic, also remove the harmonic series
+        self._check_removed_h_base(indices)
+
+        # map the old indices to the new ones before masking h_base
+        new_index = np.cumsum(keep) - 1
+        h_base = np.where(self._h_base == -1, -1, new_index[self._h_base])
+
+        # remove the sinusoid parameters
+        self._f_n = self._f_n[keep]
+        self._a_n = self._a_n[keep]
+        self._ph_n = self._ph_n[keep]
+        self._include = self._include[keep]
+
+        # remove the harmonic parameters
+        self._harmonics = self._harmonics[keep]
+        self._h_base = h_base[keep]
+        self._h_mult = self._h_mult[keep]
+
+        # remove uncertainties and passing masks, if they match the sinusoids
+        for attr in ['_f_n_err', '_a_n_err', '_ph_n_err', '_f_h_err', '_passing_sigma', '_passing_snr',
+                     '_passing_harmonic']:
+            value = getattr(self, attr)
+            if len(value) == n_sin:
+                setattr(self, attr, value[keep])
 
         return None
 
@@ -933,11 +1206,8 @@ class SinusoidModel:
         h_mult_new = np.atleast_1d(h_mult_new)
         harmonics_new = h_base_new != -1
 
-        # make the new model
-        new_model = sum_sines_st(time, f_n_new, a_n_new, ph_n_new)
-
-        # update the model
-        self._sinusoid_model += new_model
+        # add the new sinusoids to the model
+        add_sines_inplace(self._sinusoid_model, time, f_n_new, a_n_new, ph_n_new)
 
         # update the sinusoid parameters
         self._f_n = np.append(self._f_n, f_n_new)
@@ -1003,14 +1273,10 @@ class SinusoidModel:
         # get a list of indices that are currently included in the model
         i_include = indices[self._include[indices]]
 
-        # get the current model at the indices
-        cur_model_i = sum_sines_st(time, self._f_n[i_include], self._a_n[i_include], self._ph_n[i_include])
-
-        # make the new model
-        new_model = sum_sines_st(time, f_n_new, a_n_new, ph_n_new)
-
-        # update the model
-        self._sinusoid_model = self._sinusoid_model - cur_model_i + new_model
+        # subtract the current sinusoids at the indices and add the new ones
+        add_sines_inplace(self._sinusoid_model, time, self._f_n[i_include], self._a_n[i_include],
+                          self._ph_n[i_include], sign=-1.0)
+        add_sines_inplace(self._sinusoid_model, time, f_n_new, a_n_new, ph_n_new)
 
         # update the sinusoid parameters
         self._f_n[indices] = f_n_new
@@ -1046,35 +1312,21 @@ class SinusoidModel:
         # get a list of indices that are currently included in the model
         i_include = indices[self._include[indices]]
 
-        # get the current model at the indices
-        cur_model_i = sum_sines_st(time, self._f_n[i_include], self._a_n[i_include], self._ph_n[i_include])
-
-        # update the model
-        self._sinusoid_model = self._sinusoid_model - cur_model_i
-
-        # update the sinusoid parameters
-        self._f_n = np.delete(self._f_n, indices)
-        self._a_n = np.delete(self._a_n, indices)
-        self._ph_n = np.delete(self._ph_n, indices)
-        self._include = np.delete(self._include, indices)
-
-        # update harmonic parameters
-        self._harmonics = np.delete(self._harmonics, indices)
-        self._h_base = np.delete(self._h_base, indices)
-        self._h_mult = np.delete(self._h_mult, indices)
+        # subtract the current sinusoids at the indices from the model
+        add_sines_inplace(self._sinusoid_model, time, self._f_n[i_include], self._a_n[i_include],
+                          self._ph_n[i_include], sign=-1.0)
 
-        # if we deleted a base harmonic, also delete the harmonic series
-        self._check_removed_h_base(indices)
-
-        # update indices for the removals (needs to go after _check_removed_h_base)
-        self._h_base = np.array(ut.adjust_indices_removed(self._h_base, indices))
+        # remove the sinusoids from the list with a single mask
+        keep = np.ones(len(self._f_n), dtype=bool)
+        keep[indices] = False
+        self._keep_sinusoids(keep)
 
         # update numbers
         self.update_n()
 
         return None
 
-    def include_sinusoids(self, time, indices):
+    def include_sinusoids(self, time, indices, curves=None):
         """Add back the sinusoids at the provided indices to the model.
 
         Meant for updating a limited number of sinusoids, less efficient for large numbers.
@@ -1086,17 +1338,22 @@ class SinusoidModel:
             Timestamps of the time series
         indices: numpy.ndarray[Any, dtype[int]]
             Indices of the sinusoids to include.
+        curves: numpy.ndarray[Any, dtype[float]], optional
+            Precomputed time series of the sinusoids at the indices (see sine_curves), with shape
+            (len(indices), len(time)). Used instead of evaluating the sinusoids again.
         """
         indices = np.atleast_1d(indices)
 
         # get a list of indices that are currently excluded from the model
-        i_exclude = indices[~self._include[indices]]
-
-        # get the current model at the indices
-        cur_model_i = sum_sines_st(time, self._f_n[i_exclude], self._a_n[i_exclude], self._ph_n[i_exclude])
+        mask_exclude = ~self._include[indices]
+        i_exclude = indices[mask_exclude]
 
-        # update the model
-        self._sinusoid_model = self._sinusoid_model + cur_model_i
+        # add the sinusoids at the indices back to the model
+        if curves is None:
+            add_sines_inplace(self._sinusoid_model, time, self._f_n[i_exclude], self._a_n[i_exclude],
+                              self._ph_n[i_exclude])
+        elif len(i_exclude) > 0:
+            self._sinusoid_model += np.sum(curves[mask_exclude], axis=0)
 
         # set their include parameter
         self._include[i_exclude] = True
@@ -1106,7 +1363,7 @@ class SinusoidModel:
 
         return None
 
-    def exclude_sinusoids(self, time, indices):
+    def exclude_sinusoids(self, time, indices, curves=None):
         """Remove the sinusoids at the provided indices from the model.
 
         Does not remove the sinusoids from the list yet, for index consistency.
@@ -1119,17 +1376,22 @@ class SinusoidModel:
             Timestamps of the time series
         indices: numpy.ndarray[Any, dtype[int]]
             Indices of the sinusoids to exclude.
+        curves: numpy.ndarray[Any, dtype[float]], optional
+            Precomputed time series of the sinusoids at the indices (see sine_curves), with shape
+            (len(indices), len(time)). Used instead of evaluating the sinusoids again.
         """
         indices = np.atleast_1d(indices)
 
         # get a list of indices that are currently included in the model
-        i_include = indices[self._include[indices]]
-
-        # get the current model at the indices
-        cur_model_i = sum_sines_st(time, self._f_n[i_include], self._a_n[i_include], self._ph_n[i_include])
+        mask_include = self._include[indices]
+        i_include = indices[mask_include]
 
-        # update the model
-        self._sinusoid_model = self._sinusoid_model - cur_model_i
+        # subtract the sinusoids at the indices from the model
+        if curves is None:
+            add_sines_inplace(self._sinusoid_model, time, self._f_n[i_include], self._a_n[i_include],
+                              self._ph_n[i_include], sign=-1.0)
+        elif len(i_include) > 0:
+            self._sinusoid_model -= np.sum(curves[mask_include], axis=0)
 
         # set their include parameter
         self._include[i_include] = False
@@ -1141,29 +1403,8 @@ class SinusoidModel:
 
     def remove_excluded(self):
         """Remove the sinusoids that are currently not included from the list."""
-        # make removal indices out of _include
-        indices = np.arange(len(self._include))[~self._include]
-
         # the model already doesn't include these sinusoids
-
-        # remove the sinusoid parameters
-        self._f_n = self._f_n[self._include]
-        self._a_n = self._a_n[self._include]
-        self._ph_n = self._ph_n[self._include]
-
-        # remove the harmonic parameters
-        self._harmonics = self._harmonics[self._include]
-        self._h_base = self._h_base[self._include]
-        self._h_mult = self._h_mult[self._include]
-
-        # include itself needs to go last
-        self._include = self._include[self._include]
-
-        # check for base frequency removal
-        self._check_removed_h_base(indices)
-
-        # update indices for the removals (needs to go after _check_removed_h_base)
-        self._h_base = np.array(ut.adjust_indices_removed(self._h_base, indices))
+        self._keep_sinusoids(self._include.copy())
 
         # numbers do not change here, except if we removed a base frequency
         self.update_n()  # n_sin won't change but n_harm and n_base might
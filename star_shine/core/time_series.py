@@ -3,9 +3,7 @@ Satellite Time-series Analysis Routine using Sinusoids and Harmonics through Ite
 
 This Python module contains classes for handling the time series, including combining it with the full model.
 """
-import numpy as np
-
-from star_shine.core import model as mdl, goodness_of_fit as gof, periodogram as pdg
+from star_shine.core import model as mdl, goodness_of_fit as gof, periodogram as pdg, utility as ut
 from star_shine.config import data_properties as dp
 
 
@@ -75,10 +73,10 @@ class TimeSeries:
         self.n_chunks = len(i_chunks)
 
         # set time properties
-        self.t_tot = np.ptp(self.time)
-        self.t_mean = np.mean(self.time)
-        self.t_mean_chunk = np.array([np.mean(self.time[ch[0]:ch[1]]) for ch in self.i_chunks])
-        self.t_step = np.median(np.diff(self.time))
+        t_min, t_max, t_sum, self.t_step = ut.time_statistics(self.time)
+        self.t_tot = t_max - t_min
+        self.t_mean = t_sum / self.n_time
+        self.t_mean_chunk = ut.chunk_reduceat(self.time, self.i_chunks) / (self.i_chunks[:, 1] - self.i_chunks[:, 0])
 
         # settings for periodograms
         self.pd_f0 = 0.01 / self.t_tot  # lower than T/100 no good
@@ -100,10 +98,11 @@ class TimeSeries:
 
         Running this function again will re-evaluate some properties, for if the configuration changed.
         """
-        # set data properties relying on config
-        self.pd_fn = dp.nyquist_frequency(self.time)
+        # set data properties relying on config, sharing a single pass over the time steps
+        dt_min, dt_max = dp.time_step_extremes(self.time)
+        self.pd_fn = dp.nyquist_frequency(self.time, dt_min=dt_min)
         self.f_resolution = dp.frequency_resolution(self.time)
-        self.snr_threshold = dp.signal_to_noise_threshold(self.time)
+        self.snr_threshold = dp.signal_to_noise_threshold(self.time, dt_max=dt_max)
 
         return None
 
@@ -188,15 +187,38 @@ class TimeSeriesModel(TimeSeries):
         """
         return self.flux - self.model()
 
-    def bic(self):
+    def bic(self, residual=None):
         """Calculate the BIC of the residual.
 
+        Parameters
+        ----------
+        residual: numpy.ndarray[Any, dtype[float]], optional
+            Precomputed residual of the current time series model. If not given, the BIC is computed from the models.
+
         Returns
         -------
         float
             BIC of the current time series model.
         """
-        return gof.calc_bic(self.residual(), self.n_param)
+        if residual is None:
+            # sum the squared residual in one pass without forming it
+            return gof.calc_bic_model(self.flux, self.linear.linear_model, self.sinusoid.sinusoid_model, self.n_param)
+
+        return gof.calc_bic(residual, self.n_param)
+
+    def bic_linear_refit(self):
+        """Calculate the BIC of the residual after refitting the linear model, without updating it.
+
+        Gives the BIC that update_linear_model followed by bic would, in a single fused pass.
+
+        Returns
+        -------
+        float
+            BIC of the time series model with the linear model refitted.
+        """
+        # the linear model is fitted to residuals + curve, which here is the flux minus the sinusoid model
+        return gof.calc_bic_linear_refit(self.time, -self.sinusoid.sinusoid_model, self.flux, self.i_chunks,
+                                         self.n_param)
 
     def periodogram(self, subtract_model=True):
         """Get the Lomb-Scargle periodogram of the time series.
@@ -240,17 +262,25 @@ class TimeSeriesModel(TimeSeries):
 
         return model_linear + model_sinusoid
 
-    def calc_periodogram(self):
+    def calc_periodogram(self, model=None):
         """Calculate Lomb-Scargle periodogram of the time series (disregarding include).
 
+        Parameters
+        ----------
+        model: numpy.ndarray[Any, dtype[float]], optional
+            Combined time series model as given by calc_model, to avoid evaluating it again.
+
         Returns
         -------
         tuple
             Contains the frequencies numpy.ndarray[Any, dtype[float]]
             and the spectrum numpy.ndarray[Any, dtype[float]]
         """
+        if model is None:
+            model = self.calc_model()
+
         f0, fn, df = self.pd_f0, self.pd_fn, self.pd_df
-        f, a = pdg.scargle_parallel(self.time, self.flux - self.calc_model(), f0=f0, fn=fn, df=df, norm='amplitude')
+        f, a = pdg.scargle_parallel(self.time, self.flux - model, f0=f0, fn=fn, df=df, norm='amplitude')
 
         return f, a
 
@@ -282,13 +312,13 @@ class TimeSeriesModel(TimeSeries):
         """Delegates to remove_sinusoids of SinusoidModel."""
         self.sinusoid.remove_sinusoids(self.time, indices)
 
-    def include_sinusoids(self, indices):
+    def include_sinusoids(self, indices, curves=None):
         """Delegates to include_sinusoids of SinusoidModel."""
-        self.sinusoid.include_sinusoids(self.time, indices)
+        self.sinusoid.include_sinusoids(self.time, indices, curves=curves)
 
-    def exclude_sinusoids(self, indices):
+    def exclude_sinusoids(self, indices, curves=None):
         """Delegates to exclude_sinusoids of SinusoidModel."""
-        self.sinusoid.exclude_sinusoids(self.time, indices)
+        self.sinusoid.exclude_sinusoids(self.time, indices, curves=curves)
 
     def remove_excluded(self):
         """Delegates to remove_excluded of SinusoidModel."""
@@ -6,6 +6,11 @@ This module contains utility functions for data processing, unit conversions.
 import datetime
 import numpy as np
 import numba as nb
+try:
+    import bottleneck as bn  # optional functionality
+except ImportError:
+    bn = None
+    pass
 
 from star_shine.config.helpers import get_config
 
@@ -53,6 +58,30 @@ def decimal_figures(x, n_sf):
     return decimals
 
 
+@nb.njit(cache=True)
+def decimal_figures_array(x, n_sf):
+    """Determine the number of decimal figures to print given a target
+    number of significant figures, for an array of values
+
+    Parameters
+    ----------
+    x: numpy.ndarray[Any, dtype[float]]
+        Values to determine the number of decimals for.
+    n_sf: int
+        Number of significant figures to compute.
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[int]]
+        Number of decimal places to round to for each value.
+    """
+    decimals = np.zeros(len(x), dtype=np.int64)
+    for i in range(len(x)):
+        decimals[i] = decimal_figures(x[i], n_sf)
+
+    return decimals
+
+
 @nb.njit(cache=True)
 def float_to_str_numba(x, dec=2):
     """Convert float to string for Numba up to some decimal place
@@ -117,6 +146,46 @@ def float_to_str_scientific(x, x_err, error=True, brackets=False):
     return number_str
 
 
+def float_to_str_scientific_array(x, x_err, error=True, brackets=False):
+    """Conversion of numbers with an error margin to strings in scientific notation.
+
+    Array version of float_to_str_scientific, the decimal places are determined for all numbers at once.
+
+    Parameters
+    ----------
+    x: numpy.ndarray[Any, dtype[float]]
+        Values to convert.
+    x_err: numpy.ndarray[Any, dtype[float]]
+        Error values to determine the number of decimals for.
+    error: bool, optional
+        Include the error value.
+    brackets: bool, optional
+        Place the error value in brackets.
+
+    Returns
+    -------
+    list[str]
+        Formatted string conversions.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    x_err = np.asarray(x_err, dtype=np.float64)
+
+    # determine the decimal places to round to
+    rnd_x = np.maximum(decimal_figures_array(x_err, 2), decimal_figures_array(x, 2)).tolist()
+
+    # format the strings
+    if not error:
+        number_strs = [f"{x_i:.{rnd_i}f}" for x_i, rnd_i in zip(x.tolist(), rnd_x)]
+    elif brackets:
+        number_strs = [f"{x_i:.{rnd_i}f} (\u00B1{x_err_i:.{rnd_i}f})"
+                       for x_i, x_err_i, rnd_i in zip(x.tolist(), x_err.tolist(), rnd_x)]
+    else:
+        number_strs = [f"{x_i:.{rnd_i}f} \u00B1 {x_err_i:.{rnd_i}f}"
+                       for x_i, x_err_i, rnd_i in zip(x.tolist(), x_err.tolist(), rnd_x)]
+
+    return number_strs
+
+
 @nb.njit(cache=True)
 def weighted_mean(x, w):
     """Weighted mean since Numba doesn't support numpy.average
@@ -167,49 +236,26 @@ def std_unb(x, n):
 
 
 def consecutive_subsets(x):
-    """Creates all consecutive subsets of the given list.
+    """Generates all consecutive subsets of the given list.
+
+    The subsets are slices of x (views if x is a numpy array), produced one at a time.
 
     Parameters
     ----------
     x: list[Any], numpy.ndarray[Any, dtype[Any]]
         A list of values.
 
-    Returns
-    -------
-    list
-        The list of consecutive subsets ordered by size and with length two or more.
+    Yields
+    ------
+    list[Any], numpy.ndarray[Any, dtype[Any]]
+        The consecutive subsets ordered by size and with length two or more.
     """
     n = len(x)
 
-    # create the subsets from largest to smallest
-    subsets = [x[p1:p1 + l] for l in range(n, 1, -1) for p1 in range(n - l + 1)]
-
-    return subsets
-
-
-def adjust_indices_removed(x, removed):
-    """Adjusts the indices in `x` to account for removals.
-
-    If y_reduced=np.delete(y, removed), and x are indices indicating items in y, this function gives
-    the indices x_adj that indicate the same items in y_reduced. Assumes that none of the removed items
-    are indicated by indices in x.
-
-    Parameters
-    ----------
-    x: iterable[int], numpy.ndarray[Any, dtype[int]]
-        A list of indices that slice another array, y.
-    removed: iterable[int], numpy.ndarray[Any, dtype[int]]
-        A second list of indices indicating removals from y.
-
-    Returns
-    -------
-    list[int]
-        Adjusted indices that can be used with the reduced y.
-    """
-    # adjust the indices
-    x_adj = [i - sum(1 for r in removed if r < i) for i in x]
-
-    return x_adj
+    # generate the subsets from largest to smallest
+    for l in range(n, 1, -1):
+        for p1 in range(n - l + 1):
+            yield x[p1:p1 + l]
 
 
 @nb.njit(cache=True)
@@ -357,6 +403,193 @@ def mark_gaps(x, min_gap=1.):
     return gaps
 
 
+@nb.njit(cache=True)
+def _time_pass(time):
+    """Minimum, maximum, sum and the time steps of the time stamps in a single pass.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        t_min: float
+            Smallest time stamp.
+        t_max: float
+            Largest time stamp.
+        t_sum: float
+            Sum of the time stamps.
+        dt: numpy.ndarray[Any, dtype[float]]
+            Time steps between consecutive time stamps.
+    """
+    n_time = len(time)
+    t_min = time[0]
+    t_max = time[0]
+    t_sum = time[0]
+    dt = np.empty(n_time - 1)
+
+    for i in range(1, n_time):
+        t_i = time[i]
+        t_sum += t_i
+        if t_i < t_min:
+            t_min = t_i
+        if t_i > t_max:
+            t_max = t_i
+        dt[i - 1] = t_i - time[i - 1]
+
+    return t_min, t_max, t_sum, dt
+
+
+def time_statistics(time):
+    """Minimum, maximum, sum and median time step of the time stamps.
+
+    Parameters
+    ----------
+    time: numpy.ndarray[Any, dtype[float]]
+        Timestamps of the time series
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        t_min: float
+            Smallest time stamp.
+        t_max: float
+            Largest time stamp.
+        t_sum: float
+            Sum of the time stamps.
+        t_step: float
+            Median time step between consecutive time stamps.
+
+    Notes
+    -----
+    The median uses a selection (np.partition) on the time steps instead of a full sort. The numpy selection
+    is considerably faster than the one available in numba, so it is done outside of the compiled pass.
+    If the optional bottleneck package is installed, its median is used instead.
+    """
+    t_min, t_max, t_sum, dt = _time_pass(time)
+
+    # median of the time steps
+    n_dt = len(dt)
+    k = n_dt // 2
+    if n_dt == 0:
+        t_step = np.nan
+    elif bn is not None:
+        t_step = bn.median(dt)  # quickselect without the numpy dispatch overhead
+    elif n_dt % 2 == 1:
+        t_step = np.partition(dt, k)[k]
+    else:
+        dt = np.partition(dt, [k - 1, k])
+        t_step = 0.5 * (dt[k - 1] + dt[k])
+
+    return t_min, t_max, t_sum, t_step
+
+
+@nb.njit(cache=True)
+def any_non_increasing(x):
+    """Check whether any element of `x` is smaller than or equal to the previous one.
+
+    Parameters
+    ----------
+    x: numpy.ndarray[Any, dtype[float]]
+        Array of values, for example time stamps.
+
+    Returns
+    -------
+    bool
+        True if `x` is not strictly increasing.
+
+    Notes
+    -----
+    Stops at the first violation and does not make a temporary array like np.diff.
+    """
+    for i in range(1, len(x)):
+        if x[i] <= x[i - 1]:
+            return True
+
+    return False
+
+
+@nb.njit(cache=True)
+def argmax_ratio(x, y):
+    """Index of the maximum of `x` divided by `y`, element-wise.
+
+    Parameters
+    ----------
+    x: numpy.ndarray[Any, dtype[float]]
+        Array of numerators, for example a periodogram.
+    y: numpy.ndarray[Any, dtype[float]]
+        Array of denominators, for example a noise spectrum.
+
+    Returns
+    -------
+    int
+        Index of the maximum ratio, the first one if there are multiple.
+
+    Notes
+    -----
+    One pass without the temporary array of np.argmax(x / y). NaN ratios are skipped.
+    """
+    i_max = 0
+    r_max = -np.inf
+    for i in range(len(x)):
+        r = x[i] / y[i]
+        if r > r_max:
+            r_max = r
+            i_max = i
+
+    return i_max
+
+
+def chunk_reduceat(x, i_chunks, ufunc=np.add):
+    """Reduce an array per time chunk in a single vectorised pass.
+
+    Parameters
+    ----------
+    x: numpy.ndarray[Any, dtype[float]]
+        Array to reduce, for example the time stamps.
+    i_chunks: numpy.ndarray[Any, dtype[int]]
+        Pair(s) of indices indicating time chunks within the light curve, separately handled in cases like
+        the piecewise-linear curve. If only a single curve is wanted, set to np.array([[0, len(time)]]).
+    ufunc: numpy.ufunc, optional
+        Binary ufunc to reduce with, for example np.add, np.minimum or np.maximum.
+
+    Returns
+    -------
+    numpy.ndarray[Any, dtype[float]]
+        The reduced value per chunk. Empty chunks get the identity of the ufunc (0 for np.add),
+        or NaN if it has none (like np.minimum and np.maximum).
+
+    Notes
+    -----
+    If the chunks tile the whole array back to back without empty chunks (the usual case), only the start
+    indices are needed and the array is reduced in place. Otherwise, starts and stops are interleaved so that
+    non-contiguous chunks work, and every other result is a chunk. A zero is then appended (copying the array)
+    so that a stop index equal to len(x) is a valid reduceat index.
+    """
+    i_chunks = np.asarray(i_chunks, dtype=np.int_).reshape(-1, 2)
+    if len(i_chunks) == 0:
+        return np.zeros(0)
+
+    chunk_starts = i_chunks[:, 0]
+    chunk_stops = i_chunks[:, 1]
+    empty = chunk_stops <= chunk_starts
+
+    # reduceat returns x[start] for an empty chunk instead of the reduction over nothing
+    if not np.any(empty):
+        if chunk_starts[0] == 0 and chunk_stops[-1] == len(x) and np.all(chunk_starts[1:] == chunk_stops[:-1]):
+            return ufunc.reduceat(x, chunk_starts)
+
+    reduced = ufunc.reduceat(np.append(x, 0.), i_chunks.ravel())[::2]
+    if np.any(empty):
+        reduced[empty] = np.nan if ufunc.identity is None else ufunc.identity
+
+    return reduced
+
+
 @nb.njit(cache=True)
 def n_parameters(n_chunks, n_sinusoids, n_harmonics):
     """Return the number of parameters of the model."""
@@ -154,8 +154,10 @@ def plot_pd_single_output(time, flux, flux_err, p_orb, p_err, const, slope, f_n,
         ax.errorbar([], [], xerr=[], yerr=[], linestyle='-', capsize=2, c='tab:red', label='extracted harmonics')
     ax.plot(freqs, ampls, c='tab:blue', label='flux')
     ax.plot(freqs_r, ampls_r, c='tab:orange', label='residual')
+    is_harmonic = np.zeros(len(f_n), dtype=bool)
+    is_harmonic[harmonics] = True
     for i in range(len(f_n)):
-        if i in harmonics:
+        if is_harmonic[i]:
             ax.errorbar([f_n[i], f_n[i]], [0, a_n[i]], xerr=[0, errors[2][i]], yerr=[0, errors[3][i]],
                         linestyle='-', capsize=2, c='tab:red')
         else:
@@ -319,14 +321,15 @@ def plot_lc(time, flux, flux_err, i_chunks, file_name=None, show=True):
     None
     """
     # plot the light curve data with different colours for each chunk
+    t_mean = ut.chunk_reduceat(time, i_chunks) / (i_chunks[:, 1] - i_chunks[:, 0])
+    f_min = ut.chunk_reduceat(flux, i_chunks, ufunc=np.minimum)
+    f_max = ut.chunk_reduceat(flux, i_chunks, ufunc=np.maximum)
+
     fig, ax = plt.subplots(figsize=(16, 9))
-    for ch in i_chunks:
-        t_mean = np.mean(time[ch[0], ch[1]])
-        f_min = np.min(flux[ch[0], ch[1]])
-        f_max = np.max(flux[ch[0], ch[1]])
-        ax.plot([t_mean, t_mean], [f_min, f_max], alpha=0.3)
-        ax.errorbar(time[ch[0], ch[1]], flux[ch[0], ch[1]], yerr=flux_err[ch[0], ch[1]], color='grey', alpha=0.3)
-        ax.scatter(time[ch[0], ch[1]], flux[ch[0], ch[1]], marker='.', label='dataset')
+    for i, ch in enumerate(i_chunks):
+        ax.plot([t_mean[i], t_mean[i]], [f_min[i], f_max[i]], alpha=0.3)
+        ax.errorbar(time[ch[0]:ch[1]], flux[ch[0]:ch[1]], yerr=flux_err[ch[0]:ch[1]], color='grey', alpha=0.3)
+        ax.scatter(time[ch[0]:ch[1]], flux[ch[0]:ch[1]], marker='.', label='dataset')
     ax.set_xlabel('time')
     ax.set_ylabel('flux')
     ax.legend()
@@ -3,37 +3,117 @@ Satellite Time-series Analysis Routine using Sinusoids and Harmonics through Ite
 
 This Python module contains the analysis functions for the graphical user interface.
 """
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, Signal, Slot
 
+from star_shine.core import model as mdl, periodogram as pdg
+from star_shine.api import Data
 
-class PipelineThread(QThread):
-    """A QThread subclass to perform analysis in the background."""
 
-    def __init__(self, pipeline_instance):
+class PipelineWorker(QObject):
+    """A worker object to perform analysis in the background, on a persistent thread."""
+    # Define a signal that requests a pipeline function with its positional and keyword arguments
+    run_signal = Signal(str, object, object)
+
+    def __init__(self):
         super().__init__()
-        self.pipeline_instance = pipeline_instance
-        self.func_name = ''
-        self.args = ()
-        self.kwargs = {}
+        self.pipeline_instance = None
+        self.running = False
+
+        # queued to the worker thread once the worker is moved there
+        self.run_signal.connect(self.run)
 
     def start_function(self, func_name, *args, **kwargs):
-        """Start the thread with a specific function and arguments."""
-        self.func_name = func_name
-        self.args = args
-        self.kwargs = kwargs
-        super().start()
-
-    def run(self):
-        """Run the function in a separate thread."""
-        if self.func_name != '':
-            # try:
-            # start a thread with the function
-            function_to_run = getattr(self.pipeline_instance, self.func_name)
-            function_to_run(*self.args, **self.kwargs)
-
-            # except Exception as e:
-            #     self.pipeline_instance.logger.error(f"Error during analysis: {e}")
+        """Start a specific function with arguments on the worker thread (ignored while one is running)."""
+        if self.running:
+            return None
+
+        self.running = True
+        self.run_signal.emit(func_name, args, kwargs)
+
+        return None
+
+    @Slot(str, object, object)
+    def run(self, func_name, args, kwargs):
+        """Run the function in the thread of the worker."""
+        try:
+            # run the function
+            function_to_run = getattr(self.pipeline_instance, func_name)
+            function_to_run(*args, **kwargs)
+        # except Exception as e:
+        #     self.pipeline_instance.logger.error(f"Error during analysis: {e}")
+        finally:
+            self.running = False
 
     def stop(self):
-        """Stop the thread."""
+        """Stop the running function."""
         pass
+
+
+class DataLoadWorker(QObject):
+    """A worker object to load data files in the background."""
+    # Define signals that request loading a list of files and that emit the loaded data object
+    load_signal = Signal(object)
+    loaded_signal = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.logger = None
+
+        # queued to the worker thread once the worker is moved there
+        self.load_signal.connect(self.load)
+
+    def start_load(self, file_paths, logger):
+        """Start loading the data files on the worker thread."""
+        self.logger = logger
+        self.load_signal.emit(file_paths)
+
+        return None
+
+    @Slot(object)
+    def load(self, file_paths):
+        """Load the data from the files and emit the resulting data object.
+
+        Parameters
+        ----------
+        file_paths: list[str]
+            Paths of the file(s) to load.
+        """
+        if len(file_paths) == 1 and file_paths[0].endswith('.hdf5'):
+            # a single hdf5 file is loaded as a star shine data object
+            data = Data.load(file_name=file_paths[0], data_dir='', logger=self.logger)
+        else:
+            # any other files are loaded as external data
+            data = Data.load_data(file_list=file_paths, data_dir='', target_id='', data_id='', logger=self.logger)
+
+        self.loaded_signal.emit(data)
+
+
+class PlotComputeWorker(QObject):
+    """A worker object to compute the model and residual periodogram for the plots in the background."""
+    # Define a signal that emits the result version with the model, frequencies and amplitudes
+    result_signal = Signal(int, object, object, object)
+
+    @Slot(int, object)
+    def compute(self, version, snapshot):
+        """Compute the time series model and residual periodogram and emit them.
+
+        Parameters
+        ----------
+        version: int
+            Tag of the result that the computation is for, emitted back together with the arrays.
+        snapshot: dict
+            Copies of the model parameters and the time series the model is evaluated on, taken when the
+            computation was requested (see MainWindow._model_snapshot).
+
+        Notes
+        -----
+        Only the snapshot is read, so nothing is shared with the analysis thread while it changes the model.
+        The kernels used here run their parallel regions without holding the GIL.
+        """
+        time, flux, i_chunks = snapshot['time'], snapshot['flux'], snapshot['i_chunks']
+        model = mdl.linear_curve(time, snapshot['const'], snapshot['slope'], i_chunks)
+        model += mdl.sum_sines(time, snapshot['f_n'], snapshot['a_n'], snapshot['ph_n'])
+        freqs, ampls = pdg.scargle_parallel(time, flux - model, f0=snapshot['f0'], fn=snapshot['fn'],
+                                            df=snapshot['df'], norm='amplitude')
+
+        self.result_signal.emit(version, model, freqs, ampls)
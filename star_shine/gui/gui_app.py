@@ -11,10 +11,11 @@ import numpy as np
 from PySide6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QGridLayout, QSplitter, QMenuBar
 from PySide6.QtWidgets import QWidget, QLabel, QTextEdit, QLineEdit, QSpinBox, QFileDialog, QMessageBox, QPushButton
 from PySide6.QtWidgets import QTableView, QHeaderView, QDialog, QFormLayout
-from PySide6.QtGui import QAction, QFont, QScreen, QStandardItemModel, QStandardItem, QTextCursor, QIcon
+from PySide6.QtGui import QAction, QFont, QScreen, QStandardItemModel, QStandardItem, QIcon
+from PySide6.QtCore import Qt, QThread, QTimer, Signal, Slot
 
 from star_shine.core import utility as ut
-from star_shine.api import Data, Pipeline, main
+from star_shine.api import Pipeline, main
 from star_shine.gui import gui_log, gui_plot, gui_analysis, gui_config
 from star_shine.config import helpers as hlp
 
@@ -22,6 +23,61 @@ from star_shine.config import helpers as hlp
 # load configuration
 config = hlp.get_config()
 
+# resolved once, the images folder does not move while the application runs
+_IMAGES_PATH = hlp.get_images_path()
+
+# fixed texts of the main window
+_EQUATION_STR = ("Model: flux = \u2211\u1D62 (a\u1D62 sin(2\u03C0f\u1D62t + \u03C6\u1D62))"
+                 " + \u2211\u2095 (a\u2095 sin(2\u03C0f\u1D47n\u2095t + \u03C6\u2095))"
+                 " + bt + c")
+_TABLE_HEADERS = ["Frequency", "Amplitude", "Phase"]
+_ABOUT_MESSAGE = ("STAR SHINE version {version}\n"
+                  "Satellite Time-series Analysis Routine "
+                  "using Sinusoids and Harmonics through Iterative Non-linear Extraction\n"
+                  "Repository: https://github.com/LucIJspeert/star_shine\n"
+                  "Code written by: Luc IJspeert")
+
+# file dialogs skip the custom icon lookup for every listed directory
+_FILE_DIALOG_OPTIONS = QFileDialog.Option.DontUseCustomDirectoryIcons
+
+# the application icon is decoded on first use (a QIcon needs a QApplication to exist)
+_APP_ICON = None
+
+
+def _get_app_icon():
+    """Get the application icon, loading it from file only the first time.
+
+    Returns
+    -------
+    QIcon
+        The Star Shine application icon.
+    """
+    global _APP_ICON
+
+    if _APP_ICON is None:
+        _APP_ICON = QIcon(os.path.join(_IMAGES_PATH, 'Star_Shine_dark_simple_small_transparent.png'))
+
+    return _APP_ICON
+
+
+def _compute_window_size():
+    """Compute the main window size from the available screen size and the configuration.
+
+    Returns
+    -------
+    tuple
+        A tuple containing the following elements:
+        h_size: int
+            Window width, a fraction config.h_size_frac of the screen width.
+        v_size: int
+            Window height, a fraction config.v_size_frac of the screen height.
+    """
+    screen_size = QApplication.primaryScreen().availableSize()
+    h_size = int(screen_size.width() * config.h_size_frac)  # some fraction of the screen width
+    v_size = int(screen_size.height() * config.v_size_frac)  # some fraction of the screen height
+
+    return h_size, v_size
+
 
 class MainWindow(QMainWindow):
     """The main window of the Star Shine application.
@@ -29,23 +85,21 @@ class MainWindow(QMainWindow):
     Contains a graphical user interface for loading data, performing analysis,
     displaying results, and visualizing plots.
     """
+    # Define a signal that requests the model and residual periodogram for a result version and its parameters
+    model_request_signal = Signal(int, object)
 
     def __init__(self):
         super().__init__()
 
         # Get screen dimensions
-        screen = QApplication.primaryScreen()
-        screen_size = screen.availableSize()
-        h_size = int(screen_size.width() * config.h_size_frac)  # some fraction of the screen width
-        v_size = int(screen_size.height() * config.v_size_frac)  # some fraction of the screen height
+        h_size, v_size = _compute_window_size()
 
         # Set some window things
         self.setWindowTitle("Star Shine")
         self.setGeometry(100, 50, h_size, v_size)  # x, y, width, height
 
         # App icon
-        icon_path = os.path.join(hlp.get_images_path(), 'Star_Shine_dark_simple_small_transparent.png')
-        self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(_get_app_icon())
 
         # save dir needs a default value
         # self.save_dir = config.save_dir
@@ -67,13 +121,44 @@ class MainWindow(QMainWindow):
         # Add widgets to the layout
         self._add_widgets_to_layout()
 
+        # log lines are collected and written to the text field together, at most every 50 ms
+        self._log_buffer = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log_buffer)
+
         # custom gui-specific logger (will be reloaded and connected when data is loaded)
         self.logger = gui_log.get_custom_gui_logger('gui_logger', '')
-        self.logger.log_signal.connect(self.append_text)
+        self.logger.log_signal.connect(self.append_text, Qt.ConnectionType.QueuedConnection)
 
         # add the api classes for functionality
         self.pipeline = None
-        self.pipeline_thread = None
+
+        # the analysis runs on a persistent background thread (given the pipeline when data is loaded)
+        self.pipeline_thread = QThread()
+        self.pipeline_worker = gui_analysis.PipelineWorker()
+        self.pipeline_worker.moveToThread(self.pipeline_thread)
+
+        # data files are loaded on the same thread, after any running analysis
+        self.data_loader = gui_analysis.DataLoadWorker()
+        self.data_loader.moveToThread(self.pipeline_thread)
+        self.data_loader.loaded_signal.connect(self._on_data_loaded)
+        self.pipeline_thread.start(QThread.Priority.LowPriority)  # leave the gui thread room to repaint
+
+        # model and residual periodogram of the current result, reused until the result changes
+        self._model_cache = None
+        self._model_version = 0
+        self._model_requested = -1
+        self._pending_new_plot = False
+
+        # the model and residual periodogram are computed on a persistent background thread
+        self.plot_thread = QThread()
+        self.plot_worker = gui_analysis.PlotComputeWorker()
+        self.plot_worker.moveToThread(self.plot_thread)
+        self.model_request_signal.connect(self.plot_worker.compute)
+        self.plot_worker.result_signal.connect(self._apply_model_periodogram)
+        self.plot_thread.start()
 
     def _setup_central_widget(self):
         """Set up the central widget and its layout."""
@@ -134,57 +219,29 @@ class MainWindow(QMainWindow):
 
     def _setup_file_menu(self, file_menu):
         """Set up the file menu."""
-
-        # Add "Load Data" button to "File" menu
-        load_data_action = QAction("Load Data", self)
-        load_data_action.triggered.connect(self.load_data)
-        file_menu.addAction(load_data_action)
-
-        # Add "Save Data Object" button to "File" menu
-        save_data_action = QAction("Save Data", self)
-        save_data_action.triggered.connect(self.save_data)
-        file_menu.addAction(save_data_action)
-
-        # Add "Load Result Object" button to "File" menu
-        load_result_action = QAction("Load Result", self)
-        load_result_action.triggered.connect(self.load_result)
-        file_menu.addAction(load_result_action)
-
-        # Add "Save Result Object" button to "File" menu
-        save_result_action = QAction("Save Result", self)
-        save_result_action.triggered.connect(self.save_result)
-        file_menu.addAction(save_result_action)
-
-        # Add a horizontal separator
-        file_menu.addSeparator()
-
-        # Add "Set Save Location" button to "File" menu
-        set_save_location_action = QAction("Set Save Location", self)
-        set_save_location_action.triggered.connect(self.set_save_location)
-        file_menu.addAction(set_save_location_action)
-
-        # Add "Settings" action to open the settings dialog
-        settings_action = QAction("Settings", self)
-        settings_action.triggered.connect(self.show_settings_dialog)
-        file_menu.addAction(settings_action)
-
-        # Add "Settings" action to open the settings dialog
-        export_settings_action = QAction("Export Settings", self)
-        export_settings_action.triggered.connect(self.export_settings)
-        file_menu.addAction(export_settings_action)
-
-        # Add "Settings" action to open the settings dialog
-        import_settings_action = QAction("Import Settings", self)
-        import_settings_action.triggered.connect(self.import_settings)
-        file_menu.addAction(import_settings_action)
-
-        # Add a horizontal separator
-        file_menu.addSeparator()
-
-        # Add "Exit" button to "File" menu
-        exit_action = QAction("Exit", self)
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
+        # action names and the methods they trigger, None adds a horizontal separator
+        file_actions = [("Load Data", self.load_data),
+                        ("Save Data", self.save_data),
+                        ("Load Result", self.load_result),
+                        ("Save Result", self.save_result),
+                        None,
+                        ("Set Save Location", self.set_save_location),
+                        ("Settings", self.show_settings_dialog),
+                        ("Export Settings", self.export_settings),
+                        ("Import Settings", self.import_settings),
+                        None,
+                        ("Exit", self.close)]
+
+        # add the buttons to the "File" menu
+        for entry in file_actions:
+            if entry is None:
+                file_menu.addSeparator()
+                continue
+
+            name, slot = entry
+            action = QAction(name, self)
+            action.triggered.connect(slot)
+            file_menu.addAction(action)
 
         return None
 
@@ -233,6 +290,8 @@ class MainWindow(QMainWindow):
 
         self.text_field = QTextEdit()
         self.text_field.setReadOnly(True)  # Make the text edit read-only
+        self.text_field.setUndoRedoEnabled(False)  # no edit history needed for log output
+        self.text_field.document().setMaximumBlockCount(5000)  # bound the number of kept lines
         l_col_layout.addWidget(self.text_field)
 
         return l_col_widget
@@ -250,16 +309,13 @@ class MainWindow(QMainWindow):
         m_col_layout = QVBoxLayout(m_col_widget)
 
         # add the data model formula above the table
-        equation_str = "Model: flux = \u2211\u1D62 (a\u1D62 sin(2\u03C0f\u1D62t + \u03C6\u1D62))"
-        equation_str += " + \u2211\u2095 (a\u2095 sin(2\u03C0f\u1D47n\u2095t + \u03C6\u2095))"
-        equation_str += " + bt + c"
-        formula_label = QLabel(equation_str)
+        formula_label = QLabel(_EQUATION_STR)
         m_col_layout.addWidget(formula_label)
 
         # Create the table view and model
         self.table_view = QTableView()
         self.table_model = QStandardItemModel(0, 3)  # Start with 0 rows and 3 columns
-        self.table_model.setHorizontalHeaderLabels(["Frequency", "Amplitude", "Phase"])
+        self.table_model.setHorizontalHeaderLabels(_TABLE_HEADERS)
         self.table_view.setModel(self.table_model)
 
         # Connect the selection changed signal
@@ -472,6 +528,7 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot(str)
     def append_text(self, text):
         """Append a line of text at the end of the plain text output box.
 
@@ -480,11 +537,20 @@ class MainWindow(QMainWindow):
         text: str
             The text to append.
         """
-        cursor = self.text_field.textCursor()
-        cursor.movePosition(QTextCursor.End)  # Move cursor to the end of the text
-        cursor.insertText(text + '\n')  # insert the text
-        self.text_field.setTextCursor(cursor)
-        self.text_field.ensureCursorVisible()
+        self._log_buffer.append(text)
+
+        # the text field is updated once the timer runs out
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+        return None
+
+    @Slot()
+    def _flush_log_buffer(self):
+        """Write the collected log lines to the plain text output box."""
+        if len(self._log_buffer) > 0:
+            self.text_field.append('\n'.join(self._log_buffer))  # appends paragraphs and keeps the view at the end
+            self._log_buffer.clear()
 
         return None
 
@@ -501,88 +567,118 @@ class MainWindow(QMainWindow):
         col2_err = self.pipeline.ts_model.sinusoid.a_n_err
         col3_err = self.pipeline.ts_model.sinusoid.ph_n_err
 
-        # display sinusoid parameters in the table
-        self.table_model.setRowCount(len(col1))
-        for row, row_items in enumerate(zip(col1, col2, col3, col1_err, col2_err, col3_err)):
-            # convert to strings
-            c1 = ut.float_to_str_scientific(row_items[0], row_items[3], error=display_err, brackets=False)
-            c2 = ut.float_to_str_scientific(row_items[1], row_items[4], error=display_err, brackets=False)
-            c3 = ut.float_to_str_scientific(row_items[2], row_items[5], error=display_err, brackets=False)
+        # convert all columns to strings up front
+        str_cols = [ut.float_to_str_scientific_array(col, col_err, error=display_err, brackets=False)
+                    for col, col_err in ((col1, col1_err), (col2, col2_err), (col3, col3_err))]
 
-            # convert to table items
-            c1_item = QStandardItem(c1)
-            c2_item = QStandardItem(c2)
-            c3_item = QStandardItem(c3)
+        # the row count change is signalled normally so that the view (and selection) follow it
+        n_rows = len(col1)
+        self.table_view.setUpdatesEnabled(False)
+        self.table_model.setRowCount(n_rows)
 
-            # insert into table
-            self.table_model.setItem(row, 0, c1_item)
-            self.table_model.setItem(row, 1, c2_item)
-            self.table_model.setItem(row, 2, c3_item)
+        # insert the items without a change notification per cell, then notify once for the whole table
+        self.table_model.blockSignals(True)
+        for row, row_items in enumerate(zip(*str_cols)):
+            for col, item in enumerate(row_items):
+                self.table_model.setItem(row, col, QStandardItem(item))
+        self.table_model.blockSignals(False)
+
+        if n_rows > 0:
+            self.table_model.dataChanged.emit(self.table_model.index(0, 0), self.table_model.index(n_rows - 1, 2))
+        self.table_view.setUpdatesEnabled(True)
 
         return None
 
-    def update_plots(self, new_plot=False):
-        """Update the plotting area with the current data."""
-        # collect plot data in a dict
-        upper_plot_data = {}
-        lower_plot_data = {}
+    def _collect_upper_plot_data(self, selected_rows):
+        """Collect the data for the upper plot area, the time series.
 
-        # collect attributes
-        n_param = self.pipeline.ts_model.sinusoid.n_param
+        Parameters
+        ----------
+        selected_rows: numpy.ndarray[Any, dtype[int]]
+            Indices of the sinusoids selected in the table.
+
+        Returns
+        -------
+        dict
+            Plot data to pass on to set_plot_data.
+        """
         time = self.pipeline.ts_model.time
         flux = self.pipeline.ts_model.flux
 
+        # no result yet: only the data
+        if self.pipeline.ts_model.sinusoid.n_param == 0:
+            return {'scatter_xs': [time], 'scatter_ys': [flux]}
+
+        model = self._model_cache[0]
+
+        # only show residual if toggle checked
+        if self.upper_plot_area.show_residual:
+            return {'scatter_xs': [time], 'scatter_ys': [flux - model]}
+
+        plot_data = {'scatter_xs': [time], 'scatter_ys': [flux],
+                     'plot_xs': [time], 'plot_ys': [model], 'plot_colors': ['grey']}
+
+        # if highlighted rows
+        if len(selected_rows) > 0:
+            highlighted_model = self.pipeline.ts_model.calc_model(indices=selected_rows)
+            plot_data['plot_xs'].append(time)
+            plot_data['plot_ys'].append(highlighted_model)
+            plot_data['plot_colors'].append('tab:red')
+
+        return plot_data
+
+    def _collect_lower_plot_data(self, selected_rows):
+        """Collect the data for the lower plot area, the periodogram.
+
+        Parameters
+        ----------
+        selected_rows: numpy.ndarray[Any, dtype[int]]
+            Indices of the sinusoids selected in the table.
+
+        Returns
+        -------
+        dict
+            Plot data to pass on to set_plot_data.
+        """
+        pd_freqs = self.pipeline.ts_model.pd_freqs
+        pd_ampls = self.pipeline.ts_model.pd_ampls
+
+        # no result yet: only the data
+        if self.pipeline.ts_model.sinusoid.n_param == 0:
+            return {'plot_xs': [pd_freqs], 'plot_ys': [pd_ampls]}
+
+        freqs, ampls = self._model_cache[1:]
+
+        # only show residual if toggle checked
+        if self.lower_plot_area.show_residual:
+            return {'plot_xs': [freqs], 'plot_ys': [ampls]}
+
+        f_n = self.pipeline.ts_model.sinusoid.f_n  # the properties return copies, get them once
+        a_n = self.pipeline.ts_model.sinusoid.a_n
+        plot_data = {'plot_xs': [pd_freqs, freqs], 'plot_ys': [pd_ampls, ampls],
+                     'vlines_xs': [f_n], 'vlines_ys': [a_n], 'vlines_colors': ['grey']}
+
+        # if highlighted rows
+        if len(selected_rows) > 0:
+            plot_data['vlines_xs'].append(f_n[selected_rows])
+            plot_data['vlines_ys'].append(a_n[selected_rows])
+            plot_data['vlines_colors'].append('tab:red')
+
+        return plot_data
+
+    def update_plots(self, new_plot=False):
+        """Update the plotting area with the current data."""
+        # the model is computed in the background, the plots are updated once it is in
+        if self.pipeline.ts_model.sinusoid.n_param > 0 and self._model_cache is None:
+            self._request_model_periodogram(new_plot=new_plot)
+            return None
+
         # Get the row numbers of the selected indexes (if any)
         selected_rows = np.unique([index.row() for index in self.table_view.selectedIndexes()])
 
-        # upper plot area - time series
-        upper_plot_data['scatter_xs'] = [time]
-        upper_plot_data['scatter_ys'] = [flux]
-        # lower plot area - periodogram
-        lower_plot_data['plot_xs'] = [self.pipeline.ts_model.pd_freqs]
-        lower_plot_data['plot_ys'] = [self.pipeline.ts_model.pd_ampls]
-
-        # include result attributes if present
-        if n_param > 0:
-            # calculate model and residual
-            model = self.pipeline.ts_model.calc_model()
-            residual = flux - model
-
-            # calculate periodogram
-            freqs, ampls = self.pipeline.ts_model.calc_periodogram()
-
-            # upper plot area - time series
-            if not self.upper_plot_area.show_residual:
-                upper_plot_data['plot_xs'] = [time]
-                upper_plot_data['plot_ys'] = [model]
-                upper_plot_data['plot_colors'] = ['grey']
-
-                # if highlighted rows
-                if len(selected_rows) > 0:
-                    highlighted_model = self.pipeline.ts_model.calc_model(indices=selected_rows)
-                    upper_plot_data['plot_xs'].append(time)
-                    upper_plot_data['plot_ys'].append(highlighted_model)
-                    upper_plot_data['plot_colors'].append('tab:red')
-            else: # only show residual if toggle checked
-                upper_plot_data['scatter_xs'] = [time]
-                upper_plot_data['scatter_ys'] = [residual]
-
-            # lower plot area - periodogram
-            if not self.lower_plot_area.show_residual:
-                lower_plot_data['plot_xs'].append(freqs)
-                lower_plot_data['plot_ys'].append(ampls)
-                lower_plot_data['vlines_xs'] = [self.pipeline.ts_model.sinusoid.f_n]
-                lower_plot_data['vlines_ys'] = [self.pipeline.ts_model.sinusoid.a_n]
-                lower_plot_data['vlines_colors'] = ['grey']
-
-                # if highlighted rows
-                if len(selected_rows) > 0:
-                    lower_plot_data['vlines_xs'].append(self.pipeline.ts_model.sinusoid.f_n[selected_rows])
-                    lower_plot_data['vlines_ys'].append(self.pipeline.ts_model.sinusoid.a_n[selected_rows])
-                    lower_plot_data['vlines_colors'].append('tab:red')
-            else: # only show residual if toggle checked
-                lower_plot_data['plot_xs'] = [freqs]
-                lower_plot_data['plot_ys'] = [ampls]
+        # collect plot data in a dict per plot area
+        upper_plot_data = self._collect_upper_plot_data(selected_rows)
+        lower_plot_data = self._collect_lower_plot_data(selected_rows)
 
         # set the plot data
         self.upper_plot_area.set_plot_data(**upper_plot_data)
@@ -598,6 +694,71 @@ class MainWindow(QMainWindow):
 
         return None
 
+    def _request_model_periodogram(self, new_plot=False):
+        """Request the model and residual periodogram of the current result from the background worker.
+
+        Parameters
+        ----------
+        new_plot: bool
+            Start with a fresh plot once the computation is done.
+        """
+        self._pending_new_plot = self._pending_new_plot or new_plot
+
+        # only one request per result version
+        if self._model_requested != self._model_version:
+            self._model_requested = self._model_version
+            self.model_request_signal.emit(self._model_version, self._model_snapshot())
+
+        return None
+
+    def _model_snapshot(self):
+        """Copy the model parameters of the current result for the background worker.
+
+        Returns
+        -------
+        dict
+            The time series, the linear and sinusoid parameters and the periodogram grid. The parameters are copies,
+            so the worker does not read the model while the analysis thread changes it.
+        """
+        ts_model = self.pipeline.ts_model
+        const, slope = ts_model.linear.get_linear_parameters()
+        f_n, a_n, ph_n = ts_model.sinusoid.f_n, ts_model.sinusoid.a_n, ts_model.sinusoid.ph_n
+
+        # the time series arrays are not changed in place, so those are passed as they are
+        snapshot = {'time': ts_model.time, 'flux': ts_model.flux, 'i_chunks': ts_model.i_chunks,
+                    'const': const, 'slope': slope, 'f_n': f_n, 'a_n': a_n, 'ph_n': ph_n,
+                    'f0': ts_model.pd_f0, 'fn': ts_model.pd_fn, 'df': ts_model.pd_df}
+
+        return snapshot
+
+    @Slot(int, object, object, object)
+    def _apply_model_periodogram(self, version, model, freqs, ampls):
+        """Store the computed model and residual periodogram and update the plots with them.
+
+        Parameters
+        ----------
+        version: int
+            Tag of the result that the computation was for.
+        model: numpy.ndarray[Any, dtype[float]]
+            Combined time series model.
+        freqs: numpy.ndarray[Any, dtype[float]]
+            Frequencies of the residual periodogram.
+        ampls: numpy.ndarray[Any, dtype[float]]
+            Amplitudes of the residual periodogram.
+        """
+        # discard computations for a result that has since changed
+        if version != self._model_version:
+            return None
+
+        self._model_cache = (model, freqs, ampls)
+        new_plot = self._pending_new_plot
+        self._pending_new_plot = False
+
+        self.update_plots(new_plot=new_plot)
+
+        return None
+
+    @Slot(str, bool)
     def on_result_update(self, msg=None, update=False, new_plot=False, display_err=True):
         """Update the GUI with the results."""
         # show the message in the log area
@@ -605,6 +766,10 @@ class MainWindow(QMainWindow):
             self.append_text(msg)
 
         if update:
+            # the result has changed
+            self._model_cache = None
+            self._model_version += 1
+
             # display sinusoid parameters in the table
             self.update_table(display_err=display_err)
 
@@ -619,18 +784,17 @@ class MainWindow(QMainWindow):
         self.save_subdir = f"{data.target_id}_analysis"
 
         full_dir = os.path.join(config.save_dir, self.save_subdir)
-        if not os.path.isdir(full_dir):
-            os.mkdir(full_dir)  # create the subdir
+        os.makedirs(full_dir, exist_ok=True)  # create the subdir
 
         # custom gui-specific logger
         self.logger = gui_log.get_custom_gui_logger(data.target_id, full_dir)
-        self.logger.log_signal.connect(self.on_result_update)
+        self.logger.log_signal.connect(self.on_result_update, Qt.ConnectionType.QueuedConnection)
 
         # Make ready the pipeline class
         self.pipeline = Pipeline(data=data, save_dir=config.save_dir, logger=self.logger)
 
-        # set up a pipeline thread
-        self.pipeline_thread = gui_analysis.PipelineThread(self.pipeline)
+        # point the background worker to the new pipeline
+        self.pipeline_worker.pipeline_instance = self.pipeline
 
         # update the info fields
         self.update_info_fields()
@@ -640,10 +804,12 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot()
     def set_save_location(self):
         """Open a dialog to select the save location."""
         # Open a directory selection dialog
-        new_dir = QFileDialog.getExistingDirectory(self, caption="Select Save Location", dir=config.save_dir)
+        new_dir = QFileDialog.getExistingDirectory(self, caption="Select Save Location", dir=config.save_dir,
+                                                   options=_FILE_DIALOG_OPTIONS | QFileDialog.Option.ShowDirsOnly)
 
         if new_dir:
             config.save_dir = new_dir
@@ -654,32 +820,41 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot()
     def load_data(self):
         """Read data from a file or multiple files using a dialog window."""
         # get the path(s) from a standard file selection screen
         file_paths, _ = QFileDialog.getOpenFileNames(self, caption="Read Data", dir=config.save_dir,
-                                                     filter="All Files (*)")
+                                                     filter="All Files (*)",
+                                                     options=_FILE_DIALOG_OPTIONS)
 
         # do nothing in case no file(s) selected
         if not file_paths:
             return None
 
-        # load data into instance
-        if len(file_paths) == 1 and file_paths[0].endswith('.hdf5'):
-            # a single hdf5 file is loaded as a star shine data object
-            data = Data.load(file_name=file_paths[0], data_dir='', logger=self.logger)
-        else:
-            # any other files are loaded as external data
-            data = Data.load_data(file_list=file_paths, data_dir='', target_id='', data_id='', logger=self.logger)
-
         # set the save dir to the one where we opened the data
         config.save_dir = os.path.dirname(file_paths[0])
 
+        # load data into instance in the background, the dataset is set up once it is loaded
+        self.data_loader.start_load(file_paths, self.logger)
+
+        return None
+
+    @Slot(object)
+    def _on_data_loaded(self, data):
+        """Set up the newly loaded data.
+
+        Parameters
+        ----------
+        data: Data
+            The loaded data object.
+        """
         # set up some things
         self.new_dataset(data)
 
         return None
 
+    @Slot()
     def save_data(self):
         """Save data to a file using a dialog window."""
         # check whether data is present
@@ -689,7 +864,8 @@ class MainWindow(QMainWindow):
 
         suggested_path = os.path.join(config.save_dir, self.pipeline.data.target_id + '_data.hdf5')
         file_path, _ = QFileDialog.getSaveFileName(self, caption="Save Data", dir=suggested_path,
-                                                   filter="HDF5 Files (*.hdf5);;All Files (*)")
+                                                   filter="HDF5 Files (*.hdf5);;All Files (*)",
+                                                   options=_FILE_DIALOG_OPTIONS)
 
         # do nothing in case no file selected
         if not file_path:
@@ -699,6 +875,7 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot()
     def load_result(self):
         """Load result from a file using a dialog window."""
         # check whether a pipeline is present
@@ -708,7 +885,8 @@ class MainWindow(QMainWindow):
 
         # get the path(s) from a standard file selection screen
         file_path, _ = QFileDialog.getOpenFileName(self, caption="Load Result", dir=config.save_dir,
-                                                    filter="HDF5 Files (*.hdf5);;All Files (*)")
+                                                    filter="HDF5 Files (*.hdf5);;All Files (*)",
+                                                    options=_FILE_DIALOG_OPTIONS)
 
         # do nothing in case no file selected
         if not file_path:
@@ -725,6 +903,7 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot()
     def save_result(self):
         """Save result to a file using a dialog window."""
         # check whether a result is present
@@ -734,7 +913,8 @@ class MainWindow(QMainWindow):
 
         suggested_path = os.path.join(config.save_dir, self.pipeline.data.target_id + '_result.hdf5')
         file_path, _ = QFileDialog.getSaveFileName(self, caption="Save Data", dir=suggested_path,
-                                                   filter="HDF5 Files (*.hdf5);;All Files (*)")
+                                                   filter="HDF5 Files (*.hdf5);;All Files (*)",
+                                                   options=_FILE_DIALOG_OPTIONS)
 
         # do nothing in case no file selected
         if not file_path:
@@ -744,6 +924,7 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot()
     def add_base_harmonic(self):
         """Let the user add a base harmonic frequency and add the harmonic series."""
         if self.pipeline is None or len(self.pipeline.data.file_list) == 0:
@@ -774,7 +955,7 @@ class MainWindow(QMainWindow):
                 return None
 
             # if we made it here, add the harmonics
-            self.pipeline_thread.start_function('add_base_harmonic', value)
+            self.pipeline_worker.start_function('add_base_harmonic', value)
 
         return None
 
@@ -785,18 +966,19 @@ class MainWindow(QMainWindow):
             self.logger.error("Input Error: provide data files.")
             return None
 
-        # start a new thread for the analysis
-        self.pipeline_thread.start_function(func_name, *args, **kwargs)
+        # start the analysis in the background
+        self.pipeline_worker.start_function(func_name, *args, **kwargs)
 
         return None
 
+    @Slot()
     def stop_analysis(self):
         """Stop the analysis, if it is running."""
-        if self.pipeline_thread is not None:
-            self.pipeline_thread.stop()
+        self.pipeline_worker.stop()
 
         return None
 
+    @Slot(float, float, int)
     def click_periodogram(self, x, y, button):
         """Handle click events on the periodogram plot."""
         # Guard against empty data
@@ -806,14 +988,15 @@ class MainWindow(QMainWindow):
 
         # Left click
         if button == 1:
-            self.pipeline_thread.start_function('extract_approx', x)
+            self.pipeline_worker.start_function('extract_approx', x)
 
         # Right click
         if button == 3:
-            self.pipeline_thread.start_function('remove_approx', x)
+            self.pipeline_worker.start_function('remove_approx', x)
 
         return None
 
+    @Slot()
     def add_sinusoid(self):
         """Manually add a sinusoid to the model."""
         if self.pipeline is None or len(self.pipeline.data.file_list) == 0:
@@ -841,10 +1024,11 @@ class MainWindow(QMainWindow):
                 return None
 
             # add the sinusoid
-            self.pipeline_thread.start_function('add_sinusoid', value_1, value_2, value_3)
+            self.pipeline_worker.start_function('add_sinusoid', value_1, value_2, value_3)
 
         return None
 
+    @Slot()
     def delete_sinusoid(self):
         """Delete the sinusoid(s) selected in the list."""
         if self.pipeline is None  or len(self.pipeline.data.file_list) == 0:
@@ -855,20 +1039,18 @@ class MainWindow(QMainWindow):
         selected_rows = np.unique([index.row() for index in self.table_view.selectedIndexes()])
 
         # remove these sinusoids from the model
-        self.pipeline_thread.start_function('delete_sinusoids', selected_rows)
+        self.pipeline_worker.start_function('delete_sinusoids', selected_rows)
 
         return None
 
+    @Slot()
     def show_settings_dialog(self):
         """Show a 'settings' dialog with configuration for the application."""
         dialog = gui_config.SettingsDialog(parent=self)
 
         if dialog.exec():
             # Update any dependent GUI components with new configuration values
-            screen = QApplication.primaryScreen()
-            screen_size = screen.availableSize()
-            h_size = int(screen_size.width() * config.h_size_frac)  # some fraction of the screen width
-            v_size = int(screen_size.height() * config.v_size_frac)  # some fraction of the screen height
+            h_size, v_size = _compute_window_size()
             self.setGeometry(100, 50, h_size, v_size)
 
             # update the displayed information
@@ -876,37 +1058,54 @@ class MainWindow(QMainWindow):
 
         return None
 
+    @Slot()
     def export_settings(self):
         """Export the configuration file to a user specified location."""
         suggested_path = os.path.join(config.save_dir, "config.yaml")
         file_path, _ = QFileDialog.getSaveFileName(self, caption="Export Settings", dir=suggested_path,
-                                                   filter="YAML Files (*.yaml);;All Files (*)")
+                                                   filter="YAML Files (*.yaml);;All Files (*)",
+                                                   options=_FILE_DIALOG_OPTIONS)
 
         main.save_config(file_path)
 
         return None
 
+    @Slot()
     def import_settings(self):
         """Import the configuration from a user specified file."""
         file_path, _ = QFileDialog.getOpenFileName(self, caption="Import Settings", dir=config.save_dir,
-                                                    filter="YAML Files (*.yaml);;All Files (*)")
+                                                    filter="YAML Files (*.yaml);;All Files (*)",
+                                                    options=_FILE_DIALOG_OPTIONS)
 
         main.update_config(file_name=file_path)
 
         return None
 
+    @Slot()
     def show_about_dialog(self):
         """Show an 'about' dialog with information about the application."""
-        version = hlp.get_version()
-        message = (f"STAR SHINE version {version}\n"
-                   "Satellite Time-series Analysis Routine "
-                   "using Sinusoids and Harmonics through Iterative Non-linear Extraction\n"
-                   "Repository: https://github.com/LucIJspeert/star_shine\n"
-                   "Code written by: Luc IJspeert")
+        message = _ABOUT_MESSAGE.format(version=hlp.get_version())
         QMessageBox.about(self, "About", message)
 
         return None
 
+    def closeEvent(self, event):
+        """Stop the background threads when the window closes."""
+        # a running analysis cannot be interrupted, so closing has to wait for it
+        if self.pipeline_worker.running:
+            message = "An analysis is still running, closing waits for it to finish. Close anyway?"
+            answer = QMessageBox.question(self, "Analysis running", message)
+            if answer != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return None
+
+        for thread in (self.pipeline_thread, self.plot_thread):
+            thread.quit()
+            thread.wait()
+        super().closeEvent(event)
+
+        return None
+
 
 class InputDialog(QDialog):
     def __init__(self, title, *texts):
@@ -937,6 +1136,7 @@ class InputDialog(QDialog):
 
 def launch_gui():
     """Launch the Star Shine GUI."""
+    gui_plot.set_render_params()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
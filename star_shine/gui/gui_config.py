@@ -5,6 +5,7 @@ This Python module contains the settings dialog for the graphical user interface
 """
 from PySide6.QtWidgets import QDialog, QHBoxLayout, QVBoxLayout, QFormLayout, QLineEdit, QPushButton, QLabel, QCheckBox
 from PySide6.QtWidgets import QMessageBox, QFrame
+from PySide6.QtCore import Slot
 
 from star_shine.api.main import update_config, save_config
 from star_shine.config.helpers import get_config
@@ -206,6 +207,7 @@ class SettingsDialog(QDialog):
 
         return form_layout
 
+    @Slot()
     def apply_settings(self):
         """Apply the settings to the configuration"""
         try:
@@ -248,6 +250,7 @@ class SettingsDialog(QDialog):
         # Close the dialog
         self.accept()
 
+    @Slot()
     def save_settings(self):
         """Save the settings form to disk."""
         self.apply_settings()
@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+
+from star_shine.core import analysis as ana
+from star_shine.core import goodness_of_fit as gof
+from star_shine.core import model as mdl
+from star_shine.core import time_series as tms
+
+
+class TestRemoveSinusoidsSingle(unittest.TestCase):
+    def setUp(self):
+        """Set up the random seeds of the time series models (built by _time_series_model)."""
+        self.seeds = [0, 1, 2]  # fix randomness
+
+    def _time_series_model(self, seed):
+        """Time series with two chunks, and a model with the sinusoids slightly off their true values."""
+        rng = np.random.default_rng(seed)
+        n_time = 3000
+        noise = 1e-3
+        time = np.sort(np.arange(n_time) * 0.01 + rng.uniform(0, 1e-4, n_time))
+
+        # the weak sinusoids change the BIC by an amount of the order of the penalty for their parameters
+        n_weak = 12
+        a_weak = noise * np.sqrt(6 * np.log(n_time) / n_time)
+        f_n = rng.uniform(0.5, 20, 4 + n_weak)
+        a_n = np.concatenate((rng.uniform(5e-3, 1e-2, 4), rng.uniform(0.5, 2., n_weak) * a_weak))
+        ph_n = rng.uniform(-np.pi, np.pi, 4 + n_weak)
+        flux = 1 + mdl.sum_sines(time, f_n, a_n, ph_n) + rng.normal(0, noise, n_time)
+
+        ts_model = tms.TimeSeriesModel(time, flux, np.full(n_time, noise), np.array([[0, 1500], [1500, n_time]]))
+        ts_model.set_sinusoids(f_n * (1 + rng.normal(0, 1e-7, len(f_n))), a_n * (1 + rng.normal(0, 0.01, len(f_n))),
+                               ph_n + rng.normal(0, 0.01, len(f_n)))
+        ts_model.update_linear_model()
+
+        return ts_model
+
+    @staticmethod
+    def _remove_unscreened(ts_model):
+        """Try every removal in double precision, in the same order, until none is accepted."""
+        include = ts_model.sinusoid.include
+        h_mult = ts_model.sinusoid.h_mult
+        bic_prev = ts_model.bic()
+
+        changed = True
+        while changed:
+            changed = False
+            for i in range(len(include)):
+                if not include[i] or h_mult[i] == 1:
+                    continue
+
+                ts_model.exclude_sinusoids(i)
+                bic = ts_model.bic_linear_refit()
+                if bic_prev - bic > 5e-3:
+                    ts_model.update_linear_model()
+                    bic_prev = bic
+                    include[i] = False
+                    changed = True
+                else:
+                    ts_model.include_sinusoids(i)
+
+        ts_model.remove_excluded()
+        ts_model.update_linear_model()
+
+        return None
+
+    def test_screen_error(self):
+        """Test that the single precision screened BIC stays within the margin used for the screen."""
+        for seed in self.seeds:
+            ts_model = self._time_series_model(seed)
+            f_n, a_n, ph_n = ts_model.sinusoid.get_sinusoid_parameters(exclude=False)
+            resid = ts_model.residual()
+            n_param = ts_model.n_param - 3
+
+            curves_32 = mdl.sine_curves_single(ts_model.time, f_n, a_n, ph_n)
+            curves_64 = mdl.sine_curves(ts_model.time, f_n, a_n, ph_n)
+            bic_32 = gof.calc_bic_linear_refit_batch(ts_model.time, resid, curves_32, ts_model.i_chunks, n_param)
+            bic_64 = gof.calc_bic_linear_refit_batch(ts_model.time, resid, curves_64, ts_model.i_chunks, n_param)
+
+            # same margin as in remove_sinusoids_single
+            n_time = ts_model.n_time
+            curve_norm = np.sqrt(np.sum(curves_32.astype(np.float64) ** 2, axis=1))
+            bic_tol = (2 * n_time * (np.sqrt(n_time) + 2) * np.finfo(np.float32).eps * curve_norm
+                       / np.sqrt(resid @ resid))
+
+            self.assertTrue(np.all(np.abs(bic_32 - bic_64) < bic_tol))
+
+    def test_removal_decisions(self):
+        """Test that the screened removals give the same sinusoids as trying every removal in double precision."""
+        for seed in self.seeds:
+            ts_model = self._time_series_model(seed)
+            ana.remove_sinusoids_single(ts_model)
+
+            ts_model_ref = self._time_series_model(seed)
+            self._remove_unscreened(ts_model_ref)
+
+            # some but not all of the weak sinusoids are removed
+            self.assertLess(ts_model.sinusoid.n_sin, 16)
+            self.assertGreater(ts_model.sinusoid.n_sin, 4)
+            np.testing.assert_array_equal(ts_model.sinusoid.f_n, ts_model_ref.sinusoid.f_n)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,6 +26,18 @@ class TestDataProperties(unittest.TestCase):
         self.time_series_gap = np.copy(self.time_series_noisy)
         self.time_series_gap[250:] += 30
 
+    def test_time_step_dtypes(self):
+        """Test the helpers that use the smallest and largest time step for time arrays of other types."""
+        time = np.array([0, 2, 3, 7, 9, 40])
+        mock_config_instance = dp.config
+        mock_config_instance.snr_thr = -1
+        mock_config_instance.nyquist_factor = 1.
+
+        with patch('star_shine.config.data_properties.get_config', return_value=mock_config_instance):
+            for dtype in [np.float64, np.float32, np.float16, np.int64, np.int32]:
+                self.assertAlmostEqual(dp.nyquist_frequency(time.astype(dtype)), 0.5)
+                self.assertAlmostEqual(dp.signal_to_noise_threshold(time.astype(dtype)), 3.87)
+
     def test_signal_to_noise_threshold(self):
         """Test the signal-to-noise threshold calculation for a regular time series without gaps."""
         # Calculate SNR threshold without gaps
@@ -107,6 +119,21 @@ class TestDataProperties(unittest.TestCase):
 
         self.assertGreater(nyquist_sum, expected)
 
+    def test_nyquist_sum_koen_2006_direct(self):
+        """Test the closed form of the Nyquist sum against the direct sum over all pairs of time points."""
+        # Calculate frequency resolution
+        delta_t_min = np.min(self.time_series_noisy[1:] - self.time_series_noisy[:-1])
+
+        # Calculate Nyquist sum
+        nyquist_sum = dp.nyquist_sum_koen_2006(2, self.time_series_noisy, delta_t_min)
+
+        # Expected value from equation 5 of Koen (2006), vectorised over the pairs i < j
+        i_idx, j_idx = np.triu_indices(len(self.time_series_noisy), 1)
+        factor = 2 * np.pi / delta_t_min
+        expected = np.sum(np.sin(factor * (self.time_series_noisy[j_idx] - self.time_series_noisy[i_idx]))**2)
+
+        self.assertAlmostEqual(nyquist_sum / expected, 1)
+
     def test_nyquist_frequency_noisy(self):
         """Test the Nyquist frequency calculation for a noisy time series."""
         # Calculate Nyquist frequency for regular time series
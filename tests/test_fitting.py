@@ -0,0 +1,104 @@
+import unittest
+import numpy as np
+
+from star_shine.core import fitting as fit
+
+
+class TestRefineSinusoidSingle(unittest.TestCase):
+    def setUp(self):
+        """Set up an unevenly sampled time series with a single sinusoid, an offset and noise."""
+        np.random.seed(42)  # fix randomness
+
+        self.time = np.sort(np.random.uniform(0, 30, 2000))
+        self.f, self.a, self.ph = 1.234, 0.01, 0.5
+        self.noise = 1e-3
+        time_c = self.time - np.mean(self.time)
+        self.flux = (self.a * np.sin(2 * np.pi * self.f * time_c + self.ph) + 0.2
+                     + np.random.normal(0, self.noise, len(self.time)))
+
+    def test_recovery(self):
+        """Test that a perturbed initial estimate is refined to the known sinusoid within the noise."""
+        f, a, ph = fit.refine_sinusoid_single(self.time, self.flux, self.f + 0.002, 0.9 * self.a, self.ph + 0.1)
+
+        # five times the formal errors of Montgomery & O'Donoghue (1999)
+        n_time = len(self.time)
+        t_tot = np.ptp(self.time)
+        sigma_a = np.sqrt(2 / n_time) * self.noise
+        sigma_f = np.sqrt(6 / n_time) * self.noise / (np.pi * self.a * t_tot)
+        sigma_ph = sigma_a / self.a
+
+        self.assertLess(abs(f - self.f), 5 * sigma_f)
+        self.assertLess(abs(a - self.a), 5 * sigma_a)
+        self.assertLess(abs(ph - self.ph), 5 * sigma_ph)
+
+    def test_singular(self):
+        """Test that a zero amplitude estimate, for which the frequency derivative vanishes, gives NaN."""
+        f, a, ph = fit.refine_sinusoid_single(self.time, self.flux, self.f, 0., 0.)
+
+        self.assertTrue(np.isnan(f))
+        self.assertTrue(np.isnan(a))
+        self.assertTrue(np.isnan(ph))
+
+        # no signal at all
+        f, a, ph = fit.refine_sinusoid_single(self.time, np.zeros(len(self.time)), self.f, 0., 0.)
+
+        self.assertTrue(np.isnan(f))
+
+
+class TestSolveSinusoidAmplitudes(unittest.TestCase):
+    def setUp(self):
+        """Set up an unevenly sampled time series with two sinusoids, an offset and noise."""
+        np.random.seed(42)  # fix randomness
+
+        self.time = np.sort(np.random.uniform(0, 30, 2000))
+        self.time_c = self.time - np.mean(self.time)
+        self.flux = (0.01 * np.sin(2 * np.pi * 1.234 * self.time_c + 0.5) + 0.004 * np.sin(2 * np.pi * 2. * self.time_c)
+                     + 0.1 + np.random.normal(0, 1e-3, len(self.time)))
+        self.flux_ms = self.flux - np.mean(self.flux)
+
+    def _design_matrix(self, f_n):
+        """Explicit design matrix with a sine and a cosine column per frequency."""
+        x = np.zeros((len(self.time), 2 * len(f_n)))
+        x[:, 0::2] = np.sin(2 * np.pi * f_n * self.time_c[:, np.newaxis])
+        x[:, 1::2] = np.cos(2 * np.pi * f_n * self.time_c[:, np.newaxis])
+
+        return x
+
+    def _solve(self, f_n):
+        """The normal equations solution and the least squares solution on the design matrix."""
+        a_n, ph_n = fit.solve_sinusoid_amplitudes(self.time, self.flux, f_n)
+
+        betas = np.zeros(2 * len(f_n))
+        betas[0::2] = a_n * np.cos(ph_n)
+        betas[1::2] = a_n * np.sin(ph_n)
+
+        x = self._design_matrix(f_n)
+        betas_ref = np.linalg.lstsq(x, self.flux_ms, rcond=None)[0]
+
+        return betas, betas_ref, x
+
+    def test_separated(self):
+        """Test against least squares on the design matrix for well separated and close frequencies."""
+        # the frequency resolution is 1/30, the closest pair has a design matrix condition number of about 4e3
+        for f_n in [np.array([0.5, 1.234, 3.7]), np.array([1.234, 1.235, 2.]), np.array([1.234, 1.23401, 2.])]:
+            betas, betas_ref, _ = self._solve(f_n)
+
+            np.testing.assert_allclose(betas, betas_ref, rtol=0, atol=1e-9)
+
+    def test_nearly_degenerate(self):
+        """Test that a nearly degenerate pair of frequencies still gives the least squares model."""
+        # the normal equations square the condition number (about 4e5 here), so with rcond=1e-14 the individual
+        # amplitudes of the pair are not well determined, but the model and residuals are
+        f_n = np.array([1.234, 1.234 + 1e-7, 2.])
+        betas, betas_ref, x = self._solve(f_n)
+
+        rss = np.sum((self.flux_ms - x @ betas)**2)
+        rss_ref = np.sum((self.flux_ms - x @ betas_ref)**2)
+
+        self.assertTrue(np.all(np.isfinite(betas)))
+        self.assertLess(abs(rss - rss_ref) / rss_ref, 1e-10)
+        np.testing.assert_allclose(x @ betas, x @ betas_ref, rtol=0, atol=1e-7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+
+from star_shine.core import model as mdl
+
+
+class TestSumSines(unittest.TestCase):
+    def setUp(self):
+        """Set up a long unevenly sampled time series and a set of sinusoids."""
+        np.random.seed(42)  # fix randomness
+
+        self.time = np.sort(np.random.uniform(0, 80, 5000)) + 2000.
+        self.time_c = self.time - np.mean(self.time)
+        n_sin = 60
+        self.f_n = np.random.uniform(0.01, 20, n_sin)
+        self.a_n = np.random.uniform(1e-4, 1e-2, n_sin)
+        self.ph_n = np.random.uniform(-np.pi, np.pi, n_sin)
+
+        # direct evaluation of each sinusoid in numpy
+        self.curves = self.a_n[:, np.newaxis] * np.sin(2 * np.pi * self.f_n[:, np.newaxis] * self.time_c
+                                                       + self.ph_n[:, np.newaxis])
+
+    def test_sum_sines(self):
+        """Test the blocked fastmath sum of sinusoids against the direct sum, relative to the total amplitude."""
+        # the time is centred beforehand, as the rounding of the mean itself differs between implementations
+        model = mdl.sum_sines(self.time_c, self.f_n, self.a_n, self.ph_n, t_shift=False)
+        expected = np.sum(self.curves, axis=0)
+
+        np.testing.assert_allclose(model, expected, rtol=0, atol=2.5e-13 * np.sum(self.a_n))
+
+    def test_sum_sines_st(self):
+        """Test that the blocked fastmath sum of sinusoids agrees with the single threaded one."""
+        model = mdl.sum_sines(self.time_c, self.f_n, self.a_n, self.ph_n, t_shift=False)
+        model_st = mdl.sum_sines_st(self.time_c, self.f_n, self.a_n, self.ph_n, t_shift=False)
+
+        np.testing.assert_allclose(model, model_st, rtol=0, atol=2.5e-13 * np.sum(self.a_n))
+
+    def test_block_edges(self):
+        """Test a time series that is not a multiple of the block length, and one shorter than a block."""
+        for n_time in [1025, 100]:
+            time_c = self.time_c[:n_time]
+            model = mdl.sum_sines(time_c, self.f_n, self.a_n, self.ph_n, t_shift=False)
+            expected = np.sum(self.curves[:, :n_time], axis=0)
+
+            np.testing.assert_allclose(model, expected, rtol=0, atol=2.5e-13 * np.sum(self.a_n))
+
+    def test_sine_curves_single(self):
+        """Test the single precision sine curves against the double precision ones, relative to each amplitude."""
+        # the phase is reduced in double precision, so only the rounding of the sine itself remains
+        curves = mdl.sine_curves_single(self.time, self.f_n, self.a_n, self.ph_n)
+
+        self.assertEqual(curves.dtype, np.float32)
+        np.testing.assert_allclose(curves, mdl.sine_curves(self.time, self.f_n, self.a_n, self.ph_n), rtol=0,
+                                   atol=1.1e-6 * np.max(self.a_n))
+        self.assertTrue(np.all(np.abs(curves - self.curves) < 3e-7 * self.a_n[:, np.newaxis]))
+
+
+if __name__ == '__main__':
+    unittest.main()
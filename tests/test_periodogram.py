@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+
+from star_shine.core import periodogram as pdg
+
+
+class TestScargleNoiseSpectrum(unittest.TestCase):
+    def setUp(self):
+        """Set up an amplitude spectrum with a noise floor and a few peaks."""
+        np.random.seed(42)  # fix randomness
+
+        self.freqs = np.arange(0.001, 25, 0.001)
+        self.ampls = np.abs(np.random.normal(0, 1e-3, len(self.freqs)))
+        self.ampls[[2000, 9000, 9005]] += [0.1, 0.05, 0.02]
+
+    def _expected(self, window_width):
+        """Noise spectrum by a direct convolution with the flat window."""
+        n_points = int(np.ceil(window_width / np.abs(self.freqs[1] - self.freqs[0])))
+        window = np.full(n_points, 1 / n_points)
+
+        ext_ampls = np.concatenate((self.ampls[(n_points - 1)::-1], self.ampls, self.ampls[:-(n_points + 1):-1]))
+        ext_noise = np.convolve(ext_ampls, window, 'same')
+
+        return ext_noise[n_points:-n_points]
+
+    def test_running_mean(self):
+        """Test the cumulative sum running mean against the convolution for the default window width."""
+        noise = pdg.scargle_noise_spectrum_redux(self.freqs, self.ampls, window_width=1.0)
+
+        self.assertEqual(len(noise), len(self.ampls))
+        np.testing.assert_allclose(noise, self._expected(1.0), rtol=1.2e-13)
+
+    def test_window_lengths(self):
+        """Test the cumulative sum running mean against the convolution for odd and short window lengths."""
+        # the rounding error of a difference of cumulative sums scales with the total sum, not the local mean
+        atol = 3 * len(self.ampls) * np.finfo(float).eps * np.mean(self.ampls)
+
+        for window_width in [0.5005, 0.0031]:
+            noise = pdg.scargle_noise_spectrum_redux(self.freqs, self.ampls, window_width=window_width)
+
+            self.assertEqual(len(noise), len(self.ampls))
+            np.testing.assert_allclose(noise, self._expected(window_width), rtol=1.2e-13, atol=atol)
+
+
+class TestScargleBackends(unittest.TestCase):
+    def setUp(self):
+        """Set up an unevenly sampled time series with two sinusoids and noise."""
+        np.random.seed(42)  # fix randomness
+
+        self.time = np.sort(np.random.uniform(0, 30, 1500))
+        self.flux = (0.01 * np.sin(2 * np.pi * 1.3 * self.time + 0.4) + 0.003 * np.sin(2 * np.pi * 4.71 * self.time)
+                     + np.random.normal(0, 1e-3, 1500))
+
+        # reference periodogram on the CPU
+        self.freqs, self.ampls = pdg.scargle_parallel(self.time, self.flux, fn=10)
+
+    def test_scargle_single(self):
+        """Test the single precision recurrence against the double precision one, over several restarts."""
+        freqs, ampls = pdg.scargle_parallel(self.time, self.flux, fn=25)
+        freqs_32, ampls_32 = pdg.scargle_parallel(self.time, self.flux, fn=25, single=True)
+
+        # the float32 rounding grows over the 1024 frequency steps between restarts to about 1e-6 of the peak
+        np.testing.assert_array_equal(freqs_32, freqs)
+        np.testing.assert_allclose(ampls_32, ampls, rtol=0, atol=2e-6 * np.max(ampls))
+        self.assertEqual(np.argmax(ampls_32), np.argmax(ampls))
+
+    @unittest.skipIf(pdg.cp is None, "cupy not installed")
+    def test_scargle_cuda(self):
+        """Test the CUDA periodogram against the CPU periodogram."""
+        freqs, ampls = pdg.scargle_cuda(self.time, self.flux, fn=10)
+
+        # the direct double precision sums agree with the recurrence to about 1e-13 of the peak
+        np.testing.assert_allclose(freqs, self.freqs, rtol=1e-14)
+        np.testing.assert_allclose(ampls, self.ampls, rtol=0, atol=1e-10 * np.max(self.ampls))
+
+    @unittest.skipIf(pdg.finufft is None, "finufft not installed")
+    def test_scargle_nufft(self):
+        """Test the NUFFT periodogram against the CPU periodogram."""
+        freqs, ampls = pdg.scargle_nufft(self.time, self.flux, fn=10)
+
+        # the NUFFT is requested at eps=1e-12 relative to the sum of the absolute weights; the error is amplified by
+        # the division by the spectral window sums at low frequency, so allow a factor thousand on the amplitudes
+        np.testing.assert_allclose(freqs, self.freqs, rtol=1e-14)
+        np.testing.assert_allclose(ampls, self.ampls, rtol=0, atol=1e-9 * np.max(self.ampls))
+
+
+if __name__ == '__main__':
+    unittest.main()
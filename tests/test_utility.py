@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+
+from star_shine.core import utility as ut
+
+
+class TestChunkReduceat(unittest.TestCase):
+    def setUp(self):
+        """Set up a time series with three chunks that tile the whole array."""
+        np.random.seed(42)  # fix randomness
+
+        self.x = np.random.rand(30)
+        self.i_chunks_tiled = np.array([[0, 10], [10, 22], [22, 30]])
+        self.i_chunks_gaps = np.array([[2, 10], [12, 22], [25, 30]])
+
+    def _expected(self, i_chunks, func):
+        """Direct per chunk reduction with a python loop."""
+        return np.array([func(self.x[start:stop]) for start, stop in i_chunks])
+
+    def test_tiled_chunks(self):
+        """Test the in-place path for chunks that tile the array back to back."""
+        for ufunc, func in [(np.add, np.sum), (np.minimum, np.min), (np.maximum, np.max)]:
+            reduced = ut.chunk_reduceat(self.x, self.i_chunks_tiled, ufunc=ufunc)
+            np.testing.assert_allclose(reduced, self._expected(self.i_chunks_tiled, func), rtol=1e-14)
+
+    def test_non_contiguous_chunks(self):
+        """Test the padded path for chunks with gaps in between."""
+        for ufunc, func in [(np.add, np.sum), (np.minimum, np.min), (np.maximum, np.max)]:
+            reduced = ut.chunk_reduceat(self.x, self.i_chunks_gaps, ufunc=ufunc)
+            np.testing.assert_allclose(reduced, self._expected(self.i_chunks_gaps, func), rtol=1e-14)
+
+    def test_empty_chunk(self):
+        """Test that an empty chunk between tiled chunks gets the identity, or NaN if there is none."""
+        i_chunks = np.array([[0, 10], [10, 10], [10, 30]])
+        reduced_sum = ut.chunk_reduceat(self.x, i_chunks)
+        reduced_min = ut.chunk_reduceat(self.x, i_chunks, ufunc=np.minimum)
+
+        self.assertEqual(reduced_sum[1], 0)
+        self.assertTrue(np.isnan(reduced_min[1]))
+        np.testing.assert_allclose(reduced_sum[[0, 2]], [np.sum(self.x[:10]), np.sum(self.x[10:])], rtol=1e-14)
+        np.testing.assert_allclose(reduced_min[[0, 2]], [np.min(self.x[:10]), np.min(self.x[10:])], rtol=1e-14)
+
+    def test_empty_trailing_chunk(self):
+        """Test that an empty chunk at the end of the array does not index past it."""
+        i_chunks = np.array([[0, 30], [30, 30]])
+        reduced = ut.chunk_reduceat(self.x, i_chunks, ufunc=np.maximum)
+
+        self.assertAlmostEqual(reduced[0], np.max(self.x))
+        self.assertTrue(np.isnan(reduced[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()